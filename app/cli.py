@@ -0,0 +1,198 @@
+# app/cli.py
+
+"""
+Process a week's funder files without the GUI.
+
+Example:
+    python app/cli.py alder ~/funder_files/2024-01-19 --date 2024-01-19
+
+A JSON summary of the run (per-funder totals, unmatched advance IDs and
+stage timings) is written to stdout; log messages go to stderr. The exit
+status is 0 when every funder was processed and 1 otherwise.
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config.system_config import SystemConfig
+from managers.coordinator import PortfolioCoordinator
+from managers.file_manager import PortfolioFileManager
+from managers.portfolio import Portfolio
+from utils.date_utils import get_most_recent_friday
+
+# File types accepted by the upload dialog
+SUPPORTED_SUFFIXES = (".csv", ".xlsx")
+
+PORTFOLIO_NAMES = {p.value.lower().replace(" ", "-"): p for p in Portfolio}
+
+
+def parse_date(value: str) -> datetime:
+    try:
+        date = datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a YYYY-MM-DD date")
+    if date.weekday() != 4:
+        raise argparse.ArgumentTypeError(f"{value} is not a Friday")
+    return date
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Process a directory of funder files for one portfolio week."
+    )
+    parser.add_argument(
+        "portfolio", choices=sorted(PORTFOLIO_NAMES), help="Portfolio to update"
+    )
+    parser.add_argument(
+        "directory", type=Path, help="Directory containing the week's funder files"
+    )
+    parser.add_argument(
+        "--date",
+        type=parse_date,
+        help="Friday the files belong to, as YYYY-MM-DD (default: most recent)",
+    )
+    parser.add_argument(
+        "--base-dir",
+        type=Path,
+        help="Application data directory (default: the GUI's data directory)",
+    )
+    parser.add_argument(
+        "--workbook",
+        type=Path,
+        help="Install this workbook as the portfolio workbook before processing",
+    )
+    parser.add_argument(
+        "--funder",
+        action="append",
+        default=[],
+        metavar="FILE=FUNDER",
+        help="Skip classification for FILE and treat it as FUNDER (repeatable)",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Parser worker processes (default: one per CPU)"
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Log progress to stderr"
+    )
+    return parser
+
+
+def find_files(directory: Path) -> List[Path]:
+    """Return the funder files in directory, skipping hidden and lock files."""
+    return sorted(
+        path
+        for path in directory.iterdir()
+        if path.is_file()
+        and path.suffix.lower() in SUPPORTED_SUFFIXES
+        and not path.name.startswith((".", "~$"))
+    )
+
+
+def parse_manual_funders(
+    values: List[str], directory: Path
+) -> Optional[Dict[Path, str]]:
+    manual_funders = {}
+    for value in values:
+        name, sep, funder = value.partition("=")
+        if not sep or not name or not funder:
+            raise ValueError(f"--funder expects FILE=FUNDER, got {value!r}")
+        manual_funders[directory / name] = funder
+    return manual_funders or None
+
+
+def build_summary(
+    portfolio: Portfolio,
+    processing_date: datetime,
+    files: List[Path],
+    results: Dict,
+    timings: Dict[str, float],
+) -> Dict:
+    """Collect the batch results into a JSON-serializable summary."""
+    funders = {}
+    totals = {"gross": 0.0, "net": 0.0, "fee": 0.0}
+    for funder, (success, result, error) in results.items():
+        entry = {"success": success, "error": error}
+        if result:
+            entry.update(
+                {
+                    "files_processed": result["files_processed"],
+                    "totals": result["totals"],
+                    "unmatched_ids": result["unmatched_ids"],
+                }
+            )
+            for key in totals:
+                totals[key] += result["totals"][key]
+        funders[funder] = entry
+
+    return {
+        "portfolio": portfolio.value,
+        "processing_date": processing_date.strftime("%Y-%m-%d"),
+        "files": [path.name for path in files],
+        "success": all(success for success, _, _ in results.values()),
+        "totals": totals,
+        "funders": funders,
+        "timings": {stage: round(secs, 3) for stage, secs in timings.items()},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        stream=sys.stderr,
+    )
+
+    portfolio = PORTFOLIO_NAMES[args.portfolio]
+    processing_date = args.date or get_most_recent_friday()
+    directory = args.directory.expanduser()
+    if not directory.is_dir():
+        parser.error(f"{directory} is not a directory")
+
+    try:
+        manual_funders = parse_manual_funders(args.funder, directory)
+    except ValueError as e:
+        parser.error(str(e))
+
+    files = find_files(directory)
+    if not files:
+        parser.error(f"No {' or '.join(SUPPORTED_SUFFIXES)} files in {directory}")
+
+    started = time.perf_counter()
+    base_dir = args.base_dir or SystemConfig.get_app_directory()
+    base_dir.mkdir(parents=True, exist_ok=True)
+    file_manager = PortfolioFileManager(base_dir)
+    if args.workbook:
+        file_manager.save_portfolio_workbook(portfolio, args.workbook)
+
+    coordinator = PortfolioCoordinator(file_manager)
+    coordinator.max_parse_workers = args.workers
+    timings = {"setup": time.perf_counter() - started}
+
+    results = coordinator.process_weekly_batch(
+        files, portfolio, processing_date, manual_funders
+    )
+    timings.update(coordinator.last_batch_timings)
+
+    # Don't report success before the workbook backup is on disk
+    stage_start = time.perf_counter()
+    file_manager.backup_store.wait()
+    timings["backup_wait"] = time.perf_counter() - stage_start
+    timings["total"] = time.perf_counter() - started
+
+    summary = build_summary(portfolio, processing_date, files, results, timings)
+    json.dump(summary, sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+    return 0 if summary["success"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
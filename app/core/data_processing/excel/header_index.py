@@ -0,0 +1,65 @@
+# app/core/data_processing/excel/header_index.py
+
+from typing import Dict, Optional
+
+
+class HeaderIndex:
+    """
+    Map of a worksheet's header row text to column numbers.
+
+    Built with a single pass over the header row and then kept in step with
+    the sheet as columns are inserted or headers written, so lookups never
+    need to rescan the row.
+    """
+
+    def __init__(self, header_row: int, columns: Dict[int, str]):
+        self.header_row = header_row
+        self.columns = columns
+        self._by_text: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_worksheet(cls, worksheet, header_row: int = 2) -> "HeaderIndex":
+        """Read the header row of a worksheet (normal or read-only)."""
+        columns = {}
+        for values in worksheet.iter_rows(
+            min_row=header_row, max_row=header_row, values_only=True
+        ):
+            for idx, value in enumerate(values, 1):
+                if value is not None and str(value).strip():
+                    columns[idx] = str(value).strip()
+        return cls(header_row, columns)
+
+    def _lookup(self) -> Dict[str, int]:
+        if self._by_text is None:
+            self._by_text = {}
+            for idx in sorted(self.columns):
+                self._by_text.setdefault(self.columns[idx], idx)
+        return self._by_text
+
+    def find(self, *headers: str) -> Optional[int]:
+        """Return the column of the first of headers present, matched exactly."""
+        lookup = self._lookup()
+        for header in headers:
+            if header in lookup:
+                return lookup[header]
+        return None
+
+    def find_containing(self, text: str) -> Optional[int]:
+        """Return the leftmost column whose header contains text."""
+        for idx in sorted(self.columns):
+            if text in self.columns[idx]:
+                return idx
+        return None
+
+    def set(self, column: int, header: str) -> None:
+        """Record a header written to the sheet."""
+        self.columns[column] = header
+        self._by_text = None
+
+    def insert_cols(self, idx: int, amount: int = 1) -> None:
+        """Shift headers the same way worksheet.insert_cols(idx, amount) does."""
+        self.columns = {
+            (col + amount if col >= idx else col): header
+            for col, header in self.columns.items()
+        }
+        self._by_text = None
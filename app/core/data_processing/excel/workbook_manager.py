@@ -8,9 +8,17 @@ from typing import Dict, List, Tuple, Optional
 import pandas as pd
 import logging
 from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.dimensions import ColumnDimension
 import sqlite3
+import weakref
 
+from managers.backup_store import replace_file
 from managers.portfolio import Portfolio, PortfolioStructure
+from utils.db_pool import get_connection
+from .header_index import HeaderIndex
+
+# Last column Excel allows (XFD)
+MAX_COLUMN = 16384
 
 
 class WorkbookManager:
@@ -26,94 +34,248 @@ class WorkbookManager:
         "BIG": "BIG",
     }
 
+    # Placeholder columns inserted ahead of time for future weeks' Net RTR
+    RESERVED_HEADER = "Net RTR (reserved)"
+    RESERVED_NET_RTR_COLUMNS = 13
+
+    # Header text identifying the advance ID column, in order of preference
+    ADVANCE_ID_HEADERS = ("Funder Advance ID", "Advance ID")
+
     def __init__(self, file_manager):
         self.file_manager = file_manager
         self.logger = logging.getLogger(__name__)
 
+        # Header indexes of the worksheets this manager has touched, dropped
+        # together with the workbook they belong to
+        self._header_indexes = weakref.WeakKeyDictionary()
+
+    def header_index(self, worksheet, header_row: int = 2) -> HeaderIndex:
+        """Return the worksheet's header index, reading the header row once"""
+        index = self._header_indexes.get(worksheet)
+        if index is None or index.header_row != header_row:
+            index = HeaderIndex.from_worksheet(worksheet, header_row)
+            self._header_indexes[worksheet] = index
+        return index
+
     def backup_workbook(self, portfolio_path: Path, friday_date: datetime) -> Path:
-        """Create a backup of the workbook before modifications"""
+        """
+        Create a backup of the workbook before modifications.
+
+        Since save_workbook never writes the live file in place, the backup
+        only needs a snapshot of it up front; unless the user has turned
+        deferral off, copying it into the backup store happens in the
+        background while the workbook is being updated.
+        """
         try:
-            source_path = portfolio_path
             backup_name = (
                 f"{portfolio_path.stem}_backup_{friday_date.strftime('%Y%m%d')}.xlsx"
             )
             backup_path = portfolio_path.parent / backup_name
 
-            import shutil
-
-            shutil.copy2(source_path, backup_path)
-
-            self.logger.info(f"Created workbook backup at {backup_path}")
+            # Stored by content hash, so an unchanged workbook costs no space,
+            # and old backups are compressed or pruned by the retention policy
+            store = self.file_manager.backup_store
+            if self.file_manager.preferences.defer_workbook_backup:
+                store.backup_in_background(
+                    portfolio_path.stem, portfolio_path, friday_date, backup_path
+                )
+                self.logger.info(f"Started workbook backup to {backup_path}")
+            else:
+                store.backup(
+                    portfolio_path.stem, portfolio_path, friday_date, backup_path
+                )
+                self.logger.info(f"Created workbook backup at {backup_path}")
             return backup_path
 
         except Exception as e:
             self.logger.error(f"Failed to create workbook backup: {str(e)}")
             raise
 
+    def _last_data_row(self, worksheet, header_row: int = 2) -> int:
+        """
+        Return the last row with an advance ID or merchant name.
+
+        Formatted blank rows below the data count towards max_row, so step
+        back from there to the last row that has either key value.
+        """
+        headers = self.header_index(worksheet, header_row)
+        key_columns = [
+            col
+            for col in (
+                headers.find(*self.ADVANCE_ID_HEADERS),
+                headers.find("Merchant Name"),
+            )
+            if col
+        ]
+
+        row = worksheet.max_row
+        while row > header_row:
+            if any(
+                worksheet.cell(row=row, column=col).value is not None
+                for col in key_columns
+            ):
+                return row
+            row -= 1
+        return header_row
+
+    def _insert_column_dimensions(self, worksheet, idx: int, amount: int) -> None:
+        """
+        Move column widths and visibility along with worksheet.insert_cols.
+
+        insert_cols shifts cells but not column_dimensions, and one dimension
+        may cover a run of columns (<col min=".." max="..">). Runs are split
+        at idx and the part from idx on moves right by amount. Each inserted
+        column gets its own dimension, copied from the column before it, so
+        it can be hidden without touching its neighbours.
+        """
+
+        def dimension(source, lo, hi):
+            dim = ColumnDimension(
+                worksheet,
+                index=get_column_letter(lo),
+                width=source.width,
+                bestFit=source.bestFit,
+                hidden=source.hidden,
+                outlineLevel=source.outlineLevel,
+                collapsed=source.collapsed,
+                min=lo,
+                max=hi,
+            )
+            dim._style = copy(source._style)
+            return dim
+
+        previous = None
+        ranges = []
+        for dim in worksheet.column_dimensions.values():
+            dim.reindex()
+            if dim.min <= idx - 1 <= dim.max:
+                previous = dim
+            if dim.max < idx:
+                ranges.append((dim, dim.min, dim.max))
+                continue
+            if dim.min < idx:
+                ranges.append((dim, dim.min, idx - 1))
+            ranges.append(
+                (dim, max(dim.min, idx) + amount, min(dim.max + amount, MAX_COLUMN))
+            )
+
+        worksheet.column_dimensions.clear()
+        for source, lo, hi in ranges:
+            if lo <= hi:
+                worksheet.column_dimensions[get_column_letter(lo)] = dimension(
+                    source, lo, hi
+                )
+        for col in range(idx, idx + amount):
+            letter = get_column_letter(col)
+            worksheet.column_dimensions[letter] = (
+                dimension(previous, col, col)
+                if previous
+                else ColumnDimension(worksheet, index=letter)
+            )
+
+    def _reserve_net_rtr_columns(
+        self, worksheet, rtr_balance_col: int, header_row: int = 2
+    ) -> int:
+        """
+        Insert a block of hidden placeholder columns before the RTR balance.
+
+        Inserting shifts every cell to the right of the insertion point, so
+        columns are reserved several weeks at a time and later weeks only
+        claim a placeholder.
+
+        Returns:
+            int: Index of the first reserved column
+        """
+        worksheet.insert_cols(rtr_balance_col, amount=self.RESERVED_NET_RTR_COLUMNS)
+        self._insert_column_dimensions(
+            worksheet, rtr_balance_col, self.RESERVED_NET_RTR_COLUMNS
+        )
+
+        headers = self.header_index(worksheet, header_row)
+        headers.insert_cols(rtr_balance_col, amount=self.RESERVED_NET_RTR_COLUMNS)
+
+        for col in range(
+            rtr_balance_col, rtr_balance_col + self.RESERVED_NET_RTR_COLUMNS
+        ):
+            worksheet.cell(row=header_row, column=col).value = self.RESERVED_HEADER
+            headers.set(col, self.RESERVED_HEADER)
+            worksheet.column_dimensions[get_column_letter(col)].hidden = True
+
+        self.logger.info(
+            f"Reserved {self.RESERVED_NET_RTR_COLUMNS} Net RTR columns in "
+            f"{worksheet.title} at {get_column_letter(rtr_balance_col)}"
+        )
+        return rtr_balance_col
+
     def _add_net_rtr_column(
-        self, worksheet, friday_date: datetime, header_row: int = 2
+        self, worksheet, friday_date: datetime, last_row: int, header_row: int = 2
     ) -> str:
         """Add Net RTR column for the current date if it doesn't exist"""
         month_day = friday_date.strftime("%-m/%-d")
+        headers = self.header_index(worksheet, header_row)
 
         # Find RTR Balance column
-        rtr_balance_col = None
-        for idx, cell in enumerate(worksheet[header_row], 1):
-            if cell.value and "R&H Net RTR Balance" in str(cell.value):
-                rtr_balance_col = idx
-                break
-
+        rtr_balance_col = headers.find_containing("R&H Net RTR Balance")
         if not rtr_balance_col:
             raise ValueError("R&H Net RTR Balance column not found")
 
         # Check if column already exists
-        net_rtr_col = None
-        for idx, cell in enumerate(worksheet[header_row], 1):
-            if cell.value and f"Net RTR {month_day}" == str(cell.value):
-                net_rtr_col = idx
-                break
+        net_rtr_col = headers.find(f"Net RTR {month_day}")
 
-        # Add new column if needed
+        # Add new column if needed, preferring a reserved one
         if not net_rtr_col:
-            worksheet.insert_cols(rtr_balance_col)
-            net_rtr_col = rtr_balance_col
+            reserved_col = headers.find(self.RESERVED_HEADER)
+            if reserved_col is None:
+                reserved_col = self._reserve_net_rtr_columns(
+                    worksheet, rtr_balance_col, header_row
+                )
+            net_rtr_col = reserved_col
 
             # Set header values
             worksheet.cell(
                 row=header_row, column=net_rtr_col
             ).value = f"Net RTR {month_day}"
+            headers.set(net_rtr_col, f"Net RTR {month_day}")
             worksheet.cell(row=1, column=net_rtr_col).value = worksheet.title
+            worksheet.column_dimensions[get_column_letter(net_rtr_col)].hidden = False
 
-            # Copy formatting from adjacent column
-            for row in range(1, worksheet.max_row + 1):
+            # Copy formatting from adjacent column by sharing its style IDs,
+            # stopping at the last row with data
+            for row in range(1, last_row + 1):
                 source = worksheet.cell(row=row, column=net_rtr_col - 1)
-                target = worksheet.cell(row=row, column=net_rtr_col)
-
-                target.font = copy(source.font)
-                target.border = copy(source.border)
-                target.fill = copy(source.fill)
-                target.number_format = copy(source.number_format)
-                target.protection = copy(source.protection)
-                target.alignment = copy(source.alignment)
+                if source.has_style:
+                    target = worksheet.cell(row=row, column=net_rtr_col)
+                    target._style = copy(source._style)
 
         return get_column_letter(net_rtr_col)
 
-    def _update_total_formula(self, worksheet, net_rtr_col: str, header_row: int = 2):
+    def _update_total_formula(
+        self, worksheet, net_rtr_col: str, last_row: int, header_row: int = 2
+    ):
         """Update the Total Net RTR Payment Received formula"""
-        total_col = None
-        for cell in worksheet[header_row]:
-            if cell.value and "Total Net RTR Payment Received" in str(cell.value):
-                total_col = get_column_letter(cell.column)
-                break
+        total_idx = self.header_index(worksheet, header_row).find_containing(
+            "Total Net RTR Payment Received"
+        )
 
-        if total_col:
+        if total_idx:
+            total_col = get_column_letter(total_idx)
             start_col = get_column_letter(
                 openpyxl.utils.column_index_from_string(total_col) + 1
             )
-            for row in range(header_row + 1, worksheet.max_row + 1):
-                worksheet[
-                    f"{total_col}{row}"
-                ].value = f"=SUM({start_col}{row}:{net_rtr_col}{row})"
+            # Only rewrite formulas that do not already end at this week's
+            # column, and leave the blank rows below the data alone
+            rewritten = 0
+            for row in range(header_row + 1, last_row + 1):
+                formula = f"=SUM({start_col}{row}:{net_rtr_col}{row})"
+                cell = worksheet.cell(row=row, column=total_idx)
+                if cell.value != formula:
+                    cell.value = formula
+                    rewritten += 1
+
+            self.logger.info(
+                f"Rewrote {rewritten} of {last_row - header_row} total formulas "
+                f"in {worksheet.title}"
+            )
 
     def populate_merchant_database(
         self, workbook_path: Path, portfolio: Portfolio
@@ -139,6 +301,7 @@ class WorkbookManager:
             workbook = openpyxl.load_workbook(workbook_path, read_only=True)
             current_time = datetime.now().isoformat()
             stats = {}
+            merchant_rows = []
 
             # Process each funder sheet
             for funder, sheet_name in self.SHEET_MAPPING.items():
@@ -158,14 +321,9 @@ class WorkbookManager:
 
                 # Find the columns - header is always row 2 in template
                 header_row = 2
-                id_col = None
-                name_col = None
-
-                for idx, cell in enumerate(worksheet[header_row], 1):
-                    if cell.value and cell.value in ["Advance ID", "Funder Advance ID"]:
-                        id_col = idx
-                    elif cell.value == "Merchant Name":
-                        name_col = idx
+                headers = self.header_index(worksheet, header_row)
+                id_col = headers.find(*self.ADVANCE_ID_HEADERS)
+                name_col = headers.find("Merchant Name")
 
                 if not id_col:
                     self.logger.error(
@@ -173,58 +331,69 @@ class WorkbookManager:
                     )
                     continue
 
-                # Create database connection
-                db_path = self.file_manager.db_path
-                with sqlite3.connect(db_path) as conn:
-                    # Process each row
-                    for row in worksheet.iter_rows(min_row=header_row + 1):
-                        # Get advance ID from the correct column
-                        advance_id = row[id_col - 1].value
-                        if not advance_id or str(advance_id).strip() in ["", "-", "0"]:
-                            continue
-
-                        # Clean advance ID
-                        advance_id = str(advance_id).strip()
-
-                        # Get merchant name if available
-                        merchant_name = None
-                        if name_col:
-                            merchant_name = row[name_col - 1].value
-                            if merchant_name:
-                                merchant_name = str(merchant_name).strip()
-
-                        # Skip if no merchant name (likely empty row)
-                        if not merchant_name:
-                            continue
-
-                        try:
-                            # Insert or update database with validated portfolio value
-                            conn.execute(
-                                """
-                                INSERT OR REPLACE INTO merchant_tracking 
-                                (advance_id, funder, merchant_name, portfolio, first_seen_date, last_updated)
-                                VALUES (?, ?, ?, ?, ?, ?)
-                            """,
-                                (
-                                    advance_id,
-                                    funder,
-                                    merchant_name,
-                                    portfolio.value,  # Using enum value directly
-                                    current_time,
-                                    current_time,
-                                ),
-                            )
-
-                            merchants_found += 1
-                        except sqlite3.Error as e:
-                            self.logger.error(
-                                f"Database error for merchant {merchant_name}: {str(e)}"
-                            )
-                            raise
+                # Collect the sheet's merchants; everything is written in
+                # one transaction once all sheets have been read
+                for row in worksheet.iter_rows(
+                    min_row=header_row + 1, values_only=True
+                ):
+                    # Get advance ID from the correct column
+                    advance_id = row[id_col - 1]
+                    if not advance_id or str(advance_id).strip() in ["", "-", "0"]:
+                        continue
+
+                    # Clean advance ID
+                    advance_id = str(advance_id).strip()
+
+                    # Get merchant name if available
+                    merchant_name = None
+                    if name_col:
+                        merchant_name = row[name_col - 1]
+                        if merchant_name:
+                            merchant_name = str(merchant_name).strip()
+
+                    # Skip if no merchant name (likely empty row)
+                    if not merchant_name:
+                        continue
+
+                    merchant_rows.append(
+                        (
+                            advance_id,
+                            funder,
+                            merchant_name,
+                            portfolio.value,  # Using enum value directly
+                            current_time,
+                            current_time,
+                        )
+                    )
+                    merchants_found += 1
 
                 stats[funder] = merchants_found
                 self.logger.info(f"Found {merchants_found} merchants in {sheet_name}")
 
+            workbook.close()
+
+            # Insert new merchants and update known ones, keeping the date
+            # each advance was first seen
+            db_path = self.file_manager.db_path
+            try:
+                with get_connection(db_path) as conn:
+                    conn.executemany(
+                        """
+                        INSERT INTO merchant_tracking
+                        (advance_id, funder, merchant_name, portfolio, first_seen_date, last_updated)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(advance_id) DO UPDATE SET
+                            funder = excluded.funder,
+                            merchant_name = excluded.merchant_name,
+                            portfolio = excluded.portfolio,
+                            last_updated = excluded.last_updated
+                    """,
+                        merchant_rows,
+                    )
+            except sqlite3.Error as e:
+                self.logger.error(f"Database error writing merchants: {str(e)}")
+                raise
+
             # Log total merchants found
             total_merchants = sum(stats.values())
             self.logger.info(
@@ -237,6 +406,118 @@ class WorkbookManager:
             self.logger.error(f"Error populating merchant database: {str(e)}")
             raise
 
+    def load_workbook(self, portfolio_path: Path):
+        """Load the portfolio workbook so several funder updates can share it"""
+        return openpyxl.load_workbook(portfolio_path)
+
+    def save_workbook(self, workbook, portfolio_path: Path) -> None:
+        """
+        Write an in-memory portfolio workbook back to disk.
+
+        The workbook is written to a temporary file next to the live one and
+        renamed over it once complete, so a failed save leaves the previous
+        version intact.
+        """
+        tmp_path = portfolio_path.with_name(f".{portfolio_path.name}.saving")
+        try:
+            workbook.save(tmp_path)
+            replace_file(tmp_path, portfolio_path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def apply_pivot(
+        self,
+        workbook,
+        pivot_data: pd.DataFrame,
+        funder: str,
+        friday_date: datetime,
+    ) -> List[Dict]:
+        """
+        Apply a funder's pivot table to an already loaded workbook.
+
+        The workbook is not saved; callers are expected to call save_workbook
+        once all funders have been applied.
+
+        Returns:
+            List of unmatched advance IDs with merchant names
+        """
+        # Get sheet name from mapping
+        sheet_name = self.SHEET_MAPPING.get(funder)
+        if not sheet_name:
+            raise ValueError(f"No sheet mapping found for funder {funder}")
+
+        if sheet_name not in workbook.sheetnames:
+            raise ValueError(f"Sheet {sheet_name} not found in workbook")
+
+        worksheet = workbook[sheet_name]
+        header_row = 2  # Assuming header is always row 2
+
+        # Inserting columns leaves the rows alone, so the data range is
+        # found once for both the formatting and the formulas
+        last_row = self._last_data_row(worksheet, header_row)
+
+        # Add/get Net RTR column
+        net_rtr_col = self._add_net_rtr_column(worksheet, friday_date, last_row)
+
+        # Update total formula
+        self._update_total_formula(worksheet, net_rtr_col, last_row)
+
+        # Build mapping of Advance IDs to rows
+        id_col = self.header_index(worksheet, header_row).find(*self.ADVANCE_ID_HEADERS)
+        if not id_col:
+            raise ValueError(f"Advance ID column not found in {sheet_name}")
+
+        advance_id_map = {}
+        for excel_row, (value,) in enumerate(
+            worksheet.iter_rows(
+                min_row=header_row + 1,
+                min_col=id_col,
+                max_col=id_col,
+                values_only=True,
+            ),
+            start=header_row + 1,
+        ):
+            if value:
+                advance_id_map[str(value).strip()] = excel_row
+
+        # Match every pivot row against the sheet in one step, skipping the
+        # totals row and zero amounts
+        advance_ids = pivot_data["Advance ID"].astype(str).str.strip()
+        net_values = pivot_data["Sum of Syn Net Amount"]
+        wanted = (advance_ids != "Totals") & (net_values != 0)
+        excel_rows = advance_ids[wanted].map(advance_id_map)
+        matched = excel_rows.notna()
+
+        # Update net values by numeric cell index
+        net_rtr_idx = openpyxl.utils.column_index_from_string(net_rtr_col)
+        for excel_row, net_value in zip(
+            excel_rows[matched].astype(int).tolist(),
+            net_values[wanted][matched].tolist(),
+        ):
+            worksheet.cell(row=excel_row, column=net_rtr_idx).value = net_value
+
+        # Track unmatched IDs
+        unmatched_rows = ~matched
+        unmatched = [
+            {
+                "sheet_name": sheet_name,
+                "advance_id": advance_id,
+                "merchant_name": merchant_name,
+            }
+            for advance_id, merchant_name in zip(
+                advance_ids[wanted][unmatched_rows].tolist(),
+                pivot_data["Merchant Name"][wanted][unmatched_rows].tolist(),
+            )
+        ]
+
+        self.logger.info(
+            f"Updated {sheet_name} worksheet with {len(pivot_data) - len(unmatched)} matches "
+            f"and {len(unmatched)} unmatched IDs"
+        )
+
+        return unmatched
+
     def update_workbook(
         self,
         portfolio_path: Path,
@@ -253,66 +534,9 @@ class WorkbookManager:
             - Error message if any
         """
         try:
-            # Get sheet name from mapping
-            sheet_name = self.SHEET_MAPPING.get(funder)
-            if not sheet_name:
-                raise ValueError(f"No sheet mapping found for funder {funder}")
-
-            # Load workbook
-            workbook = openpyxl.load_workbook(portfolio_path)
-            if sheet_name not in workbook.sheetnames:
-                raise ValueError(f"Sheet {sheet_name} not found in workbook")
-
-            worksheet = workbook[sheet_name]
-
-            # Add/get Net RTR column
-            net_rtr_col = self._add_net_rtr_column(worksheet, friday_date)
-
-            # Update total formula
-            self._update_total_formula(worksheet, net_rtr_col)
-
-            # Build mapping of Advance IDs to rows
-            advance_id_map = {}
-            header_row = 2  # Assuming header is always row 2
-            for row in worksheet.iter_rows(
-                min_row=header_row + 1, min_col=5, max_col=5
-            ):
-                cell = row[0]
-                if cell.value:
-                    advance_id_map[str(cell.value).strip()] = cell.row
-
-            # Track unmatched IDs
-            unmatched = []
-
-            # Update net values
-            for _, row in pivot_data.iterrows():
-                advance_id = str(row["Advance ID"]).strip()
-                if advance_id == "Totals":  # Skip totals row
-                    continue
-
-                net_value = row["Sum of Syn Net Amount"]
-                if net_value == 0:
-                    continue
-
-                if advance_id in advance_id_map:
-                    excel_row = advance_id_map[advance_id]
-                    worksheet[f"{net_rtr_col}{excel_row}"].value = net_value
-                else:
-                    unmatched.append(
-                        {
-                            "sheet_name": sheet_name,
-                            "advance_id": advance_id,
-                            "merchant_name": row["Merchant Name"],
-                        }
-                    )
-
-            # Save workbook
-            workbook.save(portfolio_path)
-
-            self.logger.info(
-                f"Updated {sheet_name} worksheet with {len(pivot_data) - len(unmatched)} matches "
-                f"and {len(unmatched)} unmatched IDs"
-            )
+            workbook = self.load_workbook(portfolio_path)
+            unmatched = self.apply_pivot(workbook, pivot_data, funder, friday_date)
+            self.save_workbook(workbook, portfolio_path)
 
             return unmatched, None
 
@@ -0,0 +1,129 @@
+# app/core/data_processing/parse_cache.py
+
+import os
+import pickle
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple, Type
+from .source_file import SourceFile
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# (pivot, gross, net, fee) as returned by a successful BaseParser.process()
+ParsedData = Tuple["pd.DataFrame", float, float, float]
+
+
+class ParseCache:
+    """
+    On-disk cache of parser results keyed by file contents.
+
+    Entries are keyed by the SHA-256 of the parsed file(s) together with the
+    parser class and its PARSER_VERSION, so re-uploading an unchanged file
+    reuses the earlier pivot instead of parsing it again. The cache directory
+    is kept under max_bytes by evicting the least recently used entries.
+    """
+
+    SUFFIX = ".pkl"
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def make_key(parser_class: Type, sources: Iterable[SourceFile]) -> str:
+        """Build the cache key for parsing sources with parser_class."""
+        digest = hashlib.sha256()
+        digest.update(
+            f"{parser_class.__name__}:{getattr(parser_class, 'PARSER_VERSION', 0)}".encode()
+        )
+        for source in sources:
+            digest.update(SourceFile.wrap(source).sha256.encode())
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.SUFFIX}"
+
+    def get(self, key: str) -> Optional[ParsedData]:
+        """Return the cached result for key, or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+            # Mark as recently used for LRU eviction
+            os.utime(path)
+        except FileNotFoundError:
+            data = None
+        except Exception as e:
+            self.logger.warning(f"Discarding unreadable cache entry {key}: {str(e)}")
+            path.unlink(missing_ok=True)
+            data = None
+
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if data is not None:
+            self.logger.info(f"Parse cache hit: {key[:12]}")
+        return data
+
+    def put(self, key: str, data: ParsedData):
+        """Store a parser result and evict old entries if over the size limit."""
+        path = self._entry_path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.warning(f"Unable to write cache entry {key}: {str(e)}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        self._evict()
+
+    def _entries(self):
+        """Return (path, stat) for every entry, least recently used first."""
+        entries = []
+        for path in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                continue
+        entries.sort(key=lambda entry: entry[1].st_mtime)
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+            self.logger.info(f"Evicted parse cache entry {path.stem[:12]}")
+
+    def clear(self):
+        """Remove every cached entry."""
+        for path, _ in self._entries():
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current size of the cache."""
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "bytes": sum(stat.st_size for _, stat in entries),
+            "max_bytes": self.max_bytes,
+        }
@@ -1,9 +1,14 @@
-from .base_parser import BaseParser
-from .kings_boom_parser import KingsBoomParser
-from .efin_parser import EfinParser
-from .bhb_parser import BHBParser
-from .acs_vesper_parser import AcsVesperParser
-from .clear_view_parser import ClearViewParser
+import importlib
+
+# Parsers are imported on first access, since each one loads pandas
+_EXPORTS = {
+    "BaseParser": ".base_parser",
+    "KingsBoomParser": ".kings_boom_parser",
+    "EfinParser": ".efin_parser",
+    "BHBParser": ".bhb_parser",
+    "AcsVesperParser": ".acs_vesper_parser",
+    "ClearViewParser": ".clear_view_parser",
+}
 
 __all__ = [
     "BaseParser",
@@ -13,3 +18,9 @@ __all__ = [
     "AcsVesperParser",
     "ClearViewParser",
 ]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,8 @@
 # app/core/data_processing/parsers/acs_vesper_parser.py
+import csv
 from pathlib import Path
 import pandas as pd
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 from .base_parser import BaseParser
 from io import StringIO
 
@@ -11,11 +12,34 @@ class AcsVesperParser(BaseParser):
         super().__init__(file_path)
         self.funder_name = None
 
+    @staticmethod
+    def latest_week_columns(header_line: str) -> Optional[List[int]]:
+        """
+        Find the positions of the columns process_data uses.
+
+        These are the ID and merchant columns plus the latest week's gross,
+        fees and net, which sit side by side. Returns None when the header
+        has no usable Net column, in which case every column is read.
+        """
+        header = next(csv.reader([header_line]))
+        net_positions = [
+            idx for idx, col in enumerate(header) if "Net" in col and "Total" not in col
+        ]
+        if not net_positions or net_positions[-1] < 2:
+            return None
+
+        latest = net_positions[-1]
+        positions = {latest - 2, latest - 1, latest}
+        for name in ("Advance ID", "Merchant Name"):
+            if name in header:
+                positions.add(header.index(name))
+        return sorted(positions)
+
     def read_csv(self) -> pd.DataFrame:
         """Override read_csv to handle ACS/Vesper's specific format"""
         try:
             # Read the CSV file into a list of lines
-            with open(self.file_path, "r") as f:
+            with self.source.open_text() as f:
                 self.lines = f.readlines()
 
             # Remove empty lines
@@ -34,9 +58,16 @@ class AcsVesperParser(BaseParser):
             # Prepare the cleaned CSV data
             cleaned_csv = StringIO("".join(self.lines))
 
-            # Read the CSV, setting header to the identified header row
+            # Read the CSV, setting header to the identified header row. Past
+            # weeks' columns are skipped, and values are kept as text for the
+            # cleaning in process_data.
             cleaned_csv.seek(0)
-            df = pd.read_csv(cleaned_csv, header=header_row_index)
+            df = pd.read_csv(
+                cleaned_csv,
+                header=header_row_index,
+                usecols=self.latest_week_columns(self.lines[header_row_index]),
+                dtype=str,
+            )
 
             # Identify the latest 'Net' column that isn't a 'Total' column
             self.columns = df.columns.tolist()
@@ -114,19 +145,7 @@ class AcsVesperParser(BaseParser):
             # Convert amounts
             for col in [latest_gross_column, latest_fees_column, latest_net_column]:
                 latest_week_df[col] = (
-                    pd.to_numeric(
-                        latest_week_df[col]
-                        .astype(str)
-                        .replace(
-                            {
-                                r"[\$,]": "",  # Remove $ and commas
-                            },
-                            regex=True,
-                        ),
-                        errors="coerce",
-                    )
-                    .fillna(0)
-                    .round(2)
+                    self.normalize_currency(latest_week_df[col]).fillna(0).round(2)
                 )
 
             # Filter rows with activity
@@ -2,35 +2,66 @@
 
 from abc import ABC, abstractmethod
 import pandas as pd
-from typing import Tuple, Optional, Dict
+from pandas.api.types import infer_dtype
+from typing import Tuple, Optional, Dict, List, Union
 from pathlib import Path
-import chardet
 import logging
+from ..source_file import SourceFile
+
+# Formatting stripped from currency amounts; parentheses mark negatives.
+# Exports often put a non-breaking space between the "$" and the amount
+CURRENCY_CHARACTERS = str.maketrans("(", "-", '$,)" \t\r\xa0')
+
+# Columns accepted as the merchant name, in order of preference
+NAME_COLUMNS = ["Business Name", "Merchant Name", "business_name", "merchant_name"]
 
 
 class BaseParser(ABC):
-    def __init__(self, file_path: Path):
-        self.file_path = Path(file_path)
+    # Bump whenever a parser's output changes so cached results are not reused
+    PARSER_VERSION = 5
+
+    def __init__(self, file_path: Union[Path, SourceFile]):
+        # Keep the file contents in memory so nothing is read from disk twice
+        self.source = SourceFile.wrap(file_path)
+        self.file_path = self.source.path
         self.required_columns: list = []
         self.column_types: Dict[str, type] = {}
+        # Columns read from CSV files (required_columns if not set) and the
+        # types to read them as, so the other columns of wide exports are
+        # never parsed
+        self.csv_columns: Optional[List[str]] = None
+        self.csv_dtypes: Dict[str, type] = {}
         self.funder_name: str = ""
         self._df: Optional[pd.DataFrame] = None
 
         # Setup logging
         self.logger = logging.getLogger(f"parser.{self.__class__.__name__}")
 
+    @property
+    def source_files(self) -> List[SourceFile]:
+        """Every file this parser reads, in order."""
+        return [self.source]
+
     def detect_encoding(self) -> str:
-        with open(self.file_path, "rb") as file:
-            raw_data = file.read(10000)
-            result = chardet.detect(raw_data)
-            return result["encoding"]
+        return self.source.encoding
+
+    def read_columns(
+        self, source: Optional[SourceFile] = None, encoding: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Read the columns this parser declared from source (default: its file)."""
+        source = source or self.source
+        return source.read_columns(
+            self.csv_columns or self.required_columns,
+            dtype=self.csv_dtypes,
+            encoding=encoding,
+        )
 
     def read_csv(self) -> pd.DataFrame:
         encodings_to_try = [self.detect_encoding(), "utf-8", "cp1252", "iso-8859-1"]
 
         for encoding in encodings_to_try:
             try:
-                df = pd.read_csv(self.file_path, encoding=encoding)
+                df = self.read_columns(encoding=encoding)
                 self._df = df
                 return df
             except UnicodeDecodeError:
@@ -41,6 +72,28 @@ class BaseParser(ABC):
 
         raise ValueError(f"Unable to read {self.file_path} with any encoding")
 
+    @staticmethod
+    def normalize_currency(values: pd.Series) -> pd.Series:
+        """
+        Convert a column of currency amounts to floats.
+
+        Handles "$" signs, thousands separators, quotes, surrounding whitespace
+        and parenthesized negatives such as "($1,234.50)". Blanks and text
+        that is not a number become NaN, leaving it to the caller whether that
+        is an error or zero.
+        """
+        if pd.api.types.is_numeric_dtype(values):
+            return values.astype(float)
+
+        text = values.map(
+            lambda cell: (
+                cell.translate(CURRENCY_CHARACTERS).strip()
+                if isinstance(cell, str)
+                else cell
+            )
+        )
+        return pd.to_numeric(text, errors="coerce").astype(float)
+
     def validate_format(self) -> Tuple[bool, str]:
         if self._df is None:
             self._df = self.read_csv()
@@ -54,11 +107,17 @@ class BaseParser(ABC):
         for column, expected_type in self.column_types.items():
             try:
                 if expected_type is float:
-                    self._df[column] = (
-                        self._df[column]
-                        .replace({r"[\$,]": "", r"\(": "-", r"\)": ""}, regex=True)
-                        .astype(float)
-                    )
+                    values = self._df[column]
+                    amounts = self.normalize_currency(values)
+
+                    # Blank cells are allowed, anything else must be a number
+                    failed = values[amounts.isna() & values.notna()]
+                    failed = failed[failed.astype(str).str.strip() != ""]
+                    if not failed.empty:
+                        raise ValueError(
+                            f"could not convert string to float: {failed.iloc[0]!r}"
+                        )
+                    self._df[column] = amounts
                 else:
                     self._df[column] = self._df[column].astype(expected_type)
             except Exception as e:
@@ -91,45 +150,52 @@ class BaseParser(ABC):
                 - fee_col: column for fees
         """
         try:
-            # First standardize the input column names
-            df = df.copy()
-
-            # Standardize the merchant/business name column to "Merchant Name"
-            name_columns = [
-                "Business Name",
-                "Merchant Name",
-                "business_name",
-                "merchant_name",
-            ]
-            for col in name_columns:
-                if col in df.columns:
-                    df["Merchant Name"] = df[col]
-                    break
-
-            # Create pivot table
-            pivot = pd.pivot_table(
-                df,
-                values=[gross_col, net_col, fee_col],
-                index=index,
-                aggfunc=aggfunc,
-                margins=True,
-                margins_name="Totals",  # This sets 'Totals' instead of 'All'
+            # Group by the merchant/business name column as "Merchant Name"
+            name_column = next(
+                (col for col in NAME_COLUMNS if col in df.columns), "Merchant Name"
+            )
+            keys = [name_column if col == "Merchant Name" else col for col in index]
+            values = [gross_col, net_col, fee_col]
+            data = df[keys + values]
+
+            # One aggregation per group, sorted by key like pd.pivot_table;
+            # rows missing a key are left out. Sorting the groups afterwards
+            # is much cheaper than letting groupby sort every row's keys, but
+            # keys mixing numbers and text only sort the way groupby does
+            pivot = data.groupby(keys, sort=False, observed=True)[values].agg(aggfunc)
+            levels = getattr(pivot.index, "levels", [pivot.index])
+            if any(infer_dtype(level).startswith("mixed") for level in levels):
+                pivot = data.groupby(keys, observed=True)[values].agg(aggfunc)
+            else:
+                pivot = pivot.sort_index()
+            pivot = pivot.dropna(how="all")
+            pivot.index.names = index
+
+            for level in range(pivot.index.nlevels):
+                if "Totals" in pivot.index.get_level_values(level):
+                    raise ValueError('Conflicting name "Totals" in margins')
+
+            # Totals row over the rows with no missing values, as margins=True.
+            # It is appended after reset_index, as appending to a MultiIndex
+            # re-sorts every level
+            complete = data.notna().all(axis=1)
+            if not complete.all():
+                data = data[complete]
+            totals = dict(zip(index, ["Totals"] + [""] * (len(index) - 1)))
+            for col in values:
+                totals[col] = getattr(data[col], aggfunc)()
+            pivot = pd.concat(
+                [pivot.reset_index(), pd.DataFrame([totals])], ignore_index=True
             ).round(2)
 
-            # Reset index to make index columns regular columns
-            pivot = pivot.reset_index()
-
-            # Rename columns to standard names and reorder
-            pivot.columns = [
-                col
-                if col in ["Advance ID", "Merchant Name"]
-                else {
+            # Rename columns to standard names
+            pivot = pivot.rename(
+                columns={
                     gross_col: "Sum of Syn Gross Amount",
                     net_col: "Sum of Syn Net Amount",
                     fee_col: "Total Servicing Fee",
-                }[col]
-                for col in pivot.columns
-            ]
+                }
+            )
 
             # Set empty string in Merchant Name column for totals row
             totals_mask = pivot["Advance ID"] == "Totals"
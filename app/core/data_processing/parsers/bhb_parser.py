@@ -28,18 +28,13 @@ class BHBParser(BaseParser):
             "Fee": float,
             "Net Payment Amount": float,
         }
-
-    def currency_to_float(self, value: any) -> float:
-        """Convert currency string to float."""
-        if isinstance(value, str):
-            value = (
-                value.replace("$", "")
-                .replace(",", "")
-                .replace("(", "-")
-                .replace(")", "")
-                .strip()
-            )
-        return float(value)
+        # Deal IDs are left numeric, which the pivot is sorted by
+        self.csv_dtypes = {
+            "Deal Name": str,
+            "Participator Gross Amount": str,
+            "Fee": str,
+            "Net Payment Amount": str,
+        }
 
     def validate_format(self) -> Tuple[bool, str]:
         """Override validate_format to handle original column names"""
@@ -47,9 +42,9 @@ class BHBParser(BaseParser):
             # Read the file first
             if self._df is None:
                 if self.file_path.suffix.lower() == ".xlsx":
-                    self._df = pd.read_excel(self.file_path, sheet_name="Sheet1")
+                    self._df = pd.read_excel(self.source.buffer(), sheet_name="Sheet1")
                 elif self.file_path.suffix.lower() == ".csv":
-                    self._df = pd.read_csv(self.file_path, encoding="utf-8")
+                    self._df = self.read_columns(encoding="utf-8")
                 else:
                     return (
                         False,
@@ -77,13 +72,8 @@ class BHBParser(BaseParser):
             df = df[pd.to_numeric(df["Deal ID"], errors="coerce").notnull()]
 
             # Convert currency columns to float
-            df["Participator Gross Amount"] = df["Participator Gross Amount"].apply(
-                self.currency_to_float
-            )
-            df["Net Payment Amount"] = df["Net Payment Amount"].apply(
-                self.currency_to_float
-            )
-            df["Fee"] = df["Fee"].apply(self.currency_to_float)
+            for col in ["Participator Gross Amount", "Net Payment Amount", "Fee"]:
+                df[col] = self.normalize_currency(df[col])
 
             # Create standardized DataFrame
             processed_df = pd.DataFrame(
@@ -2,7 +2,8 @@
 
 from pathlib import Path
 import pandas as pd
-from typing import Tuple, Optional
+from typing import Tuple, Optional, List
+from itertools import chain, islice
 from .base_parser import BaseParser
 import openpyxl
 import logging
@@ -22,6 +23,42 @@ warnings.filterwarnings(
 )
 
 
+# Values in column A that mark a header row rather than data
+HEADER_VALUES = [
+    "funding id",
+    "fundingid",
+    "funding_id",
+    "id",
+    "advance id",
+    "advanceid",
+]
+
+# Zero-based positions of the columns read from each report row
+ID_COL = 0  # Column A - Funding ID
+NAME_COL = 2  # Column C - Merchant Name
+AMOUNT_COL = 34  # Column AI - Net amount, usually a SUM formula
+PAYMENT_COLS = range(31, 41)  # AF to AO - daily payment columns
+
+
+def _row_value(values: tuple, index: int):
+    """Return a cell value from a streamed row, which may be short."""
+    return values[index] if index < len(values) else None
+
+
+def _sum_numeric(values: tuple, indexes) -> float:
+    """Sum the numeric cells of a streamed row, skipping anything else."""
+    total = 0.0
+    for index in indexes:
+        value = _row_value(values, index)
+        if value is not None:
+            try:
+                total += float(value)
+            except (ValueError, TypeError):
+                # Skip non-numeric values
+                pass
+    return total
+
+
 class BIGParser(BaseParser):
     def __init__(self, file_path: Path):
         super().__init__(file_path)
@@ -30,10 +67,20 @@ class BIGParser(BaseParser):
         # the BIG file format has many columns and we only need a few
         self.required_columns = []
         self.column_types = {}
+        self._sheetnames: Optional[List[str]] = None
 
         # Initialize logger
         self.logger = logging.getLogger(f"parser.{self.__class__.__name__}")
 
+    def get_sheetnames(self) -> List[str]:
+        """Return the report's sheet names, opening the workbook only once"""
+        if self._sheetnames is None:
+            self.logger.info(f"Loading workbook: {self.file_path}")
+            workbook = openpyxl.load_workbook(self.source.buffer(), read_only=True)
+            self._sheetnames = workbook.sheetnames
+            workbook.close()
+        return self._sheetnames
+
     def validate_format(self) -> Tuple[bool, str]:
         """Validate BIG report format by checking for required worksheets and columns"""
         try:
@@ -41,19 +88,14 @@ class BIGParser(BaseParser):
             if self.file_path.suffix.lower() not in [".xlsx", ".xls"]:
                 return False, "File must be an Excel file (.xlsx or .xls)"
 
-            self.logger.info(f"Loading workbook: {self.file_path}")
-
-            # Load workbook
-            workbook = openpyxl.load_workbook(self.file_path, read_only=True)
+            sheetnames = self.get_sheetnames()
 
             # Log all available sheets for debugging
-            self.logger.info(f"Available sheets in workbook: {workbook.sheetnames}")
+            self.logger.info(f"Available sheets in workbook: {sheetnames}")
 
             # More flexible sheet name matching
-            alder_match = next((s for s in workbook.sheetnames if "R&H" in s), None)
-            wr_match = next(
-                (s for s in workbook.sheetnames if "White Rabbit" in s), None
-            )
+            alder_match = next((s for s in sheetnames if "R&H" in s), None)
+            wr_match = next((s for s in sheetnames if "White Rabbit" in s), None)
 
             if alder_match:
                 self.logger.info(f"Found Alder sheet: {alder_match}")
@@ -63,7 +105,7 @@ class BIGParser(BaseParser):
             if not alder_match and not wr_match:
                 return (
                     False,
-                    f"Could not find any portfolio sheets. Available sheets: {workbook.sheetnames}",
+                    f"Could not find any portfolio sheets. Available sheets: {sheetnames}",
                 )
 
             return True, ""
@@ -74,10 +116,10 @@ class BIGParser(BaseParser):
     def detect_portfolio(self) -> Optional[str]:
         """Detect which portfolio this BIG file is for based on available sheets"""
         try:
-            workbook = openpyxl.load_workbook(self.file_path, read_only=True)
+            sheetnames = self.get_sheetnames()
 
             # More flexible sheet name matching
-            for sheet in workbook.sheetnames:
+            for sheet in sheetnames:
                 if "R&H" in sheet:
                     self.logger.info(f"Detected Alder portfolio from sheet: {sheet}")
                     self.alder_sheet_name = sheet
@@ -89,9 +131,7 @@ class BIGParser(BaseParser):
                     self.wr_sheet_name = sheet
                     return "White Rabbit"
 
-            self.logger.warning(
-                f"Could not detect portfolio from sheets: {workbook.sheetnames}"
-            )
+            self.logger.warning(f"Could not detect portfolio from sheets: {sheetnames}")
             return None
 
         except Exception as e:
@@ -101,8 +141,6 @@ class BIGParser(BaseParser):
     def get_portfolio_sheet_name(self, portfolio: str) -> Optional[str]:
         """Get the correct sheet name for the given portfolio"""
         try:
-            workbook = openpyxl.load_workbook(self.file_path, read_only=True)
-
             # Use stored sheet names if available
             if portfolio == "Alder" and hasattr(self, "alder_sheet_name"):
                 return self.alder_sheet_name
@@ -110,7 +148,7 @@ class BIGParser(BaseParser):
                 return self.wr_sheet_name
 
             # Otherwise search for matching sheets
-            for sheet in workbook.sheetnames:
+            for sheet in self.get_sheetnames():
                 if portfolio == "Alder" and "R&H" in sheet:
                     self.alder_sheet_name = sheet
                     return sheet
@@ -176,151 +214,158 @@ class BIGParser(BaseParser):
 
         return None
 
+    def find_sum_source_columns(self, sheet_name: str, start_row: int) -> List[int]:
+        """
+        Inspect the AI formulas of the first data rows and return the zero-based
+        indexes of the columns their SUM covers.
+        """
+        self.logger.info("Examining formulas in column AI")
+
+        # Formulas are only visible without data_only; streaming a handful of
+        # rows from a read-only workbook keeps this cheap
+        workbook = openpyxl.load_workbook(self.source.buffer(), read_only=True)
+        try:
+            worksheet = workbook[sheet_name]
+            formula_patterns = []
+            for (value,) in worksheet.iter_rows(
+                min_row=start_row,
+                max_row=start_row + 4,
+                min_col=AMOUNT_COL + 1,
+                max_col=AMOUNT_COL + 1,
+                values_only=True,
+            ):
+                if value and isinstance(value, str) and value.startswith("=SUM("):
+                    formula_range = self.parse_sum_formula(value)
+                    if formula_range:
+                        formula_patterns.append(formula_range)
+        finally:
+            workbook.close()
+
+        if not formula_patterns:
+            return []
+
+        # Extract column letters from the first formula pattern
+        self.logger.info(f"Found formula patterns: {formula_patterns}")
+        start_cell, end_cell = formula_patterns[0]
+        start_col = re.match(r"([A-Z]+)\d+", start_cell).group(1)
+        end_col = re.match(r"([A-Z]+)\d+", end_cell).group(1)
+
+        source_cols = list(
+            range(
+                openpyxl.utils.column_index_from_string(start_col) - 1,
+                openpyxl.utils.column_index_from_string(end_col),
+            )
+        )
+        self.logger.info(
+            "Will use source columns for calculation: "
+            f"{[openpyxl.utils.get_column_letter(c + 1) for c in source_cols]}"
+        )
+        return source_cols
+
     def process_with_formula_handling(self, portfolio: str) -> pd.DataFrame:
-        """Process BIG data with special handling for formulas"""
+        """
+        Process BIG data with special handling for formulas.
+
+        The report is streamed once in read-only mode using the cached formula
+        results. Formulas are only inspected when some rows have no cached
+        amount in column AI, and then only those rows are recalculated.
+        """
         try:
             # Get the correct sheet name for this portfolio
             sheet_name = self.get_portfolio_sheet_name(portfolio)
             if not sheet_name:
                 raise ValueError(f"Unable to find sheet for portfolio: {portfolio}")
 
-            # Load workbook with data_only=True to evaluate formulas
-            self.logger.info(f"Loading workbook with data_only=True: {self.file_path}")
-            workbook_calculated = openpyxl.load_workbook(self.file_path, data_only=True)
-
-            # Also load a version without formula evaluation to examine formulas
-            workbook_formulas = openpyxl.load_workbook(self.file_path)
-
-            # Get both worksheet versions
-            worksheet_calculated = workbook_calculated[sheet_name]
-            worksheet_formulas = workbook_formulas[sheet_name]
+            self.logger.info(
+                f"Streaming workbook with data_only=True: {self.file_path}"
+            )
+            workbook = openpyxl.load_workbook(
+                self.source.buffer(), read_only=True, data_only=True
+            )
 
             # Lists to store data
             advance_ids = []
             merchant_names = []
             net_amounts = []
 
-            # Get columns A and C first - these don't involve formulas
-            id_col_letter = "A"  # Column A for Funding ID
-            name_col_letter = "C"  # Column C for Merchant Name
-
-            # Find header row first
-            start_row = 3  # Default start at row 3
-            header_values = [
-                "funding id",
-                "fundingid",
-                "funding_id",
-                "id",
-                "advance id",
-                "advanceid",
-            ]
-
-            for row_idx in range(1, 10):  # Check first 10 rows
-                id_cell = worksheet_calculated[f"{id_col_letter}{row_idx}"]
-                if id_cell.value and str(id_cell.value).lower() in header_values:
-                    start_row = row_idx + 1
-                    self.logger.info(
-                        f"Found header row at {row_idx}, data starts at row {start_row}"
-                    )
-                    break
-
-            # First check column AI for formula patterns
-            self.logger.info("Examining formulas in column AI")
+            # (position in the lists, row values) for rows whose cached AI
+            # amount is empty and may need recalculating
+            empty_amount_rows = []
 
-            # Check a few rows in column AI to see if they have SUM formulas
-            formula_patterns = []
-            for row_idx in range(start_row, start_row + 5):
-                cell = worksheet_formulas[f"AI{row_idx}"]
-                if (
-                    cell.value
-                    and isinstance(cell.value, str)
-                    and cell.value.startswith("=SUM(")
-                ):
-                    formula_range = self.parse_sum_formula(cell.value)
-                    if formula_range:
-                        formula_patterns.append(formula_range)
-
-            # Determine source columns based on formulas
-            source_cols = []
-            if formula_patterns:
-                # Extract column letters from the first formula pattern
-                self.logger.info(f"Found formula patterns: {formula_patterns}")
-                if formula_patterns[0]:
-                    start_cell, end_cell = formula_patterns[0]
-                    start_col = re.match(r"([A-Z]+)\d+", start_cell).group(1)
-                    end_col = re.match(r"([A-Z]+)\d+", end_cell).group(1)
-
-                    # Generate all columns in the range
-                    current_col = start_col
-                    while True:
-                        source_cols.append(current_col)
-                        if current_col == end_col:
-                            break
-                        # Increment column letter
-                        current_col = openpyxl.utils.get_column_letter(
-                            openpyxl.utils.column_index_from_string(current_col) + 1
-                        )
-
-                    self.logger.info(
-                        f"Will use source columns for calculation: {source_cols}"
-                    )
-
-            # Process rows
             row_count = 0
             data_rows = 0
 
-            for row_idx in range(start_row, worksheet_calculated.max_row + 1):
-                row_count += 1
-
-                # Get cells for this row
-                id_cell = worksheet_calculated[f"{id_col_letter}{row_idx}"]
-                name_cell = worksheet_calculated[f"{name_col_letter}{row_idx}"]
-
-                # Skip rows with empty ID
-                if id_cell.value is None or str(id_cell.value).strip() == "":
-                    continue
-
-                # Skip header rows
-                if id_cell.value and str(id_cell.value).lower() in header_values:
-                    continue
-
-                # Extract and clean values
-                advance_id = self.clean_advance_id(id_cell.value)
-                if advance_id is None:
-                    continue
-
-                merchant_name = str(name_cell.value).strip() if name_cell.value else ""
-
-                # First try to get evaluated formula value from column AI
-                amount_cell = worksheet_calculated[f"AI{row_idx}"]
-                amount = amount_cell.value if amount_cell.value is not None else 0.0
-
-                # If amount is 0 or None and we have source columns, calculate ourselves
-                if (amount is None or amount == 0) and source_cols:
-                    amount = 0.0
-                    for col in source_cols:
-                        cell = worksheet_calculated[f"{col}{row_idx}"]
-                        if cell.value is not None:
-                            try:
-                                amount += float(cell.value)
-                            except (ValueError, TypeError):
-                                # Skip non-numeric values
-                                pass
-
-                # Store values
-                advance_ids.append(advance_id)
-                merchant_names.append(merchant_name)
-                net_amounts.append(amount)
-                data_rows += 1
-
-                # Log occasional progress
-                if data_rows % 50 == 0:
-                    self.logger.info(f"Processed {data_rows} data rows so far")
+            try:
+                worksheet = workbook[sheet_name]
+                # Some exporters write a wrong sheet dimension; read every row
+                worksheet.reset_dimensions()
+                rows = worksheet.iter_rows(values_only=True)
+
+                # Find header row first in the first 9 rows
+                head = list(islice(rows, 9))
+                start_row = 3  # Default start at row 3
+                for row_idx, values in enumerate(head, start=1):
+                    id_value = _row_value(values, ID_COL)
+                    if id_value and str(id_value).lower() in HEADER_VALUES:
+                        start_row = row_idx + 1
+                        self.logger.info(
+                            f"Found header row at {row_idx}, data starts at row {start_row}"
+                        )
+                        break
+
+                # Process rows
+                for row_idx, values in enumerate(chain(head, rows), start=1):
+                    if row_idx < start_row:
+                        continue
+                    row_count += 1
+
+                    id_value = _row_value(values, ID_COL)
+
+                    # Skip rows with empty ID
+                    if id_value is None or str(id_value).strip() == "":
+                        continue
+
+                    # Skip header rows
+                    if str(id_value).lower() in HEADER_VALUES:
+                        continue
+
+                    # Extract and clean values
+                    advance_id = self.clean_advance_id(id_value)
+                    if advance_id is None:
+                        continue
+
+                    name_value = _row_value(values, NAME_COL)
+                    merchant_name = str(name_value).strip() if name_value else ""
+
+                    # Use the evaluated formula value from column AI
+                    amount = _row_value(values, AMOUNT_COL)
+                    amount = amount if amount is not None else 0.0
+                    if amount == 0:
+                        empty_amount_rows.append((len(net_amounts), values))
+
+                    # Store values
+                    advance_ids.append(advance_id)
+                    merchant_names.append(merchant_name)
+                    net_amounts.append(amount)
+                    data_rows += 1
+
+                    # Log occasional progress
+                    if data_rows % 50 == 0:
+                        self.logger.info(f"Processed {data_rows} data rows so far")
+            finally:
+                workbook.close()
 
             self.logger.info(
                 f"Found {data_rows} valid data rows out of {row_count} rows checked"
             )
 
+            # Recalculate rows without a cached amount from the SUM source range
+            if empty_amount_rows:
+                source_cols = self.find_sum_source_columns(sheet_name, start_row)
+                if source_cols:
+                    for position, values in empty_amount_rows:
+                        net_amounts[position] = _sum_numeric(values, source_cols)
+
             # Create DataFrame from processed data
             processed_df = pd.DataFrame(
                 {
@@ -344,33 +389,26 @@ class BIGParser(BaseParser):
                 + f"sum={processed_df['Sum of Syn Net Amount'].sum()}"
             )
 
-            # Check for all zeros
+            # Check for all zeros - every row is then an empty-amount row, so
+            # its streamed values are still at hand
             zero_count = (processed_df["Sum of Syn Net Amount"] == 0).sum()
-            if zero_count == len(processed_df):
+            if zero_count == len(processed_df) and len(empty_amount_rows) == len(
+                processed_df
+            ):
                 self.logger.warning("All rows still have zero amounts")
 
                 # Look for non-zero amounts in specific column range
                 # Typically daily payments are in columns between AF and AP
-                payment_cols = []
-                for col_idx in range(32, 42):  # AF to AP (approximate range)
-                    col_letter = openpyxl.utils.get_column_letter(col_idx)
-                    payment_cols.append(col_letter)
-
-                self.logger.info(f"Trying specific payment columns: {payment_cols}")
+                self.logger.info(
+                    "Trying specific payment columns: "
+                    f"{[openpyxl.utils.get_column_letter(c + 1) for c in PAYMENT_COLS]}"
+                )
 
                 # Try recalculating from these specific payment columns
-                new_amounts = []
-                for row_idx, _ in enumerate(advance_ids, start=start_row):
-                    row_sum = 0.0
-                    for col_letter in payment_cols:
-                        cell = worksheet_calculated[f"{col_letter}{row_idx}"]
-                        if cell.value is not None:
-                            try:
-                                row_sum += float(cell.value)
-                            except (ValueError, TypeError):
-                                # Skip non-numeric values
-                                pass
-                    new_amounts.append(row_sum)
+                new_amounts = [
+                    _sum_numeric(values, PAYMENT_COLS)
+                    for _, values in empty_amount_rows
+                ]
 
                 # Update amounts if we found any non-zero values
                 if any(amt != 0 for amt in new_amounts):
@@ -384,7 +422,7 @@ class BIGParser(BaseParser):
                     self.logger.info(
                         f"New statistics: min={min(new_amounts)}, "
                         + f"max={max(new_amounts)}, "
-                        + f"mean={sum(new_amounts)/len(new_amounts) if new_amounts else 0}, "
+                        + f"mean={sum(new_amounts) / len(new_amounts) if new_amounts else 0}, "
                         + f"sum={sum(new_amounts)}"
                     )
 
@@ -418,7 +456,7 @@ class BIGParser(BaseParser):
 
             # Read the Excel sheet with data_only=True to evaluate formulas
             self.logger.info(f"Reading sheet with pandas: {sheet_name}")
-            df = pd.read_excel(self.file_path, sheet_name=sheet_name)
+            df = pd.read_excel(self.source.buffer(), sheet_name=sheet_name)
 
             # Process data
             processed_df = pd.DataFrame(
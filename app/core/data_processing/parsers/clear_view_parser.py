@@ -4,25 +4,29 @@ from pathlib import Path
 import pandas as pd
 from typing import Tuple, Optional, List, Union
 from .base_parser import BaseParser
+from ..source_file import SourceFile
 
 
 class ClearViewParser(BaseParser):
-    def __init__(self, file_path: Union[Path, List[Path]]):
+    def __init__(
+        self, file_path: Union[Path, SourceFile, List[Union[Path, SourceFile]]]
+    ):
         """
         Initialize the ClearView parser with one or more file paths.
 
         Args:
             file_path: Either a single Path or a list of Paths to ClearView reports
         """
-        # Store all file paths
-        self.all_file_paths = (
-            [Path(file_path)]
-            if isinstance(file_path, (str, Path))
-            else [Path(p) for p in file_path]
+        # Store all files, each read from disk at most once
+        self.sources = (
+            [SourceFile.wrap(file_path)]
+            if isinstance(file_path, (str, Path, SourceFile))
+            else [SourceFile.wrap(p) for p in file_path]
         )
+        self.all_file_paths = [source.path for source in self.sources]
 
-        # Initialize base class with first file path to maintain compatibility
-        super().__init__(self.all_file_paths[0])
+        # Initialize base class with first file to maintain compatibility
+        super().__init__(self.sources[0])
 
         self.funder_name = "ClearView"
         self.required_columns = [
@@ -46,8 +50,16 @@ class ClearViewParser(BaseParser):
             "Syn Gross Amount": float,
             "Syn Net Amount": float,
         }
+        # Only the ID and amounts are used; the other required columns are
+        # read just to validate the report layout
+        self.csv_dtypes = {
+            "AdvanceID": str,
+            "Syn Gross Amount": str,
+            "Syn Net Amount": str,
+        }
 
         self._combined_df = None
+        self._validated_frames: List[pd.DataFrame] = []
 
         # Log initialization
         self.logger.info(
@@ -66,35 +78,17 @@ class ClearViewParser(BaseParser):
         """Return name property for compatibility with test framework."""
         return self.all_file_paths[0].name
 
-    def currency_to_float(self, value: any) -> float:
-        """Convert currency string to float."""
-        if pd.isna(value):
-            return 0.0
-        if isinstance(value, (int, float)):
-            return float(value)
-        if isinstance(value, str):
-            # Remove currency symbols, commas, and handle parentheses
-            value = (
-                value.replace("$", "")
-                .replace(",", "")
-                .replace("(", "-")
-                .replace(")", "")
-                .replace('"', "")
-                .strip()
-            )
-            try:
-                return float(value) if value else 0.0
-            except ValueError:
-                return 0.0
-        return 0.0
-
     def read_csv(self) -> pd.DataFrame:
         """Process ClearView files with logging"""
         try:
+            # Reuse the frames parsed during validation when available
+            frames = self._validated_frames or [
+                self.read_columns(source) for source in self.sources
+            ]
+
             all_data = []
-            for file_path in self.all_file_paths:
-                df = pd.read_csv(file_path)
-                self.logger.info(f"Reading file {file_path.name}")
+            for source, df in zip(self.sources, frames):
+                self.logger.info(f"Reading file {source.name}")
                 self.logger.info(
                     f"Sample AdvanceIDs: {df['AdvanceID'].head().tolist()}"
                 )
@@ -109,12 +103,17 @@ class ClearViewParser(BaseParser):
             self.logger.error(f"Error reading CSV: {str(e)}")
             raise
 
+    @property
+    def source_files(self) -> List[SourceFile]:
+        return self.sources
+
     def validate_format(self) -> Tuple[bool, str]:
         """Validate format of all provided files."""
         try:
-            for file_path in self.all_file_paths:
+            validated_frames = []
+            for source in self.sources:
                 encodings_to_try = [
-                    self.detect_encoding(),
+                    source.encoding,
                     "utf-8",
                     "cp1252",
                     "iso-8859-1",
@@ -123,13 +122,13 @@ class ClearViewParser(BaseParser):
                 df = None
                 for encoding in encodings_to_try:
                     try:
-                        df = pd.read_csv(file_path, encoding=encoding)
+                        df = self.read_columns(source, encoding)
                         break
                     except UnicodeDecodeError:
                         continue
 
                 if df is None:
-                    return False, f"Unable to read {file_path} with any encoding"
+                    return False, f"Unable to read {source.path} with any encoding"
 
                 # Check for required columns
                 missing_columns = [
@@ -138,15 +137,24 @@ class ClearViewParser(BaseParser):
                 if missing_columns:
                     return (
                         False,
-                        f"Missing columns in {file_path.name}: {', '.join(missing_columns)}",
+                        f"Missing columns in {source.name}: {', '.join(missing_columns)}",
                     )
 
+                validated_frames.append(df)
+
+            self._validated_frames = validated_frames
             return True, ""
 
         except Exception as e:
             return False, str(e)
 
-    def process_data(self) -> pd.DataFrame:
+    def aggregate_amounts(self) -> pd.DataFrame:
+        """
+        Clean the loaded rows and sum gross and net amounts per AdvanceID.
+
+        Returns:
+            DataFrame with "AdvanceID", "Syn Gross Amount" and "Syn Net Amount"
+        """
         try:
             # Make a copy of the DataFrame to avoid SettingWithCopyWarning
             combined = self._df.copy()
@@ -160,13 +168,7 @@ class ClearViewParser(BaseParser):
 
             # Convert amounts and handle zeros
             for col in ["Syn Gross Amount", "Syn Net Amount"]:
-                combined[col] = pd.to_numeric(
-                    combined[col]
-                    .astype(str)
-                    .replace("[,$()]", "", regex=True)
-                    .replace("", "0"),
-                    errors="coerce",
-                ).fillna(0.0)
+                combined[col] = self.normalize_currency(combined[col]).fillna(0.0)
                 combined[col] = combined[col].round(2)
 
             # Exclude rows where both amounts are zero
@@ -176,67 +178,122 @@ class ClearViewParser(BaseParser):
             ]
 
             # Group and sum
-            grouped = combined.groupby("AdvanceID", as_index=False).agg(
+            return combined.groupby("AdvanceID", as_index=False).agg(
                 {"Syn Gross Amount": "sum", "Syn Net Amount": "sum"}
             )
 
-            # Calculate Total Servicing Fee with decimals
-            grouped["Total Servicing Fee"] = (
-                (grouped["Syn Gross Amount"] - grouped["Syn Net Amount"]).abs().round(2)
-            )
+        except Exception as e:
+            self.logger.error(f"Processing error: {str(e)}")
+            raise
 
-            processed_df = pd.DataFrame(
-                {
-                    "Advance ID": grouped["AdvanceID"],
-                    "Merchant Name": grouped[
-                        "AdvanceID"
-                    ],  # Replace with actual merchant names if available
-                    "Sum of Syn Gross Amount": grouped["Syn Gross Amount"],
-                    "Sum of Syn Net Amount": grouped["Syn Net Amount"],
-                    "Total Servicing Fee": grouped["Total Servicing Fee"],
-                }
-            )
+    def build_processed_df(self, grouped: pd.DataFrame) -> pd.DataFrame:
+        """Turn per-AdvanceID gross/net sums into the standard processed layout."""
+        # Calculate Total Servicing Fee with decimals
+        total_fee = (
+            (grouped["Syn Gross Amount"] - grouped["Syn Net Amount"]).abs().round(2)
+        )
 
-            return processed_df
+        return pd.DataFrame(
+            {
+                "Advance ID": grouped["AdvanceID"],
+                "Merchant Name": grouped[
+                    "AdvanceID"
+                ],  # Replace with actual merchant names if available
+                "Sum of Syn Gross Amount": grouped["Syn Gross Amount"],
+                "Sum of Syn Net Amount": grouped["Syn Net Amount"],
+                "Total Servicing Fee": total_fee,
+            }
+        )
+
+    def process_data(self) -> pd.DataFrame:
+        return self.build_processed_df(self.aggregate_amounts())
+
+    def _load(self) -> Optional[str]:
+        """Validate and read the files, returning an error message on failure."""
+        # First validate format
+        is_valid, error_msg = self.validate_format()
+        if not is_valid:
+            return error_msg
+
+        # Ensure data is loaded
+        if self._df is None:
+            self.read_csv()
+
+        if self._df is None:
+            return "Failed to read CSV file"
+
+        return None
+
+    def _summarize(
+        self, processed_df: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, float, float, float, Optional[str]]:
+        """Build the pivot and totals from a processed DataFrame."""
+        # Calculate totals directly from processed DataFrame
+        total_gross = processed_df["Sum of Syn Gross Amount"].sum()
+        total_net = processed_df["Sum of Syn Net Amount"].sum()
+        total_fee = processed_df["Total Servicing Fee"].sum()
+
+        # Create pivot table using base parser method
+        pivot = self.create_pivot_table(
+            df=processed_df,
+            gross_col="Sum of Syn Gross Amount",
+            net_col="Sum of Syn Net Amount",
+            fee_col="Total Servicing Fee",
+            index=["Advance ID", "Merchant Name"],
+        )
+
+        return pivot, total_gross, total_net, total_fee, None
+
+    def parse_daily_totals(self) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """
+        Parse this parser's file(s) into per-AdvanceID gross/net sums only.
+
+        Used to fold a single day's report into the week's running totals
+        without re-reading the days already folded.
+
+        Returns:
+            Tuple of (aggregate_amounts() result, error message)
+        """
+        try:
+            error_msg = self._load()
+            if error_msg:
+                return None, error_msg
+            return self.aggregate_amounts(), None
 
         except Exception as e:
-            self.logger.error(f"Processing error: {str(e)}")
-            raise
+            error_msg = f"Error processing ClearView file: {str(e)}"
+            self.logger.error(error_msg)
+            return None, error_msg
 
-    def process(self) -> Tuple[pd.DataFrame, float, float, float, Optional[str]]:
+    def process_weekly_totals(
+        self, weekly_totals: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, float, float, float, Optional[str]]:
+        """
+        Build the week's pivot and totals from running per-AdvanceID sums.
+
+        Args:
+            weekly_totals: DataFrame laid out like aggregate_amounts() output
+        """
         try:
-            # First validate format
-            is_valid, error_msg = self.validate_format()
-            if not is_valid:
-                return None, 0, 0, 0, error_msg
+            return self._summarize(self.build_processed_df(weekly_totals))
 
-            # Ensure data is loaded
-            if self._df is None:
-                self.read_csv()
+        except Exception as e:
+            error_msg = f"Error processing ClearView file: {str(e)}"
+            self.logger.error(error_msg)
+            return None, 0, 0, 0, error_msg
 
-            if self._df is None:
-                return None, 0, 0, 0, "Failed to read CSV file"
+    def process(self) -> Tuple[pd.DataFrame, float, float, float, Optional[str]]:
+        try:
+            error_msg = self._load()
+            if error_msg:
+                return None, 0, 0, 0, error_msg
 
             # Process the data
             processed_df = self.process_data()
             if processed_df is None:
                 return None, 0, 0, 0, "Failed to process data"
 
-            # Calculate totals directly from processed DataFrame
-            total_gross = processed_df["Sum of Syn Gross Amount"].sum()
-            total_net = processed_df["Sum of Syn Net Amount"].sum()
-            total_fee = processed_df["Total Servicing Fee"].sum()
-
-            # Create pivot table using base parser method
-            pivot = self.create_pivot_table(
-                df=processed_df,
-                gross_col="Sum of Syn Gross Amount",
-                net_col="Sum of Syn Net Amount",
-                fee_col="Total Servicing Fee",
-                index=["Advance ID", "Merchant Name"],
-            )
-
-            return pivot, total_gross, total_net, total_fee, None
+            return self._summarize(processed_df)
 
         except Exception as e:
             error_msg = f"Error processing ClearView file: {str(e)}"
@@ -25,6 +25,14 @@ class EfinParser(BaseParser):
             "Servicing Fee $": float,
             "Payable Amt (Net)": float,
         }
+        # Read as text: IDs keep their digits and amounts are cleaned below
+        self.csv_dtypes = {
+            "Advance ID": str,
+            "Business Name": str,
+            "Payable Amt (Gross)": str,
+            "Servicing Fee $": str,
+            "Payable Amt (Net)": str,
+        }
 
         # Add debugging counters
         self.debug_stats = {
@@ -37,36 +45,6 @@ class EfinParser(BaseParser):
             "processing_errors": [],
         }
 
-    def currency_to_float(self, value: any) -> float:
-        """Convert currency string to float with debug logging."""
-        try:
-            if pd.isna(value):
-                return 0.0
-            if isinstance(value, (int, float)):
-                return float(value)
-            if isinstance(value, str):
-                value = (
-                    value.replace("$", "")
-                    .replace(",", "")
-                    .replace("(", "-")
-                    .replace(")", "")
-                    .replace('"', "")
-                    .strip()
-                )
-                try:
-                    return float(value) if value else 0.0
-                except ValueError:
-                    self.debug_stats["processing_errors"].append(
-                        f"Failed to convert value to float: {value}"
-                    )
-                    return 0.0
-            return 0.0
-        except Exception as e:
-            self.debug_stats["processing_errors"].append(
-                f"Error in currency_to_float: {str(e)} for value: {value}"
-            )
-            return 0.0
-
     def read_csv(self) -> pd.DataFrame:
         """Read and perform initial processing of the CSV file with enhanced debugging"""
         try:
@@ -78,7 +56,7 @@ class EfinParser(BaseParser):
 
             for encoding in encodings_to_try:
                 try:
-                    df = pd.read_csv(self.file_path, encoding=encoding)
+                    df = self.read_columns(encoding=encoding)
                     self.logger.info(f"Successfully read file with {encoding} encoding")
                     break
                 except UnicodeDecodeError:
@@ -151,7 +129,15 @@ class EfinParser(BaseParser):
             for col in currency_columns:
                 # Store original values for comparison
                 original_values = df[col].copy()
-                df[col] = df[col].apply(self.currency_to_float)
+                df[col] = self.normalize_currency(df[col])
+
+                # Unreadable amounts count as zero
+                failed = df[col].isna() & original_values.notna()
+                for value in original_values[failed]:
+                    self.debug_stats["processing_errors"].append(
+                        f"Failed to convert value to float: {value}"
+                    )
+                df[col] = df[col].fillna(0.0)
 
                 # Log significant changes
                 significant_changes = (
@@ -25,6 +25,14 @@ class KingsBoomParser(BaseParser):
             "Servicing Fee $": float,
             "Payable Amt (Net)": float,
         }
+        # Read as text: IDs keep their digits and amounts are cleaned below
+        self.csv_dtypes = {
+            "Advance ID": str,
+            "Business Name": str,
+            "Payable Amt (Gross)": str,
+            "Servicing Fee $": str,
+            "Payable Amt (Net)": str,
+        }
 
     def process_data(self) -> pd.DataFrame:
         """Process Kings/Boom data."""
@@ -52,12 +60,7 @@ class KingsBoomParser(BaseParser):
 
             # Convert amount columns to numeric, handling currency formatting and negative numbers
             for col in ["Payable Amt (Gross)", "Servicing Fee $", "Payable Amt (Net)"]:
-                # Remove currency symbols and commas
-                df[col] = df[col].astype(str).replace(r"[\$,]", "", regex=True)
-                # Convert parentheses to negative signs
-                df[col] = df[col].str.replace(r"\((.*)\)", r"-\1", regex=True)
-                # Convert to numeric
-                df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).round(2)
+                df[col] = self.normalize_currency(df[col]).fillna(0).round(2)
 
             # Filter out rows where both amounts are zero
             non_zero_mask = (df["Payable Amt (Gross)"] != 0) | (
@@ -0,0 +1,80 @@
+# app/core/data_processing/parsers/parse_pool.py
+
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, Hashable, Optional, Tuple, Type, Any
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from .base_parser import BaseParser
+
+ParseResult = Tuple[Optional["pd.DataFrame"], float, float, float, Optional[str]]
+
+logger = logging.getLogger(__name__)
+
+
+def run_parser(parser_class: Type["BaseParser"], source: Any) -> ParseResult:
+    """
+    Instantiate a parser and run it.
+
+    This is the unit of work sent to worker processes, so it must stay a
+    module-level function that only takes picklable arguments.
+
+    Args:
+        parser_class: BaseParser subclass to instantiate
+        source: Whatever the parser's constructor accepts (a path or list of paths)
+
+    Returns:
+        The (pivot, gross, net, fee, error) tuple from BaseParser.process()
+    """
+    try:
+        return parser_class(source).process()
+    except Exception as e:
+        return None, 0, 0, 0, f"Error running {parser_class.__name__}: {str(e)}"
+
+
+def parse_files(
+    jobs: Dict[Hashable, Tuple[Type["BaseParser"], Any]],
+    max_workers: Optional[int] = None,
+) -> Dict[Hashable, ParseResult]:
+    """
+    Run several parsers in parallel across a process pool.
+
+    Args:
+        jobs: Mapping of caller-chosen key to (parser class, parser source)
+        max_workers: Maximum worker processes, defaults to the CPU count
+
+    Returns:
+        Mapping of the same keys to each parser's process() result
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(jobs))
+
+    # Not worth paying process start-up for a single file
+    if max_workers <= 1:
+        return {key: run_parser(cls, source) for key, (cls, source) in jobs.items()}
+
+    results = {}
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                key: pool.submit(run_parser, cls, source)
+                for key, (cls, source) in jobs.items()
+            }
+            for key, future in futures.items():
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    logger.error(f"Parser worker failed for {key}: {str(e)}")
+                    results[key] = (None, 0, 0, 0, f"Parser worker failed: {str(e)}")
+
+    except (OSError, NotImplementedError) as e:
+        # Some environments cannot spawn processes; parse serially instead
+        logger.warning(f"Process pool unavailable, parsing serially: {str(e)}")
+        for key, (cls, source) in jobs.items():
+            if key not in results:
+                results[key] = run_parser(cls, source)
+
+    return results
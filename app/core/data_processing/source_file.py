@@ -0,0 +1,125 @@
+# app/core/data_processing/source_file.py
+
+import hashlib
+from io import BytesIO, TextIOWrapper
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class SourceFile:
+    """
+    An uploaded file that is read from disk once and then shared.
+
+    The classifier and the parsers both take a SourceFile, so sniffing the
+    encoding, locating the header and parsing the CSV all work from the same
+    in-memory bytes instead of reopening the file at every step.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._data: Optional[bytes] = None
+        self._encoding: Optional[str] = None
+        self._sha256: Optional[str] = None
+        self._frames: Dict[Tuple, "pd.DataFrame"] = {}
+
+    @classmethod
+    def wrap(cls, file: Union[Path, str, "SourceFile"]) -> "SourceFile":
+        """Return file unchanged if it is already a SourceFile, else wrap it."""
+        return file if isinstance(file, SourceFile) else cls(file)
+
+    def __fspath__(self) -> str:
+        return str(self.path)
+
+    def __repr__(self) -> str:
+        return f"SourceFile({str(self.path)!r})"
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def suffix(self) -> str:
+        return self.path.suffix
+
+    @property
+    def data(self) -> bytes:
+        """Raw file contents, read from disk on first access."""
+        if self._data is None:
+            self._data = self.path.read_bytes()
+        return self._data
+
+    @property
+    def encoding(self) -> str:
+        """Encoding detected from the start of the file."""
+        if self._encoding is None:
+            import chardet
+
+            self._encoding = chardet.detect(self.data[:10000])["encoding"]
+        return self._encoding
+
+    @property
+    def sha256(self) -> str:
+        """Hex SHA-256 digest of the file contents."""
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.data).hexdigest()
+        return self._sha256
+
+    def buffer(self) -> BytesIO:
+        """Return a fresh binary stream over the file contents."""
+        return BytesIO(self.data)
+
+    def open_text(self, encoding: Optional[str] = None) -> TextIOWrapper:
+        """Return a text stream over the file contents, like open(path, "r")."""
+        return TextIOWrapper(self.buffer(), encoding=encoding)
+
+    def read_csv(self, **kwargs) -> "pd.DataFrame":
+        """
+        Parse the contents as CSV, caching the result per set of arguments.
+
+        A copy is returned so callers may modify it freely.
+        """
+        key = tuple(sorted((k, repr(v)) for k, v in kwargs.items()))
+        if key not in self._frames:
+            import pandas as pd
+
+            self._frames[key] = pd.read_csv(self.buffer(), **kwargs)
+        return self._frames[key].copy()
+
+    def read_columns(
+        self,
+        columns: Iterable[str],
+        dtype: Optional[Dict[str, type]] = None,
+        encoding: Optional[str] = None,
+    ) -> "pd.DataFrame":
+        """
+        Parse only the named columns of the CSV.
+
+        Names missing from the header are skipped instead of raising, so the
+        caller can still report them as missing columns. Always uses pandas'
+        C engine: the pyarrow engine applies dtype after inferring its own
+        types, so text IDs such as "00123" come back as "123.0" and blank
+        text cells as "None".
+
+        Args:
+            columns: Header names to read
+            dtype: Types to read columns as, instead of inferring them
+            encoding: Text encoding of the file
+        """
+        import pandas as pd
+
+        wanted = set(columns)
+        header = pd.read_csv(self.buffer(), nrows=0, encoding=encoding).columns
+        usecols = [col for col in header if col in wanted]
+        dtype = {col: t for col, t in (dtype or {}).items() if col in usecols}
+
+        return self.read_csv(usecols=usecols, dtype=dtype or None, encoding=encoding)
+
+    def __getstate__(self) -> Dict:
+        # Parsed frames are cheap to rebuild from the bytes, so leave them
+        # behind when the source is sent to a worker process
+        state = self.__dict__.copy()
+        state["_frames"] = {}
+        return state
@@ -1,9 +1,14 @@
 from pathlib import Path
-import pandas as pd
-import sqlite3
-from typing import Dict, List, Optional
+import sys
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 import logging
 from dataclasses import dataclass
+from core.data_processing.source_file import SourceFile
+from utils.db_pool import get_connection
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 @dataclass
@@ -15,7 +20,22 @@ class ClassificationResult:
     reason: str
 
 
+# Changes whenever merchant_tracking rows are added or upserted, or the
+# table is emptied, by this process or any other (the CLI and the GUI share
+# the database). Both are single index lookups
+INDEX_VERSION_QUERY = """
+    SELECT
+        (SELECT MAX(rowid) FROM merchant_tracking),
+        (SELECT MAX(last_updated) FROM merchant_tracking)
+"""
+
+
 class FunderClassifier:
+    # (version, advance_id -> (funder, portfolio)) for each database, shared
+    # by every classifier in the process
+    _indexes: Dict[str, Tuple[Tuple, Dict[str, Tuple[str, str]]]] = {}
+    _index_lock = threading.Lock()
+
     def __init__(self, db_path: Path):
         self.db_path = db_path
         self.logger = logging.getLogger(__name__)
@@ -23,11 +43,11 @@ class FunderClassifier:
         # Common ID column names across different funders
         self.possible_id_columns = ["Advance ID", "AdvanceID", "Deal ID", "DealID"]
 
-    def _find_header_row(self, file_path: Path) -> Optional[int]:
+    def _find_header_row(self, source: SourceFile) -> Optional[int]:
         """Find the row containing the column headers."""
         try:
             # First read the file without header specification
-            df = pd.read_csv(file_path)
+            df = source.read_csv()
 
             # Check if this might be a weekly format file
             if "Withdrawn per deal" in df.columns:
@@ -41,22 +61,22 @@ class FunderClassifier:
             self.logger.error(f"Error finding header row: {str(e)}")
             return None
 
-    def _find_id_column(self, df: pd.DataFrame) -> Optional[str]:
+    def _find_id_column(self, df: "pd.DataFrame") -> Optional[str]:
         """Find the column containing advance IDs."""
         for col in self.possible_id_columns:
             if col in df.columns:
                 return col
         return None
 
-    def _get_advance_ids(self, file_path: Path) -> List[str]:
+    def _get_advance_ids(self, source: SourceFile) -> List[str]:
         """Extract advance IDs from the file with special handling for weekly format."""
         try:
             # Check for weekly format
-            header_row = self._find_header_row(file_path)
+            header_row = self._find_header_row(source)
 
             if header_row is not None:
-                # Read file again using the correct header row
-                df = pd.read_csv(file_path, skiprows=header_row)
+                # Parse again using the correct header row
+                df = source.read_csv(skiprows=header_row)
                 # Set the column names from the first row
                 df.columns = df.iloc[0]
                 # Remove the header row from the data
@@ -66,7 +86,7 @@ class FunderClassifier:
                 )
             else:
                 # Regular format file
-                df = pd.read_csv(file_path)
+                df = source.read_csv()
 
             # Try to find the ID column
             id_column = self._find_id_column(df)
@@ -92,35 +112,100 @@ class FunderClassifier:
             self.logger.error(f"Error extracting advance IDs: {str(e)}")
             return []
 
+    @staticmethod
+    def _index_key(db_path: Path) -> str:
+        return str(Path(db_path).resolve())
+
+    def _get_index(self) -> Dict[str, Tuple[str, str]]:
+        """
+        Return the advance ID index, loading it from the database on first
+        use and again whenever merchant_tracking has changed since.
+        """
+        key = self._index_key(self.db_path)
+        with self._index_lock, get_connection(self.db_path) as conn:
+            version = tuple(conn.execute(INDEX_VERSION_QUERY).fetchone())
+            cached = self._indexes.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            # Rows written after the version was read only make the next
+            # check reload once more
+            index = {}
+            # Share one (funder, portfolio) tuple per pair to keep the
+            # index compact
+            pairs = {}
+            cursor = conn.execute(
+                "SELECT advance_id, funder, portfolio FROM merchant_tracking"
+            )
+            for advance_id, funder, portfolio in cursor:
+                pair = (funder, portfolio)
+                index[advance_id] = pairs.setdefault(pair, pair)
+
+            self._indexes[key] = (version, index)
+            self.logger.info(f"Loaded {len(index)} advance IDs into index")
+            return index
+
+    @classmethod
+    def invalidate_index(cls, db_path: Path) -> None:
+        """Drop the index so it is rebuilt from the database on next use."""
+        with cls._index_lock:
+            cls._indexes.pop(cls._index_key(db_path), None)
+
+    def index_stats(self) -> Dict:
+        """Report the size and approximate memory footprint of the index."""
+        with self._index_lock:
+            cached = self._indexes.get(self._index_key(self.db_path))
+            if cached is None:
+                return {"loaded": False, "entries": 0, "pairs": 0, "bytes": 0}
+
+            index = cached[1]
+            pairs = set(index.values())
+            size = sys.getsizeof(index)
+            size += sum(sys.getsizeof(advance_id) for advance_id in index)
+            size += sum(
+                sys.getsizeof(pair) + sum(sys.getsizeof(value) for value in pair)
+                for pair in pairs
+            )
+
+            return {
+                "loaded": True,
+                "entries": len(index),
+                "pairs": len(pairs),
+                "bytes": size,
+            }
+
     def _match_ids_to_funder(self, advance_ids: List[str]) -> Dict[str, List[str]]:
-        """Match advance IDs to funders using the merchant_tracking database."""
+        """Match advance IDs to funders using the in-memory merchant index."""
         try:
+            index = self._get_index()
+            known_ids = index.keys() & set(advance_ids)
+
             matches = {}
-            with sqlite3.connect(self.db_path) as conn:
-                for advance_id in advance_ids:
-                    cursor = conn.execute(
-                        "SELECT funder FROM merchant_tracking WHERE advance_id = ?",
-                        (advance_id,),
-                    )
-                    result = cursor.fetchone()
-                    if result:
-                        funder = result[0]
-                        if funder not in matches:
-                            matches[funder] = []
-                        matches[funder].append(advance_id)
+            for advance_id in advance_ids:
+                if advance_id in known_ids:
+                    funder = index[advance_id][0]
+                    if funder not in matches:
+                        matches[funder] = []
+                    matches[funder].append(advance_id)
             return matches
 
         except Exception as e:
             self.logger.error(f"Database error: {str(e)}")
             return {}
 
-    def classify_funder(self, file_path: Path) -> ClassificationResult:
+    def classify_funder(
+        self, file_path: Union[Path, SourceFile]
+    ) -> ClassificationResult:
         """
         Classify a file by matching its advance IDs against the merchant database.
+
+        Pass a SourceFile to reuse its contents for parsing afterwards.
         """
         try:
+            source = SourceFile.wrap(file_path)
+
             # Get advance IDs from file
-            advance_ids = self._get_advance_ids(file_path)
+            advance_ids = self._get_advance_ids(source)
             if not advance_ids:
                 return ClassificationResult(
                     funder=None,
@@ -187,22 +272,23 @@ class FunderClassifier:
                 reason=f"Error during classification: {str(e)}",
             )
 
-    def debug_classification(self, file_path: Path) -> None:
+    def debug_classification(self, file_path: Union[Path, SourceFile]) -> None:
         """Enhanced debug helper to print detailed classification information."""
         try:
             print("\n=== Classification Debug ===")
+            source = SourceFile.wrap(file_path)
 
             # Check for weekly format
-            header_row = self._find_header_row(file_path)
+            header_row = self._find_header_row(source)
             if header_row is not None:
                 print(f"\nDetected weekly format file with header at row {header_row}")
                 # Read file with correct header
-                df = pd.read_csv(file_path, skiprows=header_row)
+                df = source.read_csv(skiprows=header_row)
                 df.columns = df.iloc[0]
                 df = df.iloc[1:]
             else:
                 print("\nRegular format file detected")
-                df = pd.read_csv(file_path)
+                df = source.read_csv()
 
             print("\nFile columns:", df.columns.tolist())
 
@@ -214,7 +300,7 @@ class FunderClassifier:
                 print("\nSample IDs:", df[id_col].head().tolist())
 
             # Get all advance IDs
-            advance_ids = self._get_advance_ids(file_path)
+            advance_ids = self._get_advance_ids(source)
             print(f"\nTotal IDs found: {len(advance_ids)}")
             if advance_ids:
                 print("Sample:", advance_ids[:5])
@@ -226,7 +312,7 @@ class FunderClassifier:
                 print(f"{funder}: {len(ids)} matches")
 
             # Run classification
-            result = self.classify_funder(file_path)
+            result = self.classify_funder(source)
             print("\nClassification Result:")
             print(f"Funder: {result.funder}")
             print(f"Confidence: {result.confidence:.2%}")
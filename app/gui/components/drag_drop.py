@@ -57,31 +57,38 @@ class DropZone(ctk.CTkFrame):
 
     def handle_drop(self, event):
         """Handle file drop event"""
-        # Clean the file path
-        raw_path = event.data
-        file_path = self.clean_file_path(raw_path)
+        # A drop may carry several files; queue each one for processing
+        for raw_path in self.tk.splitlist(event.data):
+            file_path = self.clean_file_path(raw_path)
+            self.file_list.insert("end", f"Queued: {file_path}\n")
+            self.controller.job_queue.submit(
+                Path(file_path),
+                portfolio=self.page.portfolio,
+                on_progress=self.show_progress,
+                on_done=self.show_result,
+            )
+
+        # Scroll to bottom
+        self.file_list.see("end")
 
-        # Update file list with original path
-        self.file_list.insert("end", f"Processing: {file_path}\n")
+    def show_progress(self, job, status):
+        """Report a processing stage reached by a queued file"""
+        stage = status.value.replace("_", " ").capitalize()
+        self.file_list.insert("end", f"  {stage}: {job.file_path.name}\n")
+        self.file_list.see("end")
 
-        try:
-            # Process the file using the cleaned path
-            success, results, error = self.controller.coordinator.process_uploaded_file(
-                Path(file_path), portfolio=self.page.portfolio
+    def show_result(self, job):
+        """Report the outcome of a processed file"""
+        success, results, error = job.result
+        if success:
+            self.file_list.insert(
+                "end",
+                f"✓ Success: {results['funder']}\n"
+                f"  Gross Total: ${results['totals']['gross']:,.2f}\n"
+                f"  Net Total: ${results['totals']['net']:,.2f}\n\n",
             )
-
-            if success:
-                self.file_list.insert(
-                    "end",
-                    f"✓ Success: {results['funder']}\n"
-                    f"  Gross Total: ${results['totals']['gross']:,.2f}\n"
-                    f"  Net Total: ${results['totals']['net']:,.2f}\n\n",
-                )
-            else:
-                self.file_list.insert("end", f"✗ Error: {error}\n\n")
-
-        except Exception as e:
-            self.file_list.insert("end", f"✗ Error: {str(e)}\n\n")
+        else:
+            self.file_list.insert("end", f"✗ Error: {error}\n\n")
 
         # Scroll to bottom
         self.file_list.see("end")
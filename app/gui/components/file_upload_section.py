@@ -51,13 +51,23 @@ class FileUploadSection(ctk.CTkFrame):
                 self.process_file(Path(file))
 
     def process_file(self, file_path: Path):
-        self.file_list.insert("end", f"Processing: {file_path}\n")
-        success, results, error = self.controller.coordinator.process_uploaded_file(
+        self.file_list.insert("end", f"Queued: {file_path}\n")
+        self.controller.job_queue.submit(
             file_path,
             portfolio=self.portfolio,
-            manual_funder=self.funder,  # Add this parameter
+            manual_funder=self.funder,
+            on_progress=self.show_progress,
+            on_done=self.show_result,
         )
+        self.file_list.see("end")
+
+    def show_progress(self, job, status):
+        stage = status.value.replace("_", " ").capitalize()
+        self.file_list.insert("end", f"  {stage}: {job.file_path.name}\n")
+        self.file_list.see("end")
 
+    def show_result(self, job):
+        success, results, error = job.result
         if success:
             self.file_list.insert(
                 "end",
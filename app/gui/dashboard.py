@@ -13,6 +13,7 @@ from .components.date_selector import DateSelector
 from config.system_config import SystemConfig
 from managers.file_manager import PortfolioFileManager
 from managers.coordinator import PortfolioCoordinator
+from managers.job_queue import JobQueue
 from .base_window import BasePage
 from managers.portfolio import Portfolio
 import logging
@@ -62,6 +63,10 @@ class Dashboard(TkinterDnD.Tk):
         # Setup logger
         self.logger = logging.getLogger(__name__)
 
+        # Deliver background job progress on the main loop
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self._poll_jobs()
+
     def setup_menu(self):
         """Create application menu system"""
         # Create menu bar
@@ -85,7 +90,7 @@ class Dashboard(TkinterDnD.Tk):
         )
 
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.quit)
+        file_menu.add_command(label="Exit", command=self.on_close)
 
     def export_specific_portfolio(self, portfolio: Portfolio):
         """Export a specific portfolio workbook to desktop"""
@@ -113,9 +118,27 @@ class Dashboard(TkinterDnD.Tk):
         # Initialize coordinator
         self.coordinator = PortfolioCoordinator(self.file_manager)
 
+        # Uploaded files are processed in the background, one at a time
+        self.job_queue = JobQueue(self.coordinator)
+
         # Set theme based on saved preferences
         ctk.set_appearance_mode(self.file_manager.preferences.theme_mode)
 
+    def _poll_jobs(self):
+        """Run callbacks from the processing worker, then check again shortly"""
+        self.job_queue.dispatch_events()
+        self.after(100, self._poll_jobs)
+
+    def on_close(self):
+        """Finish any queued files before closing the application"""
+        if self.job_queue.pending:
+            self.logger.info(
+                f"Waiting for {self.job_queue.pending} queued file(s) to finish"
+            )
+            self.withdraw()
+        self.job_queue.shutdown()
+        self.quit()
+
     def setup_navigation(self):
         """Create the navigation bar"""
         nav_frame = ctk.CTkFrame(self)
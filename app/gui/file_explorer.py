@@ -1,15 +1,18 @@
 # app/gui/file_explorer.py
 import customtkinter as ctk
 from pathlib import Path
-import pandas as pd
 from tkinter import ttk
 import shutil
 from .base_window import BasePage
 from managers.portfolio import Portfolio
+from managers.file_manager import PIVOT_FORMATS, load_pivot_table
+from utils.db_pool import get_connection
 from datetime import datetime
-import sqlite3
 from typing import List, Dict
 
+# Files fetched per page; more are loaded on request
+PAGE_SIZE = 200
+
 
 class FileFilter:
     def __init__(self):
@@ -118,9 +121,31 @@ class FileExplorer(BasePage):
         )
         x_scroll.grid(row=1, column=0, sticky="ew")
 
+        # Scrolling also checks that the files now in view still exist
+        def on_list_scrolled(first, last):
+            y_scroll.set(first, last)
+            self.check_visible_files(float(first), float(last))
+
         self.file_list.configure(
-            yscrollcommand=y_scroll.set, xscrollcommand=x_scroll.set
+            yscrollcommand=on_list_scrolled, xscrollcommand=x_scroll.set
         )
+        self.file_list.tag_configure("missing", foreground="grey")
+
+        # Page footer
+        page_frame = ctk.CTkFrame(list_frame)
+        page_frame.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(5, 0))
+
+        self.count_label = ctk.CTkLabel(page_frame, text="")
+        self.count_label.pack(side="left", padx=10)
+
+        self.load_more_button = ctk.CTkButton(
+            page_frame,
+            text="Load More",
+            width=100,
+            command=self.load_more_files,
+            state="disabled",
+        )
+        self.load_more_button.pack(side="right", padx=5)
 
         # Preview frame
         self.preview_frame = ctk.CTkFrame(content)
@@ -166,6 +191,8 @@ class FileExplorer(BasePage):
 
         # Initialize filter state
         self.filter_state = FileFilter()
+        self.next_page = None
+        self.checked_items = set()
 
         # Bind selection event
         self.file_list.bind("<<TreeviewSelect>>", self.on_file_selected)
@@ -244,7 +271,7 @@ class FileExplorer(BasePage):
     def get_available_funders(self) -> List[str]:
         """Get unique funders from database"""
         try:
-            with sqlite3.connect(self.controller.file_manager.db_path) as conn:
+            with get_connection(self.controller.file_manager.db_path) as conn:
                 cursor = conn.execute("SELECT DISTINCT funder FROM uploaded_files")
                 funders = [row[0] for row in cursor.fetchall()]
                 return ["All"] + sorted(funders)
@@ -293,100 +320,29 @@ class FileExplorer(BasePage):
         self.refresh_files()
 
     def get_filtered_files(self) -> List[Dict]:
-        """Get filtered files from database"""
+        """Get the next page of filtered files from database"""
         try:
-            # Base query for uploaded files
-            uploaded_query = """
-                SELECT 
-                    uf.original_filename,
-                    uf.stored_filename,
-                    uf.portfolio,
-                    uf.funder,
-                    uf.upload_date,
-                    uf.processing_status,
-                    uf.file_path,
-                    'Uploaded' as file_type
-                FROM uploaded_files uf
-                WHERE 1=1
-            """
-
-            # Base query for pivot tables
-            pivot_query = """
-                SELECT 
-                    pt.stored_filename as original_filename,
-                    pt.stored_filename,
-                    pt.portfolio,
-                    pt.funder,
-                    pt.creation_date as upload_date,
-                    'completed' as processing_status,
-                    pt.file_path,
-                    'Pivot Tables' as file_type
-                FROM pivot_tables pt
-                WHERE 1=1
-            """
-
-            params = []
-
-            # Add filter conditions
-            if self.filter_state.portfolio != "All":
-                uploaded_query += " AND uf.portfolio = ?"
-                pivot_query += " AND pt.portfolio = ?"
-                params.append(self.filter_state.portfolio)
-                params.append(self.filter_state.portfolio)
-
-            if self.filter_state.funder != "All":
-                uploaded_query += " AND uf.funder = ?"
-                pivot_query += " AND pt.funder = ?"
-                params.append(self.filter_state.funder)
-                params.append(self.filter_state.funder)
-
-            if self.filter_state.date_range:
-                start, end = self.filter_state.date_range
-                uploaded_query += (
-                    " AND DATE(uf.upload_date) BETWEEN DATE(?) AND DATE(?)"
-                )
-                pivot_query += " AND DATE(pt.creation_date) BETWEEN DATE(?) AND DATE(?)"
-                params.extend([start.isoformat(), end.isoformat()])
-                params.extend([start.isoformat(), end.isoformat()])
-
-            if self.filter_state.search_text:
-                search_term = f"%{self.filter_state.search_text}%"
-                uploaded_query += """ AND (
-                    uf.original_filename LIKE ? 
-                    OR uf.portfolio LIKE ? 
-                    OR uf.funder LIKE ?
-                )"""
-                pivot_query += """ AND (
-                    pt.stored_filename LIKE ? 
-                    OR pt.portfolio LIKE ? 
-                    OR pt.funder LIKE ?
-                )"""
-                params.extend([search_term, search_term, search_term])
-                params.extend([search_term, search_term, search_term])
-
-            # Combine queries based on file type filter
-            if self.filter_state.file_type == "Uploaded":
-                final_query = uploaded_query
-                final_params = params[
-                    : len(params) // 2
-                ]  # Use only first set of params
-            elif self.filter_state.file_type == "Pivot Tables":
-                final_query = pivot_query
-                final_params = params[
-                    len(params) // 2 :
-                ]  # Use only second set of params
-            else:  # "All"
-                final_query = f"{uploaded_query} UNION ALL {pivot_query}"
-                final_params = params
-
-            final_query += " ORDER BY upload_date DESC"
-
-            with sqlite3.connect(self.controller.file_manager.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute(final_query, final_params)
-                return [dict(row) for row in cursor.fetchall()]
+            files, self.next_page = self.controller.file_manager.search_files(
+                portfolio=(
+                    Portfolio(self.filter_state.portfolio)
+                    if self.filter_state.portfolio != "All"
+                    else None
+                ),
+                funder=(
+                    self.filter_state.funder
+                    if self.filter_state.funder != "All"
+                    else None
+                ),
+                file_type=self.filter_state.file_type,
+                date_range=self.filter_state.date_range,
+                search_text=self.filter_state.search_text,
+                after=self.next_page,
+                limit=PAGE_SIZE,
+            )
+            return files
 
         except Exception as e:
+            self.next_page = None
             self.show_error(f"Error getting files: {str(e)}")
             return []
 
@@ -395,20 +351,25 @@ class FileExplorer(BasePage):
         # Clear existing items
         for item in self.file_list.get_children():
             self.file_list.delete(item)
+        self.checked_items.clear()
+        self.next_page = None
 
-        # Get filtered files
+        self.load_more_files()
+
+    def load_more_files(self):
+        """Add the next page of files to the list"""
         files = self.get_filtered_files()
 
-        # Add files to list
+        # Add files to list; whether each file still exists is checked once
+        # it scrolls into view
         for file in files:
             try:
                 date = datetime.fromisoformat(file["upload_date"]).strftime("%Y-%m-%d")
-            except ValueError:
+            except (TypeError, ValueError):
                 date = "Unknown"
 
-            # If file path exists and is valid
             file_path = file.get("file_path")
-            if file_path and Path(file_path).exists():
+            if file_path:
                 self.file_list.insert(
                     "",
                     "end",
@@ -423,6 +384,29 @@ class FileExplorer(BasePage):
                     tags=(str(file_path),),
                 )
 
+        shown = len(self.file_list.get_children())
+        self.count_label.configure(
+            text=f"{shown:,} files" + (" (more available)" if self.next_page else "")
+        )
+        self.load_more_button.configure(
+            state="normal" if self.next_page else "disabled"
+        )
+
+    def check_visible_files(self, first: float, last: float):
+        """Mark files in the visible part of the list that no longer exist"""
+        items = self.file_list.get_children()
+        start = int(first * len(items))
+        stop = min(int(last * len(items)) + 1, len(items))
+        for item in items[start:stop]:
+            if item in self.checked_items:
+                continue
+            self.checked_items.add(item)
+
+            file_path = self.file_list.item(item)["tags"][0]
+            if not Path(file_path).exists():
+                self.file_list.item(item, tags=(file_path, "missing"))
+                self.file_list.set(item, "Status", "Missing")
+
     def sort_column(self, column):
         """Sort treeview by column"""
         items = [
@@ -443,6 +427,7 @@ class FileExplorer(BasePage):
         items.sort(reverse=reverse)
         for idx, (_, item) in enumerate(items):
             self.file_list.move(item, "", idx)
+        self.check_visible_files(*self.file_list.yview())
 
         # Update column headers to show sort direction
         for col in self.file_list["columns"]:
@@ -464,6 +449,10 @@ class FileExplorer(BasePage):
         if not file_path:
             self.clear_preview()
             return
+        if not Path(file_path).exists():
+            self.clear_preview()
+            self.show_error(f"File not found:\n{file_path}")
+            return
 
         self.current_file = Path(file_path)
         self.file_label.configure(text=self.current_file.name)
@@ -472,16 +461,18 @@ class FileExplorer(BasePage):
         self.preview_file(self.current_file)
 
     def preview_file(self, file_path: Path):
-        """Preview CSV or Excel file content"""
+        """Preview CSV, Excel or saved pivot table content"""
         try:
             # Clear existing preview
             for item in self.preview_table.get_children():
                 self.preview_table.delete(item)
             self.preview_table["columns"] = ()
 
+            import pandas as pd
+
             # Read file based on type
-            if file_path.suffix.lower() == ".csv":
-                df = pd.read_csv(file_path)
+            if file_path.suffix.lower() in PIVOT_FORMATS.values():
+                df = load_pivot_table(file_path)
             elif file_path.suffix.lower() == ".xlsx":
                 df = pd.read_excel(file_path)
             else:
@@ -527,22 +518,39 @@ class FileExplorer(BasePage):
         if not hasattr(self, "current_file"):
             return
 
-        # Get destination path
+        # Get destination path. Pivot tables saved in a columnar format are
+        # exported as CSV unless another format is chosen
+        suffix = self.current_file.suffix.lower()
+        columnar = suffix != ".csv" and suffix in PIVOT_FORMATS.values()
         file_types = [("All Files", "*.*")]
-        if self.current_file.suffix.lower() == ".csv":
+        if suffix == ".csv":
             file_types = [("CSV Files", "*.csv")] + file_types
-        elif self.current_file.suffix.lower() == ".xlsx":
+        elif suffix == ".xlsx":
             file_types = [("Excel Files", "*.xlsx")] + file_types
+        elif columnar:
+            file_types = [
+                ("CSV Files", "*.csv"),
+                (f"{suffix[1:].title()} Files", f"*{suffix}"),
+            ] + file_types
 
         dest_path = ctk.filedialog.asksaveasfilename(
-            defaultextension=self.current_file.suffix,
+            defaultextension=".csv" if columnar else suffix,
             filetypes=file_types,
-            initialfile=self.current_file.name,
+            initialfile=(
+                self.current_file.with_suffix(".csv").name
+                if columnar
+                else self.current_file.name
+            ),
         )
 
         if dest_path:
             try:
-                shutil.copy2(self.current_file, dest_path)
+                if columnar and Path(dest_path).suffix.lower() == ".csv":
+                    load_pivot_table(self.current_file).to_csv(dest_path, index=False)
+                else:
+                    # Contents only: stored files are read-only, the export
+                    # should not be
+                    shutil.copyfile(self.current_file, dest_path)
                 self.show_info(f"File exported successfully to:\n{dest_path}")
             except Exception as e:
                 self.show_error(f"Error exporting file: {str(e)}")
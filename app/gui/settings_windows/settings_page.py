@@ -1,7 +1,10 @@
 # app/gui/settings_windows/settings_page.py
 
+from datetime import datetime
+from pathlib import Path
 from ..base_window import BasePage
 from managers.portfolio import Portfolio
+from managers.file_manager import HAS_PYARROW, PIVOT_FORMATS
 import customtkinter as ctk
 
 
@@ -117,8 +120,117 @@ class SettingsPage(BasePage):
             panel, text="Clear Recent Files", command=self.clear_recent_files
         ).grid(row=3, column=0, padx=20, pady=(0, 20), sticky="w")
 
+        ctk.CTkLabel(panel, text="Backups", font=("Helvetica", 16, "bold")).grid(
+            row=4, column=0, padx=20, pady=(20, 10), sticky="w"
+        )
+
+        self.backup_report = ctk.CTkLabel(panel, text="", justify="left")
+        self.backup_report.grid(row=5, column=0, padx=20, pady=(0, 10), sticky="w")
+        self.refresh_backup_report()
+
+        # Retention policy settings
+        retention = ctk.CTkFrame(panel, fg_color="transparent")
+        retention.grid(row=6, column=0, padx=20, pady=(0, 10), sticky="w")
+
+        preferences = self.controller.file_manager.preferences
+        self.retention_entries = {}
+        for i, (field, text) in enumerate(
+            [
+                ("backup_keep_weeks", "Weekly backups to keep"),
+                ("backup_keep_months", "Monthly backups to keep"),
+                ("backup_compress_after_weeks", "Compress after (weeks)"),
+            ]
+        ):
+            ctk.CTkLabel(retention, text=text).grid(
+                row=i, column=0, padx=(0, 10), pady=2, sticky="w"
+            )
+            entry = ctk.CTkEntry(retention, width=60)
+            entry.insert(0, str(getattr(preferences, field)))
+            entry.grid(row=i, column=1, pady=2, sticky="w")
+            self.retention_entries[field] = entry
+
+        self.defer_backup = ctk.CTkCheckBox(
+            panel, text="Back up workbooks in the background"
+        )
+        if preferences.defer_workbook_backup:
+            self.defer_backup.select()
+        self.defer_backup.grid(row=7, column=0, padx=20, pady=(0, 10), sticky="w")
+
+        ctk.CTkButton(
+            panel, text="Save Backup Settings", command=self.save_backup_settings
+        ).grid(row=8, column=0, padx=20, pady=(0, 20), sticky="w")
+
+        ctk.CTkLabel(panel, text="Restore Backup", font=("Helvetica", 16, "bold")).grid(
+            row=9, column=0, padx=20, pady=(20, 10), sticky="w"
+        )
+
+        # Compressed backups have no file next to the workbook any more, so
+        # this is the only way to get them back
+        restore = ctk.CTkFrame(panel, fg_color="transparent")
+        restore.grid(row=10, column=0, padx=20, pady=(0, 20), sticky="w")
+
+        self.restore_choices = {}
+        self.restore_var = ctk.StringVar()
+        self.restore_menu = ctk.CTkOptionMenu(
+            restore, values=[""], variable=self.restore_var, width=300
+        )
+        self.restore_menu.grid(row=0, column=0, padx=(0, 10), sticky="w")
+        ctk.CTkButton(restore, text="Restore...", command=self.restore_backup).grid(
+            row=0, column=1, sticky="w"
+        )
+        self.refresh_restore_choices()
+
+        ctk.CTkLabel(
+            panel, text="Pivot Table Format", font=("Helvetica", 16, "bold")
+        ).grid(row=11, column=0, padx=20, pady=(20, 10), sticky="w")
+
+        # Parquet and Feather need pyarrow, from the "columnar" extra
+        formats = list(PIVOT_FORMATS) if HAS_PYARROW else ["csv"]
+        self.pivot_format_var = ctk.StringVar(
+            value=self.controller.file_manager.pivot_format
+        )
+        ctk.CTkOptionMenu(
+            panel,
+            values=formats,
+            variable=self.pivot_format_var,
+            command=self.apply_pivot_format,
+        ).grid(row=12, column=0, padx=20, pady=(0, 20), sticky="w")
+
         return panel
 
+    def refresh_backup_report(self):
+        report = self.controller.file_manager.backup_store.space_report()
+
+        def megabytes(size: int) -> str:
+            return f"{size / (1024 * 1024):.1f} MB"
+
+        self.backup_report.configure(
+            text=(
+                f"{report['files']} stored files using "
+                f"{megabytes(report['stored_bytes'])} "
+                f"(saved {megabytes(report['saved_bytes'])} of "
+                f"{megabytes(report['logical_bytes'])})"
+            )
+        )
+
+    def refresh_restore_choices(self):
+        """List every portfolio workbook's backups, newest first."""
+        file_manager = self.controller.file_manager
+        self.restore_choices = {}
+        for portfolio in Portfolio:
+            workbook_path = file_manager.get_portfolio_workbook_path(portfolio)
+            if workbook_path is None:
+                continue
+            for entry in file_manager.backup_store.list_backups(workbook_path.stem):
+                label = f"{portfolio.value} {entry['backup_date']}"
+                if entry["compressed"]:
+                    label += " (compressed)"
+                self.restore_choices[label] = (workbook_path, entry["backup_date"])
+
+        labels = list(self.restore_choices) or ["No backups"]
+        self.restore_menu.configure(values=labels)
+        self.restore_var.set(labels[0])
+
     def create_auth_panel(self):
         panel = ctk.CTkFrame(self.content)
         panel.grid_columnconfigure(0, weight=1)
@@ -181,6 +293,55 @@ class SettingsPage(BasePage):
         self.controller.file_manager.clear_recent_files()
         self.show_temp_message("storage", "Recent files cleared!")
 
+    def save_backup_settings(self):
+        preferences = self.controller.file_manager.preferences
+        try:
+            values = {
+                field: int(entry.get())
+                for field, entry in self.retention_entries.items()
+            }
+        except ValueError:
+            self.show_temp_message("storage", "Backup settings must be whole numbers")
+            return
+
+        for field, value in values.items():
+            setattr(preferences, field, max(value, 0))
+        preferences.defer_workbook_backup = bool(self.defer_backup.get())
+        self.controller.file_manager.save_preferences()
+        self.show_temp_message("storage", "Backup settings saved!")
+
+    def restore_backup(self):
+        choice = self.restore_choices.get(self.restore_var.get())
+        if choice is None:
+            return
+
+        # Restore to a new file rather than over the live workbook
+        workbook_path, backup_date = choice
+        dest_path = ctk.filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel Files", "*.xlsx")],
+            initialfile=f"{workbook_path.stem}_restored_{backup_date}.xlsx",
+        )
+        if not dest_path:
+            return
+
+        try:
+            self.controller.file_manager.backup_store.restore(
+                workbook_path.stem,
+                datetime.strptime(backup_date, "%Y-%m-%d"),
+                Path(dest_path),
+            )
+            self.show_temp_message("storage", f"Backup restored to {dest_path}")
+        except Exception as e:
+            self.show_temp_message("storage", f"Error restoring backup: {e}")
+
+    def apply_pivot_format(self, file_format: str):
+        self.controller.file_manager.preferences.pivot_format = file_format
+        self.controller.file_manager.save_preferences()
+        self.show_temp_message(
+            "storage", f"New pivot tables will be saved as {file_format}"
+        )
+
     def save_auth_token(self):
         token = self.auth_token.get()
         self.controller.file_manager.preferences.auth_token = token
@@ -189,5 +350,5 @@ class SettingsPage(BasePage):
 
     def show_temp_message(self, panel_name: str, message: str):
         label = ctk.CTkLabel(self.panels[panel_name], text=message, text_color="green")
-        label.grid(row=10, column=0, padx=20, pady=(0, 20))
+        label.grid(row=13, column=0, padx=20, pady=(0, 20))
         self.after(2000, label.destroy)
@@ -0,0 +1,480 @@
+# app/managers/backup_store.py
+
+import os
+import gzip
+import shutil
+import hashlib
+import uuid
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+from utils.db_pool import close_connections, get_connection
+
+# ioctl request that asks the filesystem (btrfs, XFS, APFS-on-Linux...) to
+# share the source's extents with the destination instead of copying them
+FICLONE = 0x40049409
+
+# Mode given to stored objects, so no hardlinked name can change them
+READ_ONLY = 0o444
+
+
+def clone_file(src: Path, dest: Path) -> str:
+    """
+    Copy a file as cheaply as the filesystem allows.
+
+    Tries a copy-on-write reflink first and falls back to a regular copy.
+
+    Returns:
+        str: "reflink" or "copy", depending on how the file was copied
+    """
+    try:
+        import fcntl
+
+        with open(src, "rb") as src_file, open(dest, "wb") as dest_file:
+            fcntl.ioctl(dest_file.fileno(), FICLONE, src_file.fileno())
+        shutil.copystat(src, dest)
+        return "reflink"
+    except (ImportError, OSError):
+        shutil.copy2(src, dest)
+        return "copy"
+
+
+def link_or_clone(src: Path, dest: Path) -> str:
+    """
+    Make dest share src's contents, hardlinking where possible.
+
+    Only use this for files that are never modified in place, since every
+    name of a hardlinked file sees the same data.
+
+    Returns:
+        str: "hardlink", "reflink" or "copy"
+    """
+    try:
+        os.link(src, dest)
+        return "hardlink"
+    except OSError:
+        return clone_file(src, dest)
+
+
+def remove_file(path: Path) -> None:
+    """
+    Delete a file if it exists, even when it is read-only.
+
+    Windows refuses to delete read-only files, so the file is made writable
+    and the delete retried. Where hardlinks share the file, that also makes
+    the other names writable until the store protects them again.
+    """
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        os.chmod(path, READ_ONLY | 0o200)
+        os.unlink(path)
+
+
+def replace_file(tmp: Path, dest: Path) -> None:
+    """
+    Move a fully written tmp file over dest in one step.
+
+    tmp must be in dest's directory. Its data is flushed to disk before the
+    rename, so after a crash dest holds either the old or the new contents,
+    never a partial write.
+    """
+    with open(tmp, "rb+") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp, dest)
+
+    # Persist the rename itself; directories cannot be opened on Windows
+    try:
+        dir_fd = os.open(Path(dest).parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def hash_file(path: Path) -> str:
+    """Return the hex SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class RetentionPolicy:
+    """Which workbook backups to keep, and when to compress them."""
+
+    keep_weeks: int = 8  # Most recent weekly backups kept
+    keep_months: int = 12  # Months for which the first backup is kept
+    compress_after_weeks: int = 4  # Kept backups older than this are gzipped
+
+    @classmethod
+    def from_preferences(cls, preferences) -> "RetentionPolicy":
+        return cls(
+            keep_weeks=preferences.backup_keep_weeks,
+            keep_months=preferences.backup_keep_months,
+            compress_after_weeks=preferences.backup_compress_after_weeks,
+        )
+
+
+class BackupStore:
+    """
+    Content-addressed store behind workbook backups and uploaded files.
+
+    Every stored file's contents are kept once under objects/, named by
+    SHA-256. The visible copies (uploads, and backups next to the portfolio
+    workbook) are hardlinks to those objects where the filesystem allows,
+    so saving the same contents twice costs no extra space. Objects are
+    read-only, so a visible hardlink cannot be edited in place and change
+    every file sharing its contents. Old backups are compressed and pruned
+    according to a RetentionPolicy; their rows stay in the catalog so they
+    can still be restored.
+    """
+
+    def __init__(
+        self, root: Path, db_path: Path, policy: Optional[RetentionPolicy] = None
+    ):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.policy = policy or RetentionPolicy()
+        self.logger = logging.getLogger(__name__)
+
+        # Background backups share the store with the caller's thread
+        self._lock = threading.RLock()
+        self._pending: List[threading.Thread] = []
+
+    def _object_path(self, content_hash: str) -> Path:
+        return self.objects_dir / content_hash
+
+    def _cold_path(self, content_hash: str) -> Path:
+        return self.objects_dir / f"{content_hash}.gz"
+
+    def _ensure_object(self, src: Path, content_hash: str) -> Path:
+        """Return the uncompressed object for content_hash, creating it from src."""
+        obj = self._object_path(content_hash)
+        if not obj.exists():
+            tmp = obj.with_name(f"{obj.name}.{os.getpid()}.tmp")
+            clone_file(src, tmp)
+            os.chmod(tmp, READ_ONLY)
+            os.replace(tmp, obj)
+        else:
+            # Objects stored before they were protected, or made writable
+            # by remove_file() on Windows
+            os.chmod(obj, READ_ONLY)
+        return obj
+
+    def _record(
+        self,
+        path: Path,
+        content_hash: str,
+        size: int,
+        kind: str,
+        backup_key: Optional[str] = None,
+        backup_date: Optional[datetime] = None,
+    ) -> None:
+        with get_connection(self.db_path) as conn:
+            conn.execute("DELETE FROM stored_files WHERE path = ?", (str(path),))
+            conn.execute(
+                """
+                INSERT INTO stored_files (
+                    path, content_hash, size, kind, backup_key, backup_date,
+                    compressed, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, 0, ?)
+            """,
+                (
+                    str(path),
+                    content_hash,
+                    size,
+                    kind,
+                    backup_key,
+                    backup_date.strftime("%Y-%m-%d") if backup_date else None,
+                    datetime.now().isoformat(),
+                ),
+            )
+
+    def store_file(self, src: Path, dest: Path) -> str:
+        """
+        Save a copy of src at dest, sharing storage with identical files.
+
+        Args:
+            src: File to copy
+            dest: Where the copy should appear
+
+        Returns:
+            str: How dest was created ("hardlink", "reflink" or "copy")
+        """
+        content_hash = hash_file(src)
+        with self._lock:
+            remove_file(dest)
+            obj = self._ensure_object(src, content_hash)
+            method = link_or_clone(obj, dest)
+            self._record(dest, content_hash, obj.stat().st_size, "upload")
+        return method
+
+    def backup(
+        self, backup_key: str, src: Path, backup_date: datetime, dest: Path
+    ) -> Path:
+        """
+        Snapshot src as the backup for backup_date and apply retention.
+
+        Args:
+            backup_key: Name grouping one workbook's backups
+            src: The live file to back up
+            backup_date: Date the backup belongs to
+            dest: Visible path of the backup
+
+        Returns:
+            Path: dest
+        """
+        content_hash = hash_file(src)
+        with self._lock:
+            # Replace any earlier backup for the same date
+            remove_file(dest)
+            obj = self._ensure_object(src, content_hash)
+            method = link_or_clone(obj, dest)
+            self._record(
+                dest,
+                content_hash,
+                obj.stat().st_size,
+                "backup",
+                backup_key,
+                backup_date,
+            )
+
+            self.logger.info(f"Backed up {src.name} to {dest.name} ({method})")
+            self.prune(backup_key)
+        return dest
+
+    def backup_in_background(
+        self, backup_key: str, src: Path, backup_date: datetime, dest: Path
+    ) -> Path:
+        """
+        Like backup(), but only a snapshot of src is taken before returning.
+
+        The snapshot is a hardlink to src's current contents, which stays
+        valid as long as src is only ever rewritten by replace_file(): the
+        rename gives src a new inode and leaves the snapshot untouched. The
+        hashing and copying then happen on a worker thread. The thread is not
+        a daemon, so the interpreter waits for it before exiting.
+
+        Returns:
+            Path: dest, which appears once the worker has finished
+        """
+        snapshots_dir = self.root / "snapshots"
+        snapshots_dir.mkdir(exist_ok=True)
+        snapshot = snapshots_dir / f"{uuid.uuid4().hex[:8]}-{src.name}"
+        link_or_clone(src, snapshot)
+
+        def run():
+            try:
+                self.backup(backup_key, snapshot, backup_date, dest)
+            except Exception as e:
+                self.logger.error(f"Background backup of {src.name} failed: {e}")
+            finally:
+                snapshot.unlink(missing_ok=True)
+                close_connections()
+
+        thread = threading.Thread(target=run, name=f"backup-{backup_key}", daemon=False)
+        with self._lock:
+            self._pending = [t for t in self._pending if t.is_alive()]
+            self._pending.append(thread)
+        thread.start()
+        return dest
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until background backups started so far have finished."""
+        with self._lock:
+            pending = list(self._pending)
+        for thread in pending:
+            thread.join(timeout)
+
+    def list_backups(self, backup_key: str) -> List[Dict]:
+        """Return a workbook's backups, newest first."""
+        with get_connection(self.db_path) as conn:
+            cursor = conn.execute(
+                """
+                SELECT path, content_hash, size, backup_date, compressed
+                FROM stored_files
+                WHERE kind = 'backup' AND backup_key = ?
+                ORDER BY backup_date DESC
+            """,
+                (backup_key,),
+            )
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def restore(self, backup_key: str, backup_date: datetime, dest: Path) -> Path:
+        """
+        Write the backup taken for backup_date to dest.
+
+        Raises:
+            FileNotFoundError: If no backup exists for that date
+        """
+        wanted = backup_date.strftime("%Y-%m-%d")
+        for entry in self.list_backups(backup_key):
+            if entry["backup_date"] != wanted:
+                continue
+
+            tmp = Path(dest).with_name(f"{Path(dest).name}.restore.tmp")
+            if entry["compressed"]:
+                with gzip.open(self._cold_path(entry["content_hash"]), "rb") as src:
+                    with open(tmp, "wb") as out:
+                        shutil.copyfileobj(src, out)
+            else:
+                # Restored files may be edited, so never hardlink them
+                obj = self._object_path(entry["content_hash"])
+                clone_file(obj if obj.exists() else Path(entry["path"]), tmp)
+                # The clone keeps the object's read-only mode
+                os.chmod(tmp, os.stat(tmp).st_mode | 0o200)
+            os.replace(tmp, dest)
+            return Path(dest)
+
+        raise FileNotFoundError(f"No {backup_key} backup for {wanted}")
+
+    def _retained(self, backups: List[Dict]) -> set:
+        """Pick the backup dates kept by the retention policy."""
+        dates = sorted({b["backup_date"] for b in backups}, reverse=True)
+        # The newest backup is always kept
+        keep = set(dates[: max(self.policy.keep_weeks, 1)])
+
+        # First backup of each of the most recent months
+        first_of_month = {}
+        for date in dates:
+            first_of_month[date[:7]] = date  # dates are newest first
+        for month in sorted(first_of_month, reverse=True)[: self.policy.keep_months]:
+            keep.add(first_of_month[month])
+
+        return keep
+
+    def prune(self, backup_key: str) -> None:
+        """Apply the retention policy to a workbook's backups."""
+        with self._lock:
+            backups = self.list_backups(backup_key)
+            if not backups:
+                return
+
+            keep = self._retained(backups)
+            newest = datetime.strptime(backups[0]["backup_date"], "%Y-%m-%d")
+            compress_before = (
+                newest - timedelta(weeks=self.policy.compress_after_weeks)
+            ).strftime("%Y-%m-%d")
+
+            with get_connection(self.db_path) as conn:
+                for entry in backups:
+                    path = Path(entry["path"])
+                    if entry["backup_date"] not in keep:
+                        remove_file(path)
+                        conn.execute(
+                            "DELETE FROM stored_files WHERE path = ?", (entry["path"],)
+                        )
+                        self.logger.info(f"Pruned backup {path.name}")
+                    elif (
+                        entry["backup_date"] < compress_before
+                        and not entry["compressed"]
+                    ):
+                        self._compress(entry["content_hash"], path)
+                        remove_file(path)
+                        conn.execute(
+                            "UPDATE stored_files SET compressed = 1 WHERE path = ?",
+                            (entry["path"],),
+                        )
+                        self.logger.info(f"Compressed backup {path.name}")
+
+            self.collect_garbage()
+
+    def _compress(self, content_hash: str, fallback: Optional[Path] = None) -> None:
+        """Write the gzipped object, reading fallback if the object is gone."""
+        cold = self._cold_path(content_hash)
+        if cold.exists():
+            return
+
+        obj = self._object_path(content_hash)
+        tmp = cold.with_name(f"{cold.name}.{os.getpid()}.tmp")
+        with open(obj if obj.exists() else fallback, "rb") as src:
+            with gzip.open(tmp, "wb") as out:
+                shutil.copyfileobj(src, out)
+        os.replace(tmp, cold)
+
+    def collect_garbage(self) -> None:
+        """Delete objects that no stored file needs any more."""
+        with self._lock:
+            with get_connection(self.db_path) as conn:
+                hot_hashes = {
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT content_hash FROM stored_files WHERE compressed = 0"
+                    )
+                }
+                cold_hashes = {
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT content_hash FROM stored_files WHERE compressed = 1"
+                    )
+                }
+
+            for obj in self.objects_dir.iterdir():
+                if obj.name.endswith(".tmp"):
+                    continue
+                if obj.suffix == ".gz":
+                    if obj.stem not in cold_hashes:
+                        obj.unlink()
+                    continue
+
+                # Still referenced while a visible hardlink or hot row exists;
+                # files stored by plain copy do not need the object at all
+                if obj.stat().st_nlink > 1 and obj.name in hot_hashes:
+                    os.chmod(obj, READ_ONLY)
+                    continue
+                if obj.name in cold_hashes:
+                    self._compress(obj.name)
+                remove_file(obj)
+
+    def space_report(self) -> Dict[str, int]:
+        """
+        Compare the space stored files would take as full copies with the
+        space actually used.
+
+        Reflinked copies are counted as used space, since sharing extents is
+        not visible from user space.
+        """
+        with get_connection(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT path, size, compressed FROM stored_files"
+            ).fetchall()
+
+        logical = 0
+        inodes = {}
+        for path, size, compressed in rows:
+            if compressed:
+                logical += size
+                continue
+            try:
+                stat = Path(path).stat()
+            except FileNotFoundError:
+                continue
+            logical += stat.st_size
+            inodes[(stat.st_dev, stat.st_ino)] = stat.st_size
+
+        for obj in self.objects_dir.iterdir():
+            stat = obj.stat()
+            inodes[(stat.st_dev, stat.st_ino)] = stat.st_size
+
+        stored = sum(inodes.values())
+        return {
+            "files": len(rows),
+            "logical_bytes": logical,
+            "stored_bytes": stored,
+            "saved_bytes": logical - stored,
+        }
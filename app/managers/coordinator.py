@@ -1,36 +1,38 @@
 # app/managers/coordinator.py
 
 from pathlib import Path
-from typing import Optional, Tuple, Dict
+from typing import Callable, Optional, Tuple, Dict, List, Union
 from enum import Enum
 from datetime import datetime
 from utils.date_utils import (
     get_most_recent_friday,
 )
+import importlib
 import logging
-import pandas as pd
-
-from core.ml.funder_classifier import FunderClassifier
-from core.data_processing.parsers.base_parser import BaseParser
-from core.data_processing.parsers.kings_boom_parser import KingsBoomParser
-from core.data_processing.parsers.efin_parser import EfinParser
-from core.data_processing.parsers.bhb_parser import BHBParser
-from core.data_processing.parsers.acs_vesper_parser import AcsVesperParser
-from core.data_processing.parsers.clear_view_parser import ClearViewParser
-from core.data_processing.parsers.big_parser import BIGParser
+import time
+
+from core.ml.funder_classifier import FunderClassifier, ClassificationResult
+from core.data_processing.parsers.parse_pool import parse_files, ParseResult
+from core.data_processing.parse_cache import ParseCache
+from core.data_processing.source_file import SourceFile
 from .portfolio import Portfolio, PortfolioStructure
-from core.data_processing.excel.workbook_manager import WorkbookManager
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Type
 
 if TYPE_CHECKING:
+    import pandas as pd
+    from core.data_processing.excel.workbook_manager import WorkbookManager
+    from core.data_processing.parsers.base_parser import BaseParser
     from .file_manager import PortfolioFileManager
 
+PARSERS = "core.data_processing.parsers"
+
 
 class ProcessingStatus(Enum):
     PENDING = "pending"
     CLASSIFIED = "classified"
     PARSED = "parsed"
+    WORKBOOK_UPDATED = "workbook_updated"
     COMPLETED = "completed"
     FAILED = "failed"
 
@@ -50,16 +52,26 @@ class PortfolioCoordinator:
         # Add dictionary to track accumulated files for ClearView
         self._accumulated_files = {}
 
-        # Initialize parser mapping
+        # Worker processes used when parsing a batch (None = one per CPU)
+        self.max_parse_workers: Optional[int] = None
+
+        # Parser results keyed by file contents, so re-uploads skip parsing
+        self.parse_cache = ParseCache(self.file_manager.base_dir / "parse_cache")
+
+        # Seconds spent in each stage of the last process_weekly_batch call
+        self.last_batch_timings: Dict[str, float] = {}
+
+        # Initialize parser mapping. Parsers are named as "module:Class" and
+        # imported on first use, since they pull in pandas and openpyxl.
         self.parser_mapping = {
-            "ACS": AcsVesperParser,
-            "BHB": BHBParser,
-            "Boom": KingsBoomParser,
-            "ClearView": ClearViewParser,
-            "EFIN": EfinParser,
-            "Kings": KingsBoomParser,
-            "Vesper": AcsVesperParser,
-            "BIG": BIGParser,
+            "ACS": f"{PARSERS}.acs_vesper_parser:AcsVesperParser",
+            "BHB": f"{PARSERS}.bhb_parser:BHBParser",
+            "Boom": f"{PARSERS}.kings_boom_parser:KingsBoomParser",
+            "ClearView": f"{PARSERS}.clear_view_parser:ClearViewParser",
+            "EFIN": f"{PARSERS}.efin_parser:EfinParser",
+            "Kings": f"{PARSERS}.kings_boom_parser:KingsBoomParser",
+            "Vesper": f"{PARSERS}.acs_vesper_parser:AcsVesperParser",
+            "BIG": f"{PARSERS}.big_parser:BIGParser",
         }
 
     @property
@@ -70,15 +82,24 @@ class PortfolioCoordinator:
     def current_processing_date(self) -> Optional[datetime]:
         return self._current_processing_date
 
+    def get_parser_class(self, funder: str) -> Optional[Type["BaseParser"]]:
+        """Import and return the parser class registered for a funder."""
+        target = self.parser_mapping.get(funder)
+        if target is None or isinstance(target, type):
+            return target
+
+        module_name, class_name = target.split(":")
+        return getattr(importlib.import_module(module_name), class_name)
+
     def _get_parser_for_funder(
-        self, funder: str, file_path: Path
-    ) -> Optional[BaseParser]:
+        self, funder: str, file_path: Union[Path, SourceFile]
+    ) -> Optional["BaseParser"]:
         """
         Get the appropriate parser instance for a funder.
 
         Args:
             funder: Name of the funder to get parser for
-            file_path: Path to the file to be parsed
+            file_path: Path to the file to be parsed, or its already loaded SourceFile
 
         Returns:
             Optional[BaseParser]: Parser instance if available, None if no parser found
@@ -89,7 +110,7 @@ class PortfolioCoordinator:
                 raise ValueError("Processing context not set - portfolio is required")
 
             # Check for valid parser class
-            parser_class = self.parser_mapping.get(funder)
+            parser_class = self.get_parser_class(funder)
             if not parser_class:
                 self.logger.error(f"No parser mapping found for funder: {funder}")
                 return None
@@ -174,10 +195,16 @@ class PortfolioCoordinator:
         # For other funders, process immediately
         return True
 
-    def get_processing_status(self, file_id: int) -> ProcessingStatus:
-        """Get current processing status of a file"""
-        # Implement status tracking logic
-        pass
+    def get_processing_status(self, file_id: int) -> Optional[ProcessingStatus]:
+        """Get current processing status of a file, or None if it is unknown"""
+        status = self.file_manager.get_file_status(file_id)
+        if status is None:
+            return None
+        try:
+            return ProcessingStatus(status)
+        except ValueError:
+            self.logger.warning(f"File {file_id} has unknown status {status!r}")
+            return None
 
     def set_processing_context(
         self, portfolio: Portfolio, processing_date: Optional[datetime] = None
@@ -208,10 +235,396 @@ class PortfolioCoordinator:
         portfolio: Optional[Portfolio] = None,
         funder: Optional[str] = None,
         date_range: Optional[Tuple[datetime, datetime]] = None,
-    ) -> pd.DataFrame:
-        """Get processing history with optional filters"""
-        # Implement history tracking logic
-        pass
+    ) -> "pd.DataFrame":
+        """
+        Get weekly processing history with optional filters.
+
+        Args:
+            portfolio: Optional portfolio filter
+            funder: Optional funder filter
+            date_range: Optional (start, end) processing dates, inclusive
+
+        Returns:
+            DataFrame with one row per portfolio, funder and week: portfolio,
+            funder, processing_date, gross_total, net_total, fee_total and
+            file_count, ordered by portfolio, funder and processing_date
+        """
+        start_date, end_date = date_range or (None, None)
+        return self.file_manager.get_weekly_totals(
+            portfolio, funder, start_date, end_date
+        )
+
+    def _resolve_funder(
+        self,
+        file_path: Union[Path, SourceFile],
+        portfolio: Portfolio,
+        manual_funder: Optional[str] = None,
+    ) -> Tuple[Optional[str], Optional[ClassificationResult], Optional[str]]:
+        """
+        Determine the funder for a file and check it belongs to the portfolio.
+
+        Returns:
+            Tuple containing:
+            - Optional[str]: Funder name if it could be determined
+            - Optional[ClassificationResult]: Classifier output, None for manual funders
+            - Optional[str]: Error message if unsuccessful
+        """
+        if manual_funder:
+            funder = manual_funder
+            classification_result = None
+        else:
+            classification_result = self.classifier.classify_funder(file_path)
+
+            # If classification failed, show debug information
+            if not classification_result.funder:
+                self.classifier.debug_classification(file_path)
+                return (
+                    None,
+                    classification_result,
+                    f"Unable to identify funder. Reason: {classification_result.reason}",
+                )
+
+            funder = classification_result.funder
+
+        # Validate funder belongs to portfolio
+        if not PortfolioStructure.validate_portfolio_funder(portfolio, funder):
+            return (
+                funder,
+                classification_result,
+                f"Funder {funder} is not associated with portfolio {portfolio.value}",
+            )
+
+        return funder, classification_result, None
+
+    def _workbook_manager(self) -> "WorkbookManager":
+        """Create a WorkbookManager, importing openpyxl on first use."""
+        from core.data_processing.excel.workbook_manager import WorkbookManager
+
+        return WorkbookManager(self.file_manager)
+
+    def _parse_with_cache(self, parser: "BaseParser") -> ParseResult:
+        """Run a parser, reusing the cached result if its files were seen before."""
+        cache_key = ParseCache.make_key(type(parser), parser.source_files)
+        cached = self.parse_cache.get(cache_key)
+        if cached is not None:
+            return (*cached, None)
+
+        pivot_table, total_gross, total_net, total_fee, error = parser.process()
+        if not error:
+            self.parse_cache.put(
+                cache_key, (pivot_table, total_gross, total_net, total_fee)
+            )
+        return pivot_table, total_gross, total_net, total_fee, error
+
+    def _fold_clearview_week(
+        self,
+        new_sources: Dict[Path, SourceFile],
+        weekly_files: List[Path],
+        portfolio: Portfolio,
+        processing_date: datetime,
+    ) -> ParseResult:
+        """
+        Bring the week's running ClearView totals up to date and pivot them.
+
+        Only files not yet folded into the totals are parsed, which in the
+        normal day-by-day flow is just the newly uploaded one. Files uploaded
+        before running totals existed are picked up the same way.
+
+        Args:
+            new_sources: The new uploads, keyed by where each was stored and
+                already read into memory
+            weekly_files: Every unprocessed ClearView file for the week
+            portfolio: Portfolio being processed
+            processing_date: The Friday date of the week
+
+        Returns:
+            The (pivot, gross, net, fee, error) tuple for the whole week
+        """
+        clear_view_parser = self.get_parser_class("ClearView")
+        folded = self.file_manager.get_clearview_folded_files(
+            portfolio, processing_date
+        )
+        folded_hashes = set(folded.values())
+
+        for path in weekly_files:
+            if str(path) in folded:
+                continue
+
+            day_source = new_sources.get(path) or SourceFile(path)
+            daily_totals = None
+            if day_source.sha256 not in folded_hashes:
+                daily_totals, error = clear_view_parser(day_source).parse_daily_totals()
+                if error:
+                    return None, 0, 0, 0, error
+
+            self.file_manager.fold_clearview_totals(
+                portfolio, processing_date, path, day_source.sha256, daily_totals
+            )
+            folded_hashes.add(day_source.sha256)
+
+        weekly_totals = self.file_manager.get_clearview_running_totals(
+            portfolio, processing_date
+        )
+        source = next(iter(new_sources.values()))
+        return clear_view_parser(source).process_weekly_totals(weekly_totals)
+
+    def _build_result(
+        self,
+        funder: str,
+        totals: Dict[str, float],
+        unmatched: List[Dict],
+        processing_date: datetime,
+        files_processed: int,
+        classification_results: List[ClassificationResult],
+    ) -> Dict:
+        """Create the result dictionary reported back for a processed funder."""
+        result = {
+            "funder": funder,
+            "totals": totals,
+            "unmatched_ids": unmatched,
+            "processing_date": processing_date.strftime("%B %d, %Y"),
+            "files_processed": files_processed,
+        }
+
+        # Add classification details if available
+        if classification_results:
+            result.update(
+                {
+                    "classification_confidence": min(
+                        r.confidence for r in classification_results
+                    ),
+                    "new_merchant_ids": sum(
+                        len(r.new_ids) for r in classification_results
+                    ),
+                    "matched_merchant_ids": sum(
+                        len(r.matched_ids) for r in classification_results
+                    ),
+                }
+            )
+
+        return result
+
+    def process_weekly_batch(
+        self,
+        file_paths: List[Path],
+        portfolio: Portfolio,
+        processing_date: datetime = None,
+        manual_funders: Optional[Dict[Path, str]] = None,
+    ) -> Dict[str, Tuple[bool, Optional[Dict], Optional[str]]]:
+        """
+        Process all of a week's files for a portfolio in one pass.
+
+        Every file is classified and parsed first, then each funder's pivot is
+        applied to a single in-memory copy of the portfolio workbook, which is
+        backed up, loaded and saved exactly once.
+        The time spent in each stage is left in last_batch_timings.
+
+        Args:
+            file_paths: Paths to the week's uploaded files
+            portfolio: Portfolio the files are being processed for
+            processing_date: The Friday date these files should be processed for
+            manual_funders: Optional mapping of file path to funder, skipping
+                classification for those files
+
+        Returns:
+            Dict keyed by funder (or file name when no funder could be
+            determined) mapping to the same (success, result, error) tuple
+            returned by process_uploaded_file
+        """
+        manual_funders = {Path(k): v for k, v in (manual_funders or {}).items()}
+        results: Dict[str, Tuple[bool, Optional[Dict], Optional[str]]] = {}
+        funder_files: Dict[str, List[Path]] = {}
+        timings = self.last_batch_timings = {}
+        stage_start = time.perf_counter()
+
+        try:
+            if processing_date is None:
+                processing_date = get_most_recent_friday()
+
+            self.clear_processing_context()
+            self.set_processing_context(portfolio, processing_date)
+
+            self.logger.info(
+                f"Starting batch processing of {len(file_paths)} files - "
+                f"Portfolio: {portfolio.value}, "
+                f"Date: {processing_date.strftime('%Y-%m-%d')}"
+            )
+
+            # Get and validate workbook path
+            workbook_path = self.file_manager.get_portfolio_workbook_path(portfolio)
+            if not workbook_path:
+                return {
+                    Path(f).name: (False, None, "Portfolio workbook not found")
+                    for f in file_paths
+                }
+
+            # Classify every file and group them by funder. Each file is read
+            # once and its contents shared with the parser.
+            funder_classifications: Dict[str, List[ClassificationResult]] = {}
+            for file_path in map(Path, file_paths):
+                source = SourceFile(file_path)
+                funder, classification_result, error = self._resolve_funder(
+                    source, portfolio, manual_funders.get(file_path)
+                )
+                if error:
+                    results[funder or file_path.name] = (False, None, error)
+                    continue
+
+                funder_files.setdefault(funder, []).append(source)
+                if classification_result:
+                    funder_classifications.setdefault(funder, []).append(
+                        classification_result
+                    )
+
+            timings["classify"] = time.perf_counter() - stage_start
+            stage_start = time.perf_counter()
+
+            # Parse each funder's file(s) in parallel; only the workbook
+            # write below stays serialized
+            parse_jobs = {}
+            parsed = {}
+            recorded_files: Dict[str, List[Path]] = {}
+            for funder, files in funder_files.items():
+                if funder in results:
+                    continue
+
+                parser_class = self.get_parser_class(funder)
+                if not parser_class:
+                    results[funder] = (
+                        False,
+                        None,
+                        f"No parser available for funder {funder}",
+                    )
+                    continue
+
+                if funder == "ClearView":
+                    # Record and fold each day as process_uploaded_file does,
+                    # so the week's totals include days uploaded either way
+                    new_sources = {}
+                    for source in files:
+                        new_path, _ = self.file_manager.save_uploaded_file(
+                            file_path=source.path,
+                            portfolio=portfolio,
+                            funder=funder,
+                            date_received=processing_date,
+                            processing_status="pending",
+                        )
+                        new_sources[new_path] = source
+
+                    weekly_files = self.file_manager.get_unprocessed_files(
+                        portfolio=portfolio,
+                        funder=funder,
+                        processing_date=processing_date,
+                    )
+                    weekly_files += [p for p in new_sources if p not in weekly_files]
+
+                    pivot_table, gross, net, fee, error = self._fold_clearview_week(
+                        new_sources, weekly_files, portfolio, processing_date
+                    )
+                    if error:
+                        results[funder] = (False, None, error)
+                        continue
+
+                    parsed[funder] = (pivot_table, gross, net, fee)
+                    recorded_files[funder] = weekly_files
+                elif len(files) > 1:
+                    results[funder] = (
+                        False,
+                        None,
+                        f"Multiple files classified as {funder}: "
+                        f"{', '.join(f.name for f in files)}",
+                    )
+                else:
+                    parse_jobs[funder] = (parser_class, files[0])
+
+            # Files parsed before are served from the cache
+            cache_keys = {}
+            for funder, (parser_class, source) in list(parse_jobs.items()):
+                cache_keys[funder] = ParseCache.make_key(parser_class, [source])
+                cached = self.parse_cache.get(cache_keys[funder])
+                if cached is not None:
+                    parsed[funder] = cached
+                    del parse_jobs[funder]
+
+            parse_results = parse_files(parse_jobs, max_workers=self.max_parse_workers)
+            for funder, (pivot_table, gross, net, fee, error) in parse_results.items():
+                if error:
+                    results[funder] = (False, None, error)
+                    continue
+
+                parsed[funder] = (pivot_table, gross, net, fee)
+                self.parse_cache.put(cache_keys[funder], parsed[funder])
+
+            timings["parse"] = time.perf_counter() - stage_start
+            stage_start = time.perf_counter()
+
+            if not parsed:
+                return results
+
+            # Apply every pivot to one in-memory workbook and save once
+            workbook_manager = self._workbook_manager()
+            workbook_manager.backup_workbook(workbook_path, processing_date)
+            workbook = workbook_manager.load_workbook(workbook_path)
+
+            applied = {}
+            for funder, (pivot_table, *_totals) in parsed.items():
+                try:
+                    applied[funder] = workbook_manager.apply_pivot(
+                        workbook, pivot_table, funder, processing_date
+                    )
+                except Exception as e:
+                    error_msg = f"Error updating workbook: {str(e)}"
+                    self.logger.error(error_msg)
+                    results[funder] = (False, None, error_msg)
+
+            if applied:
+                workbook_manager.save_workbook(workbook, workbook_path)
+
+            timings["workbook"] = time.perf_counter() - stage_start
+            stage_start = time.perf_counter()
+
+            # Record the processed results for each funder
+            for funder, unmatched in applied.items():
+                pivot_table, total_gross, total_net, total_fee = parsed[funder]
+                files = recorded_files.get(funder) or [
+                    f.path for f in funder_files[funder]
+                ]
+                totals = {"gross": total_gross, "net": total_net, "fee": total_fee}
+
+                self.file_manager.save_processed_data(
+                    portfolio=portfolio,
+                    funder=funder,
+                    file_path=files[0],  # Use first file as primary
+                    pivot_table=pivot_table,
+                    totals=totals,
+                    processing_date=processing_date,
+                    additional_files=files[1:],
+                )
+
+                results[funder] = (
+                    True,
+                    self._build_result(
+                        funder,
+                        totals,
+                        unmatched,
+                        processing_date,
+                        len(files),
+                        funder_classifications.get(funder, []),
+                    ),
+                    None,
+                )
+
+            timings["record"] = time.perf_counter() - stage_start
+            return results
+
+        except Exception as e:
+            self.logger.error(f"Error processing batch: {str(e)}")
+            pending = list(funder_files) or [Path(f).name for f in file_paths]
+            for key in pending:
+                results.setdefault(key, (False, None, str(e)))
+            return results
+        finally:
+            self.clear_processing_context()
 
     def process_uploaded_file(
         self,
@@ -219,6 +632,7 @@ class PortfolioCoordinator:
         portfolio: Portfolio,
         processing_date: datetime = None,
         manual_funder: str = None,
+        progress: Optional[Callable[[ProcessingStatus], None]] = None,
     ) -> Tuple[bool, Optional[Dict], Optional[str]]:
         """
         Process an uploaded file for a specific portfolio.
@@ -228,6 +642,8 @@ class PortfolioCoordinator:
             portfolio: Portfolio the file is being processed for
             processing_date: The Friday date this file should be processed for
             manual_funder: If provided, skip classification and use this funder
+            progress: Optional callback, called with CLASSIFIED, PARSED and
+                WORKBOOK_UPDATED as the file reaches each stage
 
         Returns:
             Tuple containing:
@@ -251,32 +667,17 @@ class PortfolioCoordinator:
             if not self._validate_context():
                 return False, None, "Processing context not properly set"
 
-            # Determine funder using manual override or classifier
-            if manual_funder:
-                funder = manual_funder
-                classification_result = None
-            else:
-                # Use simplified classifier
-                classification_result = self.classifier.classify_funder(file_path)
-
-                # If classification failed, show debug information
-                if not classification_result.funder:
-                    self.classifier.debug_classification(file_path)
-                    return (
-                        False,
-                        None,
-                        f"Unable to identify funder. Reason: {classification_result.reason}",
-                    )
-
-                funder = classification_result.funder
+            # Read the file once and share it between classifier and parser
+            source = SourceFile(file_path)
 
-            # Validate funder belongs to portfolio
-            if not PortfolioStructure.validate_portfolio_funder(portfolio, funder):
-                return (
-                    False,
-                    None,
-                    f"Funder {funder} is not associated with portfolio {portfolio.value}",
-                )
+            # Determine funder using manual override or classifier
+            funder, classification_result, error = self._resolve_funder(
+                source, portfolio, manual_funder
+            )
+            if error:
+                return False, None, error
+            if progress:
+                progress(ProcessingStatus.CLASSIFIED)
 
             # Special handling for ClearView
             if funder == "ClearView":
@@ -293,27 +694,37 @@ class PortfolioCoordinator:
                 weekly_files = self.file_manager.get_unprocessed_files(
                     portfolio=portfolio, funder=funder, processing_date=processing_date
                 )
+                if new_path not in weekly_files:
+                    weekly_files.append(new_path)
 
                 file_count = len(weekly_files)
                 self.logger.info(f"Processing ClearView files - Day {file_count}")
 
-                # Process all available files together
-                parser = ClearViewParser(weekly_files)
+                # Fold the new day into the week's running totals
+                pivot_table, total_gross, total_net, total_fee, error = (
+                    self._fold_clearview_week(
+                        {new_path: source}, weekly_files, portfolio, processing_date
+                    )
+                )
 
             else:
                 # For other funders, process normally
-                parser = self._get_parser_for_funder(funder, file_path)
+                parser = self._get_parser_for_funder(funder, source)
                 weekly_files = [file_path]
                 file_count = 1
 
-            if not parser:
-                return False, None, f"No parser available for funder {funder}"
+                if not parser:
+                    return False, None, f"No parser available for funder {funder}"
 
-            # Process file(s)
-            pivot_table, total_gross, total_net, total_fee, error = parser.process()
+                # Process file, or reuse the result for a file parsed before
+                pivot_table, total_gross, total_net, total_fee, error = (
+                    self._parse_with_cache(parser)
+                )
 
             if error:
                 return False, None, error
+            if progress:
+                progress(ProcessingStatus.PARSED)
 
             # Get and validate workbook path
             workbook_path = self.file_manager.get_portfolio_workbook_path(portfolio)
@@ -321,7 +732,7 @@ class PortfolioCoordinator:
                 return False, None, "Portfolio workbook not found"
 
             # Update workbook
-            workbook_manager = WorkbookManager(self.file_manager)
+            workbook_manager = self._workbook_manager()
 
             # Only backup on first file of the week
             if funder != "ClearView" or file_count == 1:
@@ -333,6 +744,8 @@ class PortfolioCoordinator:
 
             if error:
                 return False, None, error
+            if progress:
+                progress(ProcessingStatus.WORKBOOK_UPDATED)
 
             # Save the processed results after each file
             self.file_manager.save_processed_data(
@@ -345,24 +758,14 @@ class PortfolioCoordinator:
                 additional_files=weekly_files[1:],
             )
 
-            # Create result dictionary
-            result = {
-                "funder": funder,
-                "totals": {"gross": total_gross, "net": total_net, "fee": total_fee},
-                "unmatched_ids": unmatched,
-                "processing_date": processing_date.strftime("%B %d, %Y"),
-                "files_processed": file_count if funder == "ClearView" else 1,
-            }
-
-            # Add classification details if available
-            if classification_result:
-                result.update(
-                    {
-                        "classification_confidence": classification_result.confidence,
-                        "new_merchant_ids": len(classification_result.new_ids),
-                        "matched_merchant_ids": len(classification_result.matched_ids),
-                    }
-                )
+            result = self._build_result(
+                funder,
+                {"gross": total_gross, "net": total_net, "fee": total_fee},
+                unmatched,
+                processing_date,
+                file_count if funder == "ClearView" else 1,
+                [classification_result] if classification_result else [],
+            )
 
             return True, result, None
 
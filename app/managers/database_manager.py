@@ -3,6 +3,15 @@
 import sqlite3
 import logging
 from pathlib import Path
+from core.ml.funder_classifier import FunderClassifier
+from utils.db_pool import get_connection
+
+
+# Full-text search indexes for the File Explorer, with the columns indexed
+SEARCH_INDEXES = {
+    "uploaded_files": ("original_filename", "portfolio", "funder"),
+    "pivot_tables": ("stored_filename", "portfolio", "funder"),
+}
 
 
 class DatabaseManager:
@@ -10,13 +19,17 @@ class DatabaseManager:
         self.db_path = db_path
         self.logger = logging.getLogger(__name__)
 
+        # Set once the search indexes exist; SQLite builds without FTS5 fall
+        # back to LIKE searches
+        self.full_text_search = False
+
         # Initialize database
         self._init_database()
 
     def _init_database(self):
         """Initialize all database tables and indexes."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with get_connection(self.db_path) as conn:
                 # Create merchant tracking table
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS merchant_tracking (
@@ -60,6 +73,7 @@ class DatabaseManager:
                         portfolio TEXT,
                         funder TEXT,
                         file_path TEXT,
+                        file_format TEXT DEFAULT 'csv',
                         FOREIGN KEY (source_file_id) REFERENCES uploaded_files (id)
                     )
                 """)
@@ -78,33 +92,260 @@ class DatabaseManager:
                     )
                 """)
 
+                # Latest totals for each portfolio, funder and week, kept by
+                # save_processed_data so history queries never scan the
+                # per-file tables. processing_date is the week's Friday as
+                # YYYY-MM-DD
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS weekly_summary (
+                        portfolio TEXT NOT NULL,
+                        funder TEXT NOT NULL,
+                        processing_date TEXT NOT NULL,
+                        gross_total REAL NOT NULL,
+                        net_total REAL NOT NULL,
+                        fee_total REAL NOT NULL,
+                        file_count INTEGER NOT NULL,
+                        updated_at TEXT NOT NULL,
+                        PRIMARY KEY (portfolio, funder, processing_date)
+                    ) WITHOUT ROWID
+                """)
+
+                # Running per-advance totals for the ClearView week being
+                # built up one daily file at a time
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS clearview_running_totals (
+                        portfolio TEXT NOT NULL,
+                        processing_date TEXT NOT NULL,
+                        advance_id TEXT NOT NULL,
+                        gross_total REAL NOT NULL,
+                        net_total REAL NOT NULL,
+                        PRIMARY KEY (portfolio, processing_date, advance_id)
+                    )
+                """)
+
+                # ClearView files already folded into the running totals
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS clearview_folded_files (
+                        portfolio TEXT NOT NULL,
+                        processing_date TEXT NOT NULL,
+                        file_path TEXT NOT NULL,
+                        content_hash TEXT NOT NULL,
+                        folded_at TEXT NOT NULL,
+                        PRIMARY KEY (portfolio, processing_date, file_path)
+                    )
+                """)
+
+                # Files kept in the content-addressed backup store
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS stored_files (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        path TEXT NOT NULL UNIQUE,
+                        content_hash TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        kind TEXT NOT NULL,
+                        backup_key TEXT,
+                        backup_date TEXT,
+                        compressed BOOLEAN DEFAULT FALSE,
+                        created_at TEXT NOT NULL
+                    )
+                """)
+
+                # Columns added since the tables were first created
+                self._add_column(
+                    conn, "pivot_tables", "file_format", "TEXT DEFAULT 'csv'"
+                )
+
                 # Create indexes
                 conn.execute("""
                     CREATE INDEX IF NOT EXISTS idx_merchant_portfolio_funder 
                     ON merchant_tracking(portfolio, funder)
                 """)
 
+                # Lets the classifier check for merchant changes without a
+                # table scan
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_merchant_last_updated
+                    ON merchant_tracking(last_updated)
+                """)
+
                 conn.execute("""
                     CREATE INDEX IF NOT EXISTS idx_uploaded_files_portfolio_funder 
                     ON uploaded_files(portfolio, funder)
                 """)
 
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_stored_files_backup
+                    ON stored_files(backup_key, backup_date)
+                """)
+
+                # Keyset pagination in the File Explorer walks these newest
+                # first; the rowid makes each entry unique
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_uploaded_files_upload_date
+                    ON uploaded_files(upload_date)
+                """)
+
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_pivot_tables_creation_date
+                    ON pivot_tables(creation_date)
+                """)
+
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_processing_totals_file_date
+                    ON processing_totals(file_id, processing_date)
+                """)
+
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_pivot_tables_portfolio_funder_date
+                    ON pivot_tables(portfolio, funder, processing_date)
+                """)
+
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_pivot_tables_source_file
+                    ON pivot_tables(source_file_id)
+                """)
+
+                # Covers date-range queries across every portfolio and funder
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_weekly_summary_date
+                    ON weekly_summary(
+                        processing_date, gross_total, net_total, fee_total, file_count
+                    )
+                """)
+
+                self._backfill_weekly_summary(conn)
+
+                self.full_text_search = all(
+                    self._create_search_index(conn, table, columns)
+                    for table, columns in SEARCH_INDEXES.items()
+                )
+
                 self.logger.info("Database initialization completed successfully")
 
         except Exception as e:
             self.logger.error(f"Error initializing database: {str(e)}")
             raise
 
+    def _add_column(self, conn, table: str, column: str, definition: str):
+        """Add a column to an existing table if it doesn't have it yet."""
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            self.logger.info(f"Added column {column} to {table}")
+
+    def _create_search_index(self, conn, table: str, columns: tuple) -> bool:
+        """
+        Create a trigram FTS5 index over table's columns, kept in sync by
+        triggers. Trigrams match any substring, as LIKE '%text%' does.
+
+        Returns:
+            bool: False if this SQLite build has no FTS5
+        """
+        search_table = f"{table}_search"
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (search_table,)
+        ).fetchone()
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{col}" for col in columns)
+        old_values = ", ".join(f"old.{col}" for col in columns)
+
+        try:
+            conn.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {search_table} USING fts5(
+                    {column_list},
+                    content='{table}',
+                    content_rowid='id',
+                    tokenize='trigram'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            self.logger.warning(f"Full-text search unavailable: {str(e)}")
+            return False
+
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {search_table}_insert
+            AFTER INSERT ON {table} BEGIN
+                INSERT INTO {search_table} (rowid, {column_list})
+                VALUES (new.id, {new_values});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {search_table}_delete
+            AFTER DELETE ON {table} BEGIN
+                INSERT INTO {search_table} ({search_table}, rowid, {column_list})
+                VALUES ('delete', old.id, {old_values});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {search_table}_update
+            AFTER UPDATE OF {column_list} ON {table} BEGIN
+                INSERT INTO {search_table} ({search_table}, rowid, {column_list})
+                VALUES ('delete', old.id, {old_values});
+                INSERT INTO {search_table} (rowid, {column_list})
+                VALUES (new.id, {new_values});
+            END
+        """)
+
+        # Index the rows recorded before the search table existed
+        if not exists:
+            conn.execute(
+                f"INSERT INTO {search_table} ({search_table}) VALUES ('rebuild')"
+            )
+            self.logger.info(f"Built search index {search_table}")
+        return True
+
+    def _backfill_weekly_summary(self, conn):
+        """Fill weekly_summary from processing_totals recorded before it existed."""
+        if conn.execute("SELECT 1 FROM weekly_summary LIMIT 1").fetchone():
+            return
+
+        # The most recent totals for each week win, as they do in the workbook
+        cursor = conn.execute("""
+            INSERT INTO weekly_summary (
+                portfolio, funder, processing_date, gross_total, net_total,
+                fee_total, file_count, updated_at
+            )
+            SELECT
+                uf.portfolio,
+                uf.funder,
+                DATE(pt.processing_date),
+                pt.gross_total,
+                pt.net_total,
+                pt.fee_total,
+                1 + (
+                    SELECT COUNT(*) FROM uploaded_files extra
+                    WHERE extra.primary_file_id = uf.id
+                ),
+                pt.created_at
+            FROM processing_totals pt
+            JOIN uploaded_files uf ON uf.id = pt.file_id
+            WHERE pt.id IN (
+                SELECT MAX(latest.id)
+                FROM processing_totals latest
+                JOIN uploaded_files luf ON luf.id = latest.file_id
+                WHERE latest.processing_date IS NOT NULL
+                GROUP BY luf.portfolio, luf.funder, DATE(latest.processing_date)
+            )
+        """)
+        if cursor.rowcount > 0:
+            self.logger.info(f"Backfilled {cursor.rowcount} weeks into weekly_summary")
+
     def reset_database(self):
         """Drop and recreate all tables - use with caution!"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with get_connection(self.db_path) as conn:
                 # Drop all tables
                 tables = [
                     "merchant_tracking",
                     "processing_totals",
                     "pivot_tables",
                     "uploaded_files",
+                    "clearview_running_totals",
+                    "clearview_folded_files",
+                    "stored_files",
+                    "weekly_summary",
+                    "uploaded_files_search",
+                    "pivot_tables_search",
                 ]
 
                 for table in tables:
@@ -112,6 +353,9 @@ class DatabaseManager:
 
                 self.logger.info("Existing tables dropped")
 
+                # Cached advance ID lookups no longer reflect the database
+                FunderClassifier.invalidate_index(self.db_path)
+
                 # Reinitialize database
                 self._init_database()
                 self.logger.info("Database reset completed successfully")
@@ -123,13 +367,17 @@ class DatabaseManager:
     def verify_database(self) -> bool:
         """Verify database schema and integrity."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with get_connection(self.db_path) as conn:
                 # Check all tables exist
                 required_tables = {
                     "merchant_tracking",
                     "uploaded_files",
                     "pivot_tables",
                     "processing_totals",
+                    "clearview_running_totals",
+                    "clearview_folded_files",
+                    "stored_files",
+                    "weekly_summary",
                 }
 
                 cursor = conn.execute("""
@@ -1,15 +1,81 @@
 # app/managers/file_manager.py
 
 import json
+import importlib.util
 import sqlite3
 import logging
 from datetime import datetime, timedelta
-import pandas as pd
 from pathlib import Path
-from typing import Dict, Optional, List, Tuple
+from typing import TYPE_CHECKING, Dict, Optional, List, Tuple
 from dataclasses import dataclass, asdict
 from .portfolio import Portfolio, PortfolioStructure
 from .database_manager import DatabaseManager
+from .backup_store import BackupStore, RetentionPolicy, replace_file
+from utils.db_pool import get_connection
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Formats pivot tables can be saved in and their file suffixes. The
+# columnar formats keep the amounts typed but need pyarrow
+PIVOT_FORMATS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+# Columns returned by get_weekly_totals
+WEEKLY_TOTALS_COLUMNS = [
+    "portfolio",
+    "funder",
+    "processing_date",
+    "gross_total",
+    "net_total",
+    "fee_total",
+    "file_count",
+]
+
+# Tables listed by search_files, keyed by the file type the File Explorer
+# shows: (table, filename column, date column, processing status)
+FILE_SOURCES = {
+    "Uploaded": (
+        "uploaded_files",
+        "original_filename",
+        "upload_date",
+        "processing_status",
+    ),
+    "Pivot Tables": ("pivot_tables", "stored_filename", "creation_date", "'completed'"),
+}
+
+# Shortest search the trigram index can match; shorter ones use LIKE
+MIN_SEARCH_LENGTH = 3
+
+
+def write_pivot_table(data: "pd.DataFrame", file_path: Path, file_format: str):
+    """Write a pivot table in the given format."""
+    if file_format == "csv":
+        data.to_csv(file_path, index=False)
+        return
+
+    # IDs mix numbers with the "Totals" label, so store text columns as text
+    data = data.reset_index(drop=True)
+    text_columns = data.select_dtypes("object").columns
+    data = data.astype({col: "string" for col in text_columns})
+    if file_format == "parquet":
+        data.to_parquet(file_path, index=False)
+    elif file_format == "feather":
+        data.to_feather(file_path)
+    else:
+        raise ValueError(f"Unsupported pivot table format: {file_format}")
+
+
+def load_pivot_table(file_path: Path) -> "pd.DataFrame":
+    """Read a saved pivot table in whichever format it was written."""
+    import pandas as pd
+
+    suffix = Path(file_path).suffix.lower()
+    if suffix == ".parquet":
+        return pd.read_parquet(file_path)
+    if suffix == ".feather":
+        return pd.read_feather(file_path)
+    return pd.read_csv(file_path)
 
 
 @dataclass
@@ -18,6 +84,11 @@ class UserPreferences:
     auth_token: Optional[str] = None
     last_upload_directory: Optional[str] = None
     recent_files: List[str] = None
+    backup_keep_weeks: int = 8
+    backup_keep_months: int = 12
+    backup_compress_after_weeks: int = 4
+    defer_workbook_backup: bool = True
+    pivot_format: str = "csv"
 
     def __post_init__(self):
         if self.recent_files is None:
@@ -43,6 +114,13 @@ class PortfolioFileManager:
         # Load user preferences
         self.preferences = self._load_preferences()
 
+        # Deduplicated storage for uploads and workbook backups
+        self.backup_store = BackupStore(
+            self.base_dir / "backups",
+            self.db_path,
+            RetentionPolicy.from_preferences(self.preferences),
+        )
+
         self.logger.info("FileManager initialized successfully")
 
     def _setup_directories(self):
@@ -113,6 +191,9 @@ class PortfolioFileManager:
         try:
             with open(self.config_file, "w") as f:
                 json.dump(asdict(self.preferences), f, indent=4)
+            self.backup_store.policy = RetentionPolicy.from_preferences(
+                self.preferences
+            )
             self.logger.info("Preferences saved successfully")
         except Exception as e:
             self.logger.error(f"Error saving preferences: {e}")
@@ -151,11 +232,9 @@ class PortfolioFileManager:
         new_path = save_dir / new_filename
 
         try:
-            import shutil
-
-            shutil.copy2(file_path, new_path)
+            self.backup_store.store_file(file_path, new_path)
 
-            with sqlite3.connect(self.db_path) as conn:
+            with get_connection(self.db_path) as conn:
                 cursor = conn.execute(
                     """
                     INSERT INTO uploaded_files (
@@ -202,9 +281,25 @@ class PortfolioFileManager:
             self.logger.error(error_msg)
             raise
 
+    @property
+    def pivot_format(self) -> str:
+        """The configured pivot table format, or CSV if it can't be written."""
+        file_format = self.preferences.pivot_format
+        if file_format not in PIVOT_FORMATS:
+            self.logger.warning(
+                f"Unknown pivot table format {file_format!r}, saving as CSV"
+            )
+            return "csv"
+        if file_format != "csv" and not HAS_PYARROW:
+            self.logger.warning(
+                f"Saving pivot tables as CSV: {file_format} needs pyarrow"
+            )
+            return "csv"
+        return file_format
+
     def save_pivot_table(
         self,
-        data: pd.DataFrame,
+        data: "pd.DataFrame",
         portfolio: Portfolio,
         funder: str,
         source_file_id: int,
@@ -215,30 +310,32 @@ class PortfolioFileManager:
             date_generated = datetime.now()
 
         # Generate filename
+        file_format = self.pivot_format
         timestamp = date_generated.strftime("%Y%m%d_%H%M%S")
-        filename = f"{portfolio.value}_{funder}_pivot_{timestamp}.csv"
+        filename = (
+            f"{portfolio.value}_{funder}_pivot_{timestamp}{PIVOT_FORMATS[file_format]}"
+        )
 
         # Determine save path
         save_dir = self.base_dir / portfolio.value / "outputs" / funder
         file_path = save_dir / filename
 
         try:
-            # If data is already a DataFrame, save it directly
-            if isinstance(data, pd.DataFrame):
-                data.to_csv(file_path, index=False)
-            else:
-                # Convert list data to DataFrame and save
-                df = pd.DataFrame(data[1:], columns=data[0])
-                df.to_csv(file_path, index=False)
+            import pandas as pd
+
+            # Convert list data to a DataFrame before saving
+            if not isinstance(data, pd.DataFrame):
+                data = pd.DataFrame(data[1:], columns=data[0])
+            write_pivot_table(data, file_path, file_format)
 
             # Record in database
-            with sqlite3.connect(self.db_path) as conn:
+            with get_connection(self.db_path) as conn:
                 conn.execute(
                     """
                     INSERT INTO pivot_tables (
                         source_file_id, stored_filename, creation_date,
-                        portfolio, funder, file_path
-                    ) VALUES (?, ?, ?, ?, ?, ?)
+                        portfolio, funder, file_path, file_format
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
                     (
                         source_file_id,
@@ -247,6 +344,7 @@ class PortfolioFileManager:
                         portfolio.value,
                         funder,
                         str(file_path),
+                        file_format,
                     ),
                 )
 
@@ -285,7 +383,7 @@ class PortfolioFileManager:
 
         query += " ORDER BY upload_date DESC"
 
-        with sqlite3.connect(self.db_path) as conn:
+        with get_connection(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             return [dict(row) for row in conn.execute(query, params).fetchall()]
 
@@ -304,7 +402,7 @@ class PortfolioFileManager:
             List[Path]: List of paths to unprocessed files
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with get_connection(self.db_path) as conn:
                 cursor = conn.execute(
                     """
                     SELECT file_path, original_filename
@@ -349,7 +447,7 @@ class PortfolioFileManager:
             processing_date: The processing date
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with get_connection(self.db_path) as conn:
                 cursor = conn.execute(
                     """
                     UPDATE uploaded_files
@@ -378,6 +476,141 @@ class PortfolioFileManager:
             self.logger.error(f"Error marking files as processed: {str(e)}")
             raise
 
+    def get_clearview_folded_files(
+        self, portfolio: Portfolio, processing_date: datetime
+    ) -> Dict[str, str]:
+        """
+        Get the ClearView files already folded into a week's running totals.
+
+        Args:
+            portfolio: Portfolio to check
+            processing_date: The processing date of the week
+
+        Returns:
+            Dict[str, str]: Mapping of stored file path to content hash
+        """
+        with get_connection(self.db_path) as conn:
+            cursor = conn.execute(
+                """
+                SELECT file_path, content_hash
+                FROM clearview_folded_files
+                WHERE portfolio = ? AND processing_date = ?
+            """,
+                (portfolio.value, processing_date.strftime("%Y-%m-%d")),
+            )
+            return dict(cursor.fetchall())
+
+    def fold_clearview_totals(
+        self,
+        portfolio: Portfolio,
+        processing_date: datetime,
+        file_path: Path,
+        content_hash: str,
+        daily_totals: Optional["pd.DataFrame"],
+    ) -> bool:
+        """
+        Add one ClearView file's per-advance sums to the week's running totals.
+
+        A file whose contents were already folded for the week is only recorded,
+        so uploading the same daily report twice does not count it twice.
+
+        Args:
+            portfolio: Portfolio the file belongs to
+            processing_date: The processing date of the week
+            file_path: Stored path of the uploaded file
+            content_hash: SHA-256 of the file contents
+            daily_totals: DataFrame with "AdvanceID", "Syn Gross Amount" and
+                "Syn Net Amount" columns, may be None for a duplicate file
+
+        Returns:
+            bool: True if the totals were folded in, False for a duplicate
+        """
+        week = processing_date.strftime("%Y-%m-%d")
+
+        with get_connection(self.db_path) as conn:
+            duplicate = conn.execute(
+                """
+                SELECT 1 FROM clearview_folded_files
+                WHERE portfolio = ? AND processing_date = ? AND content_hash = ?
+                LIMIT 1
+            """,
+                (portfolio.value, week, content_hash),
+            ).fetchone()
+
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO clearview_folded_files (
+                    portfolio, processing_date, file_path, content_hash, folded_at
+                ) VALUES (?, ?, ?, ?, ?)
+            """,
+                (
+                    portfolio.value,
+                    week,
+                    str(file_path),
+                    content_hash,
+                    datetime.now().isoformat(),
+                ),
+            )
+
+            if duplicate:
+                self.logger.info(
+                    f"ClearView file {Path(file_path).name} already counted for "
+                    f"{portfolio.value} week of {week}"
+                )
+                return False
+
+            conn.executemany(
+                """
+                INSERT INTO clearview_running_totals (
+                    portfolio, processing_date, advance_id, gross_total, net_total
+                ) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (portfolio, processing_date, advance_id) DO UPDATE SET
+                    gross_total = gross_total + excluded.gross_total,
+                    net_total = net_total + excluded.net_total
+            """,
+                [
+                    (portfolio.value, week, advance_id, float(gross), float(net))
+                    for advance_id, gross, net in zip(
+                        daily_totals["AdvanceID"],
+                        daily_totals["Syn Gross Amount"],
+                        daily_totals["Syn Net Amount"],
+                    )
+                ],
+            )
+
+        self.logger.info(
+            f"Folded {len(daily_totals)} advances from {Path(file_path).name} into "
+            f"{portfolio.value} ClearView week of {week}"
+        )
+        return True
+
+    def get_clearview_running_totals(
+        self, portfolio: Portfolio, processing_date: datetime
+    ) -> "pd.DataFrame":
+        """
+        Get a week's running ClearView totals.
+
+        Returns:
+            pd.DataFrame: "AdvanceID", "Syn Gross Amount" and "Syn Net Amount"
+            columns, ordered by AdvanceID
+        """
+        with get_connection(self.db_path) as conn:
+            rows = conn.execute(
+                """
+                SELECT advance_id, gross_total, net_total
+                FROM clearview_running_totals
+                WHERE portfolio = ? AND processing_date = ?
+                ORDER BY advance_id
+            """,
+                (portfolio.value, processing_date.strftime("%Y-%m-%d")),
+            ).fetchall()
+
+        import pandas as pd
+
+        return pd.DataFrame(
+            rows, columns=["AdvanceID", "Syn Gross Amount", "Syn Net Amount"]
+        )
+
     def _update_recent_files(self, file_path: str):
         """Update the list of recent files in preferences"""
         if file_path in self.preferences.recent_files:
@@ -398,7 +631,7 @@ class PortfolioFileManager:
         portfolio: Portfolio,
         funder: str,
         file_path: Path,
-        pivot_table: pd.DataFrame,
+        pivot_table: "pd.DataFrame",
         totals: Dict[str, float],
         processing_date: Optional[datetime] = None,
         additional_files: Optional[List[Path]] = None,
@@ -448,15 +681,19 @@ class PortfolioFileManager:
             week_identifier = week_start.strftime("%Y%m%d")
 
             # Save pivot table with week identifier
-            pivot_filename = f"{portfolio.value}_{funder}_pivot_{week_identifier}.csv"
+            file_format = self.pivot_format
+            pivot_filename = (
+                f"{portfolio.value}_{funder}_pivot_{week_identifier}"
+                f"{PIVOT_FORMATS[file_format]}"
+            )
             save_dir = self.base_dir / portfolio.value / "outputs" / funder
             pivot_path = save_dir / pivot_filename
 
             # Save the pivot table
-            pivot_table.to_csv(pivot_path, index=False)
+            write_pivot_table(pivot_table, pivot_path, file_format)
 
             # Update database records
-            with sqlite3.connect(self.db_path) as conn:
+            with get_connection(self.db_path) as conn:
                 # Update primary file status
                 conn.execute(
                     """
@@ -503,8 +740,9 @@ class PortfolioFileManager:
                         processing_date,
                         portfolio,
                         funder,
-                        file_path
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                        file_path,
+                        file_format
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                     (
                         file_id,
@@ -514,6 +752,7 @@ class PortfolioFileManager:
                         portfolio.value,
                         funder,
                         str(pivot_path),
+                        file_format,
                     ),
                 )
 
@@ -539,6 +778,39 @@ class PortfolioFileManager:
                     ),
                 )
 
+                # Keep the week's summary at the latest totals, which for
+                # ClearView already include the earlier days
+                conn.execute(
+                    """
+                    INSERT INTO weekly_summary (
+                        portfolio,
+                        funder,
+                        processing_date,
+                        gross_total,
+                        net_total,
+                        fee_total,
+                        file_count,
+                        updated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (portfolio, funder, processing_date) DO UPDATE SET
+                        gross_total = excluded.gross_total,
+                        net_total = excluded.net_total,
+                        fee_total = excluded.fee_total,
+                        file_count = excluded.file_count,
+                        updated_at = excluded.updated_at
+                """,
+                    (
+                        portfolio.value,
+                        funder,
+                        processing_date.strftime("%Y-%m-%d"),
+                        totals["gross"],
+                        totals["net"],
+                        totals["fee"],
+                        1 + len(additional_ids),
+                        datetime.now().isoformat(),
+                    ),
+                )
+
                 self.logger.info(
                     f"Successfully saved processed data for {portfolio.value}/{funder}. "
                     f"Primary File ID: {file_id}, "
@@ -552,7 +824,7 @@ class PortfolioFileManager:
             self.logger.error(error_msg)
 
             # Update status to failed in database
-            with sqlite3.connect(self.db_path) as conn:
+            with get_connection(self.db_path) as conn:
                 conn.execute(
                     """
                     UPDATE uploaded_files
@@ -610,10 +882,221 @@ class PortfolioFileManager:
 
         query += " ORDER BY uf.upload_date DESC"
 
-        with sqlite3.connect(self.db_path) as conn:
+        with get_connection(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             return [dict(row) for row in conn.execute(query, params).fetchall()]
 
+    def get_weekly_totals(
+        self,
+        portfolio: Optional[Portfolio] = None,
+        funder: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> "pd.DataFrame":
+        """
+        Get each week's latest totals per portfolio and funder.
+
+        Args:
+            portfolio: Optional portfolio filter
+            funder: Optional funder filter
+            start_date: Optional first processing date to include
+            end_date: Optional last processing date to include
+
+        Returns:
+            DataFrame with WEEKLY_TOTALS_COLUMNS, ordered by portfolio,
+            funder and processing_date
+        """
+        import pandas as pd
+
+        query = """
+            SELECT
+                portfolio,
+                funder,
+                processing_date,
+                gross_total,
+                net_total,
+                fee_total,
+                file_count
+            FROM weekly_summary
+            WHERE 1=1
+        """
+        params = []
+
+        if portfolio:
+            query += " AND portfolio = ?"
+            params.append(portfolio.value)
+        if funder:
+            query += " AND funder = ?"
+            params.append(funder)
+        if start_date:
+            query += " AND processing_date >= ?"
+            params.append(start_date.strftime("%Y-%m-%d"))
+        if end_date:
+            query += " AND processing_date <= ?"
+            params.append(end_date.strftime("%Y-%m-%d"))
+
+        query += " ORDER BY portfolio, funder, processing_date"
+
+        # Plain tuples straight into the DataFrame; converting each row to a
+        # dict first takes longer than the query
+        with get_connection(self.db_path) as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        weekly_totals = pd.DataFrame.from_records(rows, columns=WEEKLY_TOTALS_COLUMNS)
+        weekly_totals["processing_date"] = pd.to_datetime(
+            weekly_totals["processing_date"], format="%Y-%m-%d"
+        )
+        return weekly_totals
+
+    def get_file_status(self, file_id: int) -> Optional[str]:
+        """Get the stored processing status of an uploaded file, if it exists."""
+        with get_connection(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT processing_status FROM uploaded_files WHERE id = ?",
+                (file_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0] or "pending"
+
+    def search_files(
+        self,
+        portfolio: Optional[Portfolio] = None,
+        funder: Optional[str] = None,
+        file_type: str = "All",
+        date_range: Optional[Tuple[datetime, datetime]] = None,
+        search_text: str = "",
+        after: Optional[Dict[str, Optional[Tuple[str, int]]]] = None,
+        limit: int = 200,
+    ) -> Tuple[List[Dict], Optional[Dict[str, Optional[Tuple[str, int]]]]]:
+        """
+        Get one page of uploaded files and pivot tables, newest first.
+
+        Each table is paged on its (date, id) index rather than with OFFSET,
+        so later pages cost the same as the first.
+
+        Args:
+            portfolio: Optional portfolio filter
+            funder: Optional funder filter
+            file_type: "Uploaded", "Pivot Tables" or "All"
+            date_range: Optional (start, end) dates, both inclusive
+            search_text: Optional text to find in filenames, portfolio or funder
+            after: Cursor returned with the previous page
+            limit: Most rows to return
+
+        Returns:
+            Tuple of the rows and the cursor for the next page, or None
+            when this was the last page
+        """
+        if after is None:
+            after = {
+                source: None for source in FILE_SOURCES if file_type in ("All", source)
+            }
+
+        fetched = []
+        with get_connection(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            for source, last_row in after.items():
+                query, params = self._file_source_query(
+                    source, portfolio, funder, date_range, search_text, last_row
+                )
+                params.append(limit + 1)
+                fetched.extend(
+                    dict(row) for row in conn.execute(query, params).fetchall()
+                )
+
+        order = list(FILE_SOURCES)
+        fetched.sort(
+            key=lambda row: (
+                row["upload_date"] or "",
+                -order.index(row["file_type"]),
+                row["id"],
+            ),
+            reverse=True,
+        )
+        files = fetched[:limit]
+
+        # A table with rows left over resumes after the last one shown
+        cursor = {}
+        for row in fetched[limit:]:
+            cursor.setdefault(row["file_type"], after[row["file_type"]])
+        for row in files:
+            if row["file_type"] in cursor:
+                cursor[row["file_type"]] = (row["upload_date"], row["id"])
+        return files, cursor or None
+
+    def _file_source_query(
+        self,
+        source: str,
+        portfolio: Optional[Portfolio],
+        funder: Optional[str],
+        date_range: Optional[Tuple[datetime, datetime]],
+        search_text: str,
+        last_row: Optional[Tuple[str, int]],
+    ) -> Tuple[str, List]:
+        """Build the search_files query for one of FILE_SOURCES."""
+        table, filename_col, date_col, status = FILE_SOURCES[source]
+        query = f"""
+            SELECT
+                id,
+                {filename_col} AS original_filename,
+                stored_filename,
+                portfolio,
+                funder,
+                {date_col} AS upload_date,
+                {status} AS processing_status,
+                file_path,
+                '{source}' AS file_type
+            FROM {table}
+            WHERE 1=1
+        """
+        params = []
+
+        if portfolio:
+            query += " AND portfolio = ?"
+            params.append(portfolio.value)
+        if funder:
+            query += " AND funder = ?"
+            params.append(funder)
+
+        # Compare the stored ISO timestamps directly so the date index is
+        # used; the end date is included up to midnight of the next day
+        if date_range:
+            start, end = date_range
+            query += f" AND {date_col} >= ? AND {date_col} < ?"
+            params.append(start.strftime("%Y-%m-%d"))
+            params.append((end + timedelta(days=1)).strftime("%Y-%m-%d"))
+
+        search_text = search_text.strip()
+        if self.db_manager.full_text_search and len(search_text) >= MIN_SEARCH_LENGTH:
+            query += f"""
+                AND id IN (
+                    SELECT rowid FROM {table}_search WHERE {table}_search MATCH ?
+                )
+            """
+            params.append('"' + search_text.replace('"', '""') + '"')
+        elif search_text:
+            search_term = (
+                search_text.replace("\\", "\\\\")
+                .replace("%", "\\%")
+                .replace("_", "\\_")
+            )
+            query += f"""
+                AND (
+                    {filename_col} LIKE ? ESCAPE '\\'
+                    OR portfolio LIKE ? ESCAPE '\\'
+                    OR funder LIKE ? ESCAPE '\\'
+                )
+            """
+            params.extend([f"%{search_term}%"] * 3)
+
+        if last_row:
+            query += f" AND ({date_col}, id) < (?, ?)"
+            params.extend(last_row)
+
+        query += f" ORDER BY {date_col} DESC, id DESC LIMIT ?"
+        return query, params
+
     def save_portfolio_workbook(
         self, portfolio: Portfolio, workbook_path: Path
     ) -> None:
@@ -632,8 +1115,13 @@ class PortfolioFileManager:
             else:
                 filename = f"{portfolio.value.lower()}_portfolio.xlsx"
 
+            # Replace rather than overwrite, so pending background backups
+            # keep seeing the previous workbook. Copy the contents only, since
+            # a stored backup picked as the workbook is read-only
             new_path = config_dir / filename
-            shutil.copy2(workbook_path, new_path)
+            tmp_path = new_path.with_name(f".{filename}.saving")
+            shutil.copyfile(workbook_path, tmp_path)
+            replace_file(tmp_path, new_path)
 
             # Initialize WorkbookManager
             from core.data_processing.excel.workbook_manager import WorkbookManager
@@ -0,0 +1,176 @@
+# app/managers/job_queue.py
+
+import queue
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import count
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from utils.db_pool import close_connections
+from .coordinator import PortfolioCoordinator, ProcessingStatus
+from .portfolio import Portfolio
+
+# (success, result, error) as returned by process_uploaded_file
+ProcessingResult = Tuple[bool, Optional[Dict], Optional[str]]
+
+
+@dataclass
+class ProcessingJob:
+    """An uploaded file queued for processing."""
+
+    job_id: int
+    file_path: Path
+    portfolio: Portfolio
+    processing_date: Optional[datetime] = None
+    manual_funder: Optional[str] = None
+    on_progress: Optional[Callable[["ProcessingJob", ProcessingStatus], None]] = None
+    on_done: Optional[Callable[["ProcessingJob"], None]] = None
+    status: ProcessingStatus = ProcessingStatus.PENDING
+    result: Optional[ProcessingResult] = None
+
+
+class JobQueue:
+    """
+    Processes uploaded files one at a time on a background thread.
+
+    Jobs run in the order they were submitted, so files dropped while another
+    is being processed simply wait their turn. Callbacks are never run on the
+    worker thread: progress and completion are queued as events, and
+    dispatch_events() runs them on whichever thread calls it, which for the
+    GUI is the Tk main loop.
+    """
+
+    def __init__(self, coordinator: PortfolioCoordinator):
+        self.coordinator = coordinator
+        self.logger = logging.getLogger(__name__)
+
+        self._jobs: "queue.Queue[Optional[ProcessingJob]]" = queue.Queue()
+        self._events: queue.Queue = queue.Queue()
+        self._ids = count(1)
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def submit(
+        self,
+        file_path: Path,
+        portfolio: Portfolio,
+        processing_date: Optional[datetime] = None,
+        manual_funder: Optional[str] = None,
+        on_progress: Optional[Callable[[ProcessingJob, ProcessingStatus], None]] = None,
+        on_done: Optional[Callable[[ProcessingJob], None]] = None,
+    ) -> ProcessingJob:
+        """
+        Queue a file for processing with process_uploaded_file.
+
+        Args:
+            file_path: Path to the uploaded file
+            portfolio: Portfolio the file is being processed for
+            processing_date: The Friday date this file should be processed for
+            manual_funder: If provided, skip classification and use this funder
+            on_progress: Called with the job and each stage it reaches
+            on_done: Called with the job once job.result is set
+
+        Returns:
+            ProcessingJob: The queued job
+        """
+        job = ProcessingJob(
+            job_id=next(self._ids),
+            file_path=Path(file_path),
+            portfolio=portfolio,
+            processing_date=processing_date,
+            manual_funder=manual_funder,
+            on_progress=on_progress,
+            on_done=on_done,
+        )
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="processing-worker", daemon=True
+                )
+                self._worker.start()
+            self._jobs.put(job)
+
+        self.logger.info(f"Queued job {job.job_id}: {job.file_path.name}")
+        return job
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs not yet finished, including the running one."""
+        return self._jobs.unfinished_tasks
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is None:
+                    break
+                self._process(job)
+            finally:
+                self._jobs.task_done()
+        close_connections()
+
+    def _process(self, job: ProcessingJob):
+        def progress(status: ProcessingStatus):
+            job.status = status
+            self._post(job.on_progress, job, status)
+
+        try:
+            job.result = self.coordinator.process_uploaded_file(
+                job.file_path,
+                portfolio=job.portfolio,
+                processing_date=job.processing_date,
+                manual_funder=job.manual_funder,
+                progress=progress,
+            )
+        except Exception as e:
+            self.logger.error(f"Job {job.job_id} failed: {str(e)}")
+            job.result = (False, None, str(e))
+
+        job.status = (
+            ProcessingStatus.COMPLETED if job.result[0] else ProcessingStatus.FAILED
+        )
+        self._post(job.on_done, job)
+
+    def _post(self, callback: Optional[Callable], *args):
+        if callback is not None:
+            self._events.put((callback, args))
+
+    def dispatch_events(self, limit: int = 100) -> int:
+        """
+        Run queued job callbacks on the calling thread.
+
+        Args:
+            limit: Most callbacks to run in one call, so a burst of events
+                cannot hold up the caller's event loop
+
+        Returns:
+            int: Number of callbacks run
+        """
+        handled = 0
+        while handled < limit:
+            try:
+                callback, args = self._events.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                self.logger.error(f"Error in job callback: {str(e)}")
+            handled += 1
+        return handled
+
+    def wait(self):
+        """Block until every submitted job has finished."""
+        self._jobs.join()
+
+    def shutdown(self):
+        """Finish the queued jobs and stop the worker thread."""
+        with self._lock:
+            worker = self._worker
+            if worker is None or not worker.is_alive():
+                return
+            self._jobs.put(None)
+            self._worker = None
+        worker.join()
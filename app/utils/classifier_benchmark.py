@@ -0,0 +1,148 @@
+# app/utils/classifier_benchmark.py
+
+"""
+Compare the ways FunderClassifier has matched advance IDs to funders.
+
+Seeds a scratch merchant_tracking table, then matches files of advance IDs
+(half known, half new) with one SELECT per ID, with chunked IN lookups, and
+with the in-memory index the classifier uses now, checking that all three
+return the same matches.
+
+Usage:
+    python app/utils/classifier_benchmark.py [--merchants N] [--runs N]
+"""
+
+import sys
+import logging
+import argparse
+import random
+import tempfile
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+# Add the parent directory to sys.path
+sys.path.append(str(Path(__file__).parent.parent))
+
+# ruff: noqa: E402
+from core.ml.funder_classifier import FunderClassifier
+from managers.database_manager import DatabaseManager
+from utils.db_pool import get_connection
+
+FUNDERS = ["ACS", "BHB", "ClearView", "EFIN", "Kings"]
+
+# Older SQLite builds cap a statement at 999 bound parameters
+LOOKUP_CHUNK_SIZE = 900
+
+
+def per_id_matches(db_path: Path, advance_ids: List[str]) -> Dict[str, List[str]]:
+    """The original lookup: one SELECT per advance ID."""
+    matches = {}
+    with get_connection(db_path) as conn:
+        for advance_id in advance_ids:
+            result = conn.execute(
+                "SELECT funder FROM merchant_tracking WHERE advance_id = ?",
+                (advance_id,),
+            ).fetchone()
+            if result:
+                matches.setdefault(result[0], []).append(advance_id)
+    return matches
+
+
+def chunked_matches(db_path: Path, advance_ids: List[str]) -> Dict[str, List[str]]:
+    """Each distinct ID resolved once, in IN lookups of LOOKUP_CHUNK_SIZE."""
+    unique_ids = list(dict.fromkeys(advance_ids))
+    id_to_funder = {}
+    with get_connection(db_path) as conn:
+        for start in range(0, len(unique_ids), LOOKUP_CHUNK_SIZE):
+            chunk = unique_ids[start : start + LOOKUP_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(
+                f"""
+                SELECT advance_id, funder FROM merchant_tracking
+                WHERE advance_id IN ({placeholders})
+                """,
+                chunk,
+            )
+            id_to_funder.update(cursor.fetchall())
+
+    matches = {}
+    for advance_id in advance_ids:
+        funder = id_to_funder.get(advance_id)
+        if funder:
+            matches.setdefault(funder, []).append(advance_id)
+    return matches
+
+
+def seed(db_path: Path, merchants: int):
+    now = datetime.now().isoformat()
+    with get_connection(db_path) as conn:
+        conn.executemany(
+            """
+            INSERT INTO merchant_tracking
+            (advance_id, funder, merchant_name, portfolio, first_seen_date, last_updated)
+            VALUES (?, ?, ?, 'Alder', ?, ?)
+            """,
+            (
+                (str(100000 + i), FUNDERS[i % len(FUNDERS)], f"Merchant {i}", now, now)
+                for i in range(merchants)
+            ),
+        )
+
+
+def best_ms(func, runs: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=runs)) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--merchants", type=int, default=50_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "portfolio.db"
+        DatabaseManager(db_path)
+        seed(db_path, args.merchants)
+        classifier = FunderClassifier(db_path)
+
+        print(f"{args.merchants} merchants, best of {args.runs}\n")
+        print(
+            f"{'file IDs':>9} {'per-ID ms':>10} {'chunked ms':>11} "
+            f"{'index ms':>9} {'index load ms':>14} {'identical':>10}"
+        )
+        for size in (300, 3_000, 30_000):
+            known = rng.sample(range(args.merchants), size // 2)
+            advance_ids = [str(100000 + i) for i in known]
+            advance_ids += [f"NEW{i}" for i in range(size - len(advance_ids))]
+            rng.shuffle(advance_ids)
+
+            load = best_ms(
+                lambda: (
+                    FunderClassifier.invalidate_index(db_path),
+                    classifier._get_index(),
+                ),
+                args.runs,
+            )
+            per_id = per_id_matches(db_path, advance_ids)
+            identical = (
+                per_id
+                == chunked_matches(db_path, advance_ids)
+                == classifier._match_ids_to_funder(advance_ids)
+            )
+            print(
+                f"{size:>9} "
+                f"{best_ms(lambda: per_id_matches(db_path, advance_ids), args.runs):>10.1f} "
+                f"{best_ms(lambda: chunked_matches(db_path, advance_ids), args.runs):>11.1f} "
+                f"{best_ms(lambda: classifier._match_ids_to_funder(advance_ids), args.runs):>9.1f} "
+                f"{load:>14.1f} {str(identical):>10}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+# app/utils/explorer_benchmark.py
+
+"""
+Time the File Explorer listing against the single query it replaced.
+
+Seeds a scratch database with uploads and pivot tables for every
+portfolio and funder, then times the first page, a page deep into the
+list, a date range and searches with PortfolioFileManager.search_files.
+Each is checked against the old UNION ALL query, which read every
+matching row.
+
+Usage:
+    python app/utils/explorer_benchmark.py [--files N] [--runs N]
+"""
+
+import sys
+import logging
+import argparse
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the parent directory to sys.path
+sys.path.append(str(Path(__file__).parent.parent))
+
+# ruff: noqa: E402
+from managers.file_manager import PortfolioFileManager
+from managers.portfolio import Portfolio, PortfolioStructure
+from utils.db_pool import get_connection
+
+# The explorer's query before search_files, with every filter applied
+UNION_QUERY = """
+    SELECT * FROM (
+        SELECT
+            uf.original_filename, uf.upload_date, 'Uploaded' AS file_type
+        FROM uploaded_files uf
+        WHERE DATE(uf.upload_date) BETWEEN DATE(?) AND DATE(?)
+            AND (
+                uf.original_filename LIKE ?
+                OR uf.portfolio LIKE ?
+                OR uf.funder LIKE ?
+            )
+        UNION ALL
+        SELECT
+            pt.stored_filename AS original_filename,
+            pt.creation_date AS upload_date,
+            'Pivot Tables' AS file_type
+        FROM pivot_tables pt
+        WHERE DATE(pt.creation_date) BETWEEN DATE(?) AND DATE(?)
+            AND (
+                pt.stored_filename LIKE ?
+                OR pt.portfolio LIKE ?
+                OR pt.funder LIKE ?
+            )
+    )
+    ORDER BY upload_date DESC
+"""
+
+
+def seed(file_manager: PortfolioFileManager, files: int):
+    """Record files uploads, each with a pivot table an hour later."""
+    funders = [
+        (portfolio.value, funder)
+        for portfolio in Portfolio
+        for funder in PortfolioStructure.get_portfolio_funders(portfolio)
+    ]
+    first = datetime(2024, 1, 5) - timedelta(hours=files)
+    uploads = []
+    pivots = []
+    for i in range(files):
+        portfolio, funder = funders[i % len(funders)]
+        uploaded = first + timedelta(hours=i)
+        uploads.append(
+            (
+                f"{funder}_{uploaded:%Y%m%d_%H}.csv",
+                f"{i}_{funder}.csv",
+                portfolio,
+                funder,
+                uploaded.isoformat(),
+                "completed",
+                f"/data/uploads/{i}_{funder}.csv",
+            )
+        )
+        pivots.append(
+            (
+                i + 1,
+                f"pivot_{i}_{funder}.csv",
+                (uploaded + timedelta(hours=1)).isoformat(),
+                portfolio,
+                funder,
+                f"/data/pivots/pivot_{i}_{funder}.csv",
+            )
+        )
+
+    with get_connection(file_manager.db_path) as conn:
+        conn.executemany(
+            """
+            INSERT INTO uploaded_files (
+                original_filename, stored_filename, portfolio, funder,
+                upload_date, processing_status, file_path
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            uploads,
+        )
+        conn.executemany(
+            """
+            INSERT INTO pivot_tables (
+                source_file_id, stored_filename, creation_date, portfolio,
+                funder, file_path
+            ) VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            pivots,
+        )
+
+
+def union_files(file_manager: PortfolioFileManager, date_range, search_text):
+    """Every matching row from the old query, as (filename, date, type)."""
+    start, end = date_range
+    term = f"%{search_text}%"
+    params = [start.isoformat(), end.isoformat(), term, term, term] * 2
+    with get_connection(file_manager.db_path) as conn:
+        return conn.execute(UNION_QUERY, params).fetchall()
+
+
+def all_pages(file_manager: PortfolioFileManager, limit: int, **filters):
+    """Walk search_files to the end, as (filename, date, type)."""
+    rows = []
+    cursor = None
+    while True:
+        files, cursor = file_manager.search_files(after=cursor, limit=limit, **filters)
+        rows += [
+            (row["original_filename"], row["upload_date"], row["file_type"])
+            for row in files
+        ]
+        if cursor is None:
+            return rows
+
+
+def best_ms(func, runs: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=runs)) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--files", type=int, default=50_000)
+    parser.add_argument("--page", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_manager = PortfolioFileManager(Path(tmp))
+        seed(file_manager, args.files)
+
+        end = datetime(2024, 1, 5)
+        everything = (end - timedelta(hours=args.files), end)
+        last_month = (end - timedelta(days=30), end)
+        print(
+            f"{args.files} uploads and {args.files} pivot tables, "
+            f"{args.page} per page, full-text search: "
+            f"{file_manager.db_manager.full_text_search}, best of {args.runs}\n"
+        )
+        print(
+            f"{'listing':<28} {'rows':>6} {'union ms':>9} {'page ms':>8} "
+            f"{'deep page ms':>13} {'same order':>11}"
+        )
+
+        cases = [
+            ("everything", everything, ""),
+            ("last month", last_month, ""),
+            ("search 'Kings'", everything, "Kings"),
+            ("search '0105_0'", everything, "0105_0"),
+            ("search 'pivot_4999'", everything, "pivot_4999"),
+        ]
+        for label, date_range, search_text in cases:
+            filters = {"date_range": date_range, "search_text": search_text}
+            union = union_files(file_manager, date_range, search_text)
+            union_ms = best_ms(
+                lambda: union_files(file_manager, date_range, search_text), args.runs
+            )
+            page_ms = best_ms(
+                lambda: file_manager.search_files(limit=args.page, **filters),
+                args.runs,
+            )
+
+            # Time the page after 20 pages have been loaded
+            cursor = None
+            for _ in range(20):
+                _, cursor = file_manager.search_files(
+                    after=cursor, limit=args.page, **filters
+                )
+                if cursor is None:
+                    break
+            deep_ms = best_ms(
+                lambda: file_manager.search_files(
+                    after=cursor, limit=args.page, **filters
+                ),
+                args.runs,
+            )
+
+            # Every page together should match the old query row for row
+            paged = all_pages(file_manager, args.page, **filters)
+            same = [tuple(row) for row in union] == paged
+            print(
+                f"{label:<28} {len(union):>6} {union_ms:>9.2f} {page_ms:>8.2f} "
+                f"{deep_ms:>13.2f} {str(same):>11}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+# app/utils/history_benchmark.py
+
+"""
+Time PortfolioCoordinator.get_file_history against years of history.
+
+Seeds a scratch database with weekly uploads for every portfolio and
+funder (ClearView sends a file each weekday and is recorded after each
+one), fills weekly_summary through the same backfill an upgraded database
+gets, then times history queries against it and against the equivalent
+query over the per-file tables.
+
+Usage:
+    python app/utils/history_benchmark.py [--years N] [--runs N]
+"""
+
+import sys
+import logging
+import argparse
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the parent directory to sys.path
+sys.path.append(str(Path(__file__).parent.parent))
+
+# ruff: noqa: E402
+from managers.coordinator import PortfolioCoordinator
+from managers.file_manager import PortfolioFileManager
+from managers.portfolio import Portfolio, PortfolioStructure
+from utils.db_pool import get_connection
+
+# The same week's latest totals, computed from the per-file tables
+PER_FILE_QUERY = """
+    SELECT
+        uf.portfolio,
+        uf.funder,
+        DATE(pt.processing_date) AS processing_date,
+        pt.gross_total,
+        pt.net_total,
+        pt.fee_total
+    FROM processing_totals pt
+    JOIN uploaded_files uf ON uf.id = pt.file_id
+    WHERE pt.id IN (
+        SELECT MAX(latest.id)
+        FROM processing_totals latest
+        JOIN uploaded_files luf ON luf.id = latest.file_id
+        WHERE luf.portfolio = ? AND luf.funder = ?
+            AND DATE(latest.processing_date) BETWEEN ? AND ?
+        GROUP BY luf.portfolio, luf.funder, DATE(latest.processing_date)
+    )
+    ORDER BY uf.portfolio, uf.funder, processing_date
+"""
+
+
+def seed(file_manager: PortfolioFileManager, years: int) -> int:
+    """Record years of weekly processing and return the processing_totals rows."""
+    first_friday = datetime(2024, 1, 5) - timedelta(weeks=52 * years)
+    uploads = []
+    totals = []
+    for week in range(52 * years):
+        friday = first_friday + timedelta(weeks=week)
+        for portfolio in Portfolio:
+            for funder in PortfolioStructure.get_portfolio_funders(portfolio):
+                days = 5 if funder == "ClearView" else 1
+                for day in range(days):
+                    file_id = len(uploads) + 1
+                    primary = file_id - day if day else None
+                    uploads.append(
+                        (
+                            file_id,
+                            f"{funder}_{friday:%Y%m%d}_{day}.csv",
+                            portfolio.value,
+                            funder,
+                            friday.isoformat(),
+                            friday.isoformat(),
+                            "completed",
+                            bool(day),
+                            primary,
+                        )
+                    )
+                    # ClearView totals grow through the week
+                    amount = 1000.0 + week + day * 100
+                    totals.append(
+                        (
+                            primary or file_id,
+                            amount,
+                            amount * 0.95,
+                            amount * 0.05,
+                            friday.isoformat(),
+                            friday.isoformat(),
+                        )
+                    )
+
+    with get_connection(file_manager.db_path) as conn:
+        conn.executemany(
+            """
+            INSERT INTO uploaded_files (
+                id, original_filename, portfolio, funder, upload_date,
+                processing_date, processing_status, is_additional, primary_file_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            uploads,
+        )
+        conn.executemany(
+            """
+            INSERT INTO processing_totals (
+                file_id, gross_total, net_total, fee_total, processing_date,
+                created_at
+            ) VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            totals,
+        )
+        file_manager.db_manager._backfill_weekly_summary(conn)
+    return len(totals)
+
+
+def best_ms(func, runs: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=runs)) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_manager = PortfolioFileManager(Path(tmp))
+        coordinator = PortfolioCoordinator(file_manager)
+        rows = seed(file_manager, args.years)
+
+        end = datetime(2024, 1, 5)
+        year = (end - timedelta(weeks=52), end)
+        everything = (end - timedelta(weeks=52 * args.years), end)
+        print(
+            f"{args.years} years, {rows} processing_totals rows, best of {args.runs}\n"
+        )
+        print(f"{'query':<40} {'rows':>6} {'ms':>8}")
+
+        cases = [
+            ("one funder, last year", Portfolio.ALDER, "Kings", year),
+            ("one funder, all history", Portfolio.ALDER, "ClearView", everything),
+            ("one portfolio, last year", Portfolio.ALDER, None, year),
+            ("everything, last year", None, None, year),
+            ("everything, all history", None, None, everything),
+        ]
+        for label, portfolio, funder, date_range in cases:
+            history = coordinator.get_file_history(portfolio, funder, date_range)
+            ms = best_ms(
+                lambda: coordinator.get_file_history(portfolio, funder, date_range),
+                args.runs,
+            )
+            print(f"{label:<40} {len(history):>6} {ms:>8.2f}")
+
+        params = (
+            Portfolio.ALDER.value,
+            "ClearView",
+            everything[0].strftime("%Y-%m-%d"),
+            everything[1].strftime("%Y-%m-%d"),
+        )
+        with get_connection(file_manager.db_path) as conn:
+            count = len(conn.execute(PER_FILE_QUERY, params).fetchall())
+            ms = best_ms(
+                lambda: conn.execute(PER_FILE_QUERY, params).fetchall(), args.runs
+            )
+        print(f"{'per-file tables, ClearView all history':<40} {count:>6} {ms:>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+# app/utils/parser_benchmark.py
+
+"""
+Compare reading funder CSVs in full with reading only the declared columns.
+
+Writes a large synthetic export for each CSV parser, padded with unused
+columns the way real funder exports are, then times both reads and records
+their peak allocations and the size of the resulting DataFrame.
+
+Usage:
+    python app/utils/parser_benchmark.py [--rows N] [--extra-columns N] [--runs N]
+"""
+
+import sys
+import random
+import argparse
+import tempfile
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# Add the parent directory to sys.path
+sys.path.append(str(Path(__file__).parent.parent))
+
+# ruff: noqa: E402
+import pandas as pd
+from core.data_processing.source_file import SourceFile
+from core.data_processing.parsers.acs_vesper_parser import AcsVesperParser
+from core.data_processing.parsers.bhb_parser import BHBParser
+from core.data_processing.parsers.clear_view_parser import ClearViewParser
+from core.data_processing.parsers.efin_parser import EfinParser
+from core.data_processing.parsers.kings_boom_parser import KingsBoomParser
+
+PARSER_CLASSES = {
+    "ACS": AcsVesperParser,
+    "BHB": BHBParser,
+    "ClearView": ClearViewParser,
+    "EFIN": EfinParser,
+    "Kings": KingsBoomParser,
+}
+
+
+def money(rng: random.Random) -> str:
+    return f'"${rng.uniform(0, 5000):,.2f}"'
+
+
+def write_export(
+    path: Path, header: List[str], make_row: Callable, rows: int, preamble: str = ""
+) -> None:
+    rng = random.Random(0)
+    with open(path, "w") as f:
+        f.write(preamble)
+        f.write(",".join(header) + "\n")
+        for i in range(rows):
+            f.write(",".join(make_row(rng, i)) + "\n")
+
+
+def write_samples(directory: Path, rows: int, extra: int) -> Dict[str, Path]:
+    """Write one wide sample per parser and return their paths."""
+    filler = [f"Extra {i}" for i in range(extra)]
+
+    def padded(rng: random.Random, values: List[str]) -> List[str]:
+        return values + [str(rng.randint(0, 99999)) for _ in filler]
+
+    samples = {}
+    layouts = {
+        "Kings": (
+            ["Funding Date", "Advance ID", "Business Name", "Payable Amt (Gross)"]
+            + ["Servicing Fee $", "Payable Amt (Net)"],
+            lambda rng, i: (
+                ["1/1/2024", str(100000 + i), f"Biz {i}"]
+                + [money(rng), money(rng), money(rng)]
+            ),
+        ),
+        "EFIN": (
+            ["Funding Date", "Advance ID", "Business Name", "Advance Status"]
+            + ["Payable Amt (Gross)", "Servicing Fee $", "Payable Amt (Net)"]
+            + ["Payable Status"],
+            lambda rng, i: (
+                ["1/1/2024", str(100000 + i % (rows // 2 or 1))]
+                + [f"Biz {i}", "Active", money(rng), money(rng), money(rng), "Paid"]
+            ),
+        ),
+        "BHB": (
+            ["Deal ID", "Deal Name", "Participator Gross Amount"]
+            + ["Non Qualifying Collections", "Total Reversals", "Fee"]
+            + ["Res. Commission", "Net Payment Amount", "Balance"],
+            lambda rng, i: (
+                [str(100000 + i), f"Deal {i}", money(rng), "0", "0"]
+                + [money(rng), "0", money(rng), "5"]
+            ),
+        ),
+        "ClearView": (
+            ["Last Merchant Cleared Date", "Advance Status", "AdvanceID"]
+            + ["Frequency", "Repayment Type", "Draft Amount", "Return Code"]
+            + ["Return Date", "Syn Gross Amount", "Syn Net Amount"]
+            + ["Syn Cleared Date", "Syndicated Amt", "Syndicate Purchase Price"]
+            + ["Syndicate Net RTR Remain"],
+            lambda rng, i: (
+                ["1/1/2024", "Active", str(100000 + i)]
+                + ["Daily", "ACH", money(rng), "", "", money(rng), money(rng)]
+                + ["1/1/2024", money(rng), money(rng), money(rng)]
+            ),
+        ),
+    }
+    for funder, (header, make_row) in layouts.items():
+        samples[funder] = directory / f"{funder.lower()}.csv"
+        write_export(
+            samples[funder],
+            header + filler,
+            lambda rng, i: padded(rng, make_row(rng, i)),
+            rows,
+        )
+
+    # ACS reports grow three columns a week instead of having filler
+    weeks = max(extra // 3, 1)
+    header = ["Advance ID", "Merchant Name"]
+    for week in range(weeks):
+        header += [f"Gross {week}", f"Fees {week}", f"Net {week}"]
+    samples["ACS"] = directory / "acs.csv"
+    write_export(
+        samples["ACS"],
+        header + ["Total Net"],
+        lambda rng, i: (
+            [f"AC{100000 + i}", f"M {i}"] + [money(rng) for _ in range(3 * weeks + 1)]
+        ),
+        rows,
+        preamble="Report" + "," * (len(header) - 1) + "\n\n",
+    )
+    return samples
+
+
+def full_read(funder: str, path: Path) -> pd.DataFrame:
+    """Read every column, as the parsers used to."""
+    source = SourceFile(path)
+    if funder == "ACS":
+        return pd.read_csv(source.buffer(), header=1)
+    return source.read_csv(encoding="utf-8")
+
+
+def declared_read(funder: str, path: Path) -> pd.DataFrame:
+    """Read only what the parser declares."""
+    parser = PARSER_CLASSES[funder](SourceFile(path))
+    if funder == "ACS":
+        return parser.read_csv()
+    return parser.read_columns(encoding="utf-8")
+
+
+def measure(read: Callable, funder: str, path: Path, runs: int) -> Tuple[float, ...]:
+    """Return (median seconds, peak traced MB, DataFrame MB, column count)."""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        read(funder, path)
+        times.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    df = read(funder, path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    frame = df.memory_usage(deep=True).sum()
+    return statistics.median(times), peak / 1e6, frame / 1e6, len(df.columns)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--extra-columns", type=int, default=40)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{args.rows} rows, {args.extra_columns} unused columns\n")
+    print(
+        f"{'parser':<10} {'read':<9} {'cols':>4} {'time ms':>8} "
+        f"{'peak MB':>8} {'frame MB':>9}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        samples = write_samples(Path(tmp), args.rows, args.extra_columns)
+        for funder, path in samples.items():
+            for label, read in (("full", full_read), ("declared", declared_read)):
+                secs, peak, frame, cols = measure(read, funder, path, args.runs)
+                print(
+                    f"{funder:<10} {label:<9} {cols:>4} {secs * 1000:>8.0f} "
+                    f"{peak:>8.1f} {frame:>9.1f}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+# app/utils/pivot_benchmark.py
+
+"""
+Compare BaseParser.create_pivot_table with the pd.pivot_table version it
+replaced, and the formats pivot tables can be saved in.
+
+Runs each CSV parser over a synthetic export from parser_benchmark, keeps
+the DataFrame it hands to create_pivot_table, then times both pivots on it
+and checks that they write byte-identical CSVs. Each pivot is then saved in
+every available format to compare file sizes and load times.
+
+Usage:
+    python app/utils/pivot_benchmark.py [--rows N] [--runs N]
+"""
+
+import sys
+import logging
+import argparse
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Dict, Tuple
+
+# Add the parent directory to sys.path
+sys.path.append(str(Path(__file__).parent.parent))
+
+# ruff: noqa: E402
+import pandas as pd
+from core.data_processing.source_file import SourceFile
+from core.data_processing.parsers.base_parser import NAME_COLUMNS, BaseParser
+from managers.file_manager import (
+    HAS_PYARROW,
+    PIVOT_FORMATS,
+    load_pivot_table,
+    write_pivot_table,
+)
+from utils.parser_benchmark import PARSER_CLASSES, write_samples
+
+
+def reference_pivot_table(
+    df: pd.DataFrame, gross_col: str, net_col: str, fee_col: str, index: list
+) -> pd.DataFrame:
+    """create_pivot_table as it was built on pd.pivot_table(margins=True)."""
+    df = df.copy()
+    for col in NAME_COLUMNS:
+        if col in df.columns:
+            df["Merchant Name"] = df[col]
+            break
+
+    pivot = pd.pivot_table(
+        df,
+        values=[gross_col, net_col, fee_col],
+        index=index,
+        aggfunc="sum",
+        margins=True,
+        margins_name="Totals",
+    ).round(2)
+    pivot = pivot.reset_index()
+    pivot.columns = [
+        col
+        if col in ["Advance ID", "Merchant Name"]
+        else {
+            gross_col: "Sum of Syn Gross Amount",
+            net_col: "Sum of Syn Net Amount",
+            fee_col: "Total Servicing Fee",
+        }[col]
+        for col in pivot.columns
+    ]
+    pivot.loc[pivot["Advance ID"] == "Totals", "Merchant Name"] = ""
+    return pivot[
+        [
+            "Advance ID",
+            "Merchant Name",
+            "Sum of Syn Gross Amount",
+            "Total Servicing Fee",
+            "Sum of Syn Net Amount",
+        ]
+    ]
+
+
+def capture_pivot_inputs(rows: int) -> Dict[str, Tuple[BaseParser, pd.DataFrame, Dict]]:
+    """Parse a sample per funder and return what each passed to the pivot."""
+    captured = {}
+    create_pivot_table = BaseParser.create_pivot_table
+
+    def capture(self, df, **kwargs):
+        captured[self.__class__.__name__] = (self, df, kwargs)
+        return create_pivot_table(self, df, **kwargs)
+
+    BaseParser.create_pivot_table = capture
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            samples = write_samples(Path(tmp), rows, 0)
+            for funder, path in samples.items():
+                PARSER_CLASSES[funder](SourceFile(path)).process()
+    finally:
+        BaseParser.create_pivot_table = create_pivot_table
+    return captured
+
+
+def measure_formats(name: str, pivot: pd.DataFrame, runs: int):
+    """Print the size and load time of pivot saved in each format."""
+    formats = list(PIVOT_FORMATS) if HAS_PYARROW else ["csv"]
+    with tempfile.TemporaryDirectory() as tmp:
+        for file_format in formats:
+            path = Path(tmp) / f"pivot{PIVOT_FORMATS[file_format]}"
+            write_pivot_table(pivot, path, file_format)
+            load = min(
+                timeit.repeat(lambda: load_pivot_table(path), number=1, repeat=runs)
+            )
+            same = load_pivot_table(path).to_csv(index=False) == pivot.to_csv(
+                index=False
+            )
+            print(
+                f"{name:<16} {file_format:<8} {path.stat().st_size / 1e6:>8.2f} "
+                f"{load * 1000:>8.1f} {str(same):>10}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    # The parsers log every row that fails their own checks
+    logging.disable(logging.WARNING)
+
+    print(f"{args.rows} rows per sample, best of {args.runs}\n")
+    print(
+        f"{'parser':<16} {'groups':>7} {'pivot_table ms':>15} {'groupby ms':>11} "
+        f"{'speedup':>8} {'identical':>10}"
+    )
+    pivots = {}
+    for name, (instance, df, kwargs) in capture_pivot_inputs(args.rows).items():
+        reference = reference_pivot_table(df, **kwargs)
+        pivot = instance.create_pivot_table(df, **kwargs)
+        identical = reference.to_csv(index=False) == pivot.to_csv(index=False)
+        pivots[name] = pivot
+
+        before = min(
+            timeit.repeat(
+                lambda: reference_pivot_table(df, **kwargs), number=1, repeat=args.runs
+            )
+        )
+        after = min(
+            timeit.repeat(
+                lambda: instance.create_pivot_table(df, **kwargs),
+                number=1,
+                repeat=args.runs,
+            )
+        )
+        print(
+            f"{name:<16} {len(pivot) - 1:>7} {before * 1000:>15.1f} "
+            f"{after * 1000:>11.1f} {before / after:>7.1f}x {str(identical):>10}"
+        )
+
+    print(
+        f"\n{'parser':<16} {'format':<8} {'size MB':>8} {'load ms':>8} {'same CSV':>10}"
+    )
+    for name, pivot in pivots.items():
+        measure_formats(name, pivot, args.runs)
+    if not HAS_PYARROW:
+        print("\nInstall pyarrow to compare the parquet and feather formats")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# app/utils/startup_benchmark.py
+
+"""
+Measure what importing the application costs at startup.
+
+Each run imports the given modules in a fresh interpreter started with
+``-X importtime``. The slowest imports of the median run are listed by
+cumulative time, followed by the heavy data libraries that got pulled in.
+
+Usage:
+    python app/utils/startup_benchmark.py [module ...] [--runs N] [--top N]
+
+Modules default to gui.dashboard, which is what main.py imports.
+"""
+
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+APP_DIR = Path(__file__).parent.parent
+
+# Libraries that should only load once a file is actually processed
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "chardet")
+
+
+def measure(modules: List[str]) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """
+    Import modules in a new interpreter.
+
+    Returns:
+        Tuple of the interpreter's wall time in seconds and a mapping of
+        every imported module to its (self, cumulative) import time in µs
+    """
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    imports = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        imports[name.strip()] = (int(self_us), int(cumulative_us))
+    return wall, imports
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("modules", nargs="*", default=["gui.dashboard"])
+    parser.add_argument("--runs", type=int, default=5, help="Interpreters to start")
+    parser.add_argument("--top", type=int, default=15, help="Imports to list")
+    args = parser.parse_args()
+
+    try:
+        runs = [measure(args.modules) for _ in range(args.runs)]
+    except RuntimeError as e:
+        print(f"Import failed: {e}", file=sys.stderr)
+        return 1
+
+    runs.sort(key=lambda run: run[0])
+    wall, imports = runs[len(runs) // 2]
+    walls = [run[0] for run in runs]
+
+    print(f"import {', '.join(args.modules)}")
+    print(
+        f"wall time over {len(runs)} runs: median {statistics.median(walls) * 1000:.0f}"
+        f" ms, min {walls[0] * 1000:.0f} ms, max {walls[-1] * 1000:.0f} ms"
+    )
+    print(f"\n{'cumulative ms':>14} {'self ms':>8}  module")
+    slowest = sorted(imports.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_us, cumulative_us) in slowest[: args.top]:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:8.1f}  {name}")
+
+    loaded = [name for name in HEAVY_MODULES if name in imports]
+    print(f"\nheavy libraries imported: {', '.join(loaded) or 'none'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
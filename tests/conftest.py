@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+import sys
+from pathlib import Path
+
+# The application imports its packages relative to app/, as main.py does
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
@@ -0,0 +1,129 @@
+# tests/test_backup_store.py
+
+import os
+import stat
+from datetime import datetime, timedelta
+import pytest
+from managers.backup_store import BackupStore, RetentionPolicy, hash_file
+from managers.database_manager import DatabaseManager
+from utils.db_pool import close_connections
+
+FIRST_FRIDAY = datetime(2024, 1, 5)
+
+
+def mode(path):
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+@pytest.fixture
+def store(tmp_path):
+    db_path = tmp_path / "portfolio.db"
+    DatabaseManager(db_path)
+    store = BackupStore(tmp_path / "store", db_path)
+    yield store
+    store.wait()
+    close_connections()
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "alder_portfolio.xlsx"
+    path.write_bytes(b"week 1")
+    return path
+
+
+def test_stored_files_are_read_only(store, tmp_path, workbook):
+    dest = tmp_path / "uploads" / "alder.xlsx"
+    dest.parent.mkdir()
+    store.store_file(workbook, dest)
+
+    obj = store._object_path(hash_file(workbook))
+    assert mode(obj) == 0o444
+    assert mode(dest) == 0o444
+    # The live file itself is left writable
+    assert mode(workbook) & stat.S_IWUSR
+
+
+def test_storing_over_a_read_only_file(store, tmp_path, workbook):
+    dest = tmp_path / "alder.xlsx"
+    store.store_file(workbook, dest)
+    workbook.write_bytes(b"week 2")
+    store.store_file(workbook, dest)
+
+    assert dest.read_bytes() == b"week 2"
+    assert mode(dest) == 0o444
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "geteuid") or os.geteuid() == 0,
+    reason="root ignores file permissions",
+)
+def test_editing_a_stored_file_is_refused(store, tmp_path, workbook):
+    dest = tmp_path / "alder.xlsx"
+    store.store_file(workbook, dest)
+    copy = tmp_path / "copy.xlsx"
+    store.store_file(workbook, copy)
+
+    with pytest.raises(PermissionError):
+        open(dest, "r+b")
+    assert copy.read_bytes() == b"week 1"
+
+
+def test_restored_backup_is_writable(store, tmp_path, workbook):
+    backup_path = tmp_path / "alder_portfolio_backup_20240105.xlsx"
+    store.backup(workbook.stem, workbook, FIRST_FRIDAY, backup_path)
+
+    restored = tmp_path / "restored.xlsx"
+    store.restore(workbook.stem, FIRST_FRIDAY, restored)
+    assert restored.read_bytes() == b"week 1"
+    assert mode(restored) & stat.S_IWUSR
+
+    restored.write_bytes(b"edited")
+    assert backup_path.read_bytes() == b"week 1"
+
+
+def test_compressed_backup_can_be_restored(tmp_path, workbook):
+    db_path = tmp_path / "portfolio.db"
+    DatabaseManager(db_path)
+    policy = RetentionPolicy(keep_weeks=8, keep_months=0, compress_after_weeks=2)
+    store = BackupStore(tmp_path / "store", db_path, policy)
+
+    for week in range(4):
+        workbook.write_bytes(f"week {week + 1}".encode())
+        friday = FIRST_FRIDAY + timedelta(weeks=week)
+        store.backup(
+            workbook.stem,
+            workbook,
+            friday,
+            tmp_path / f"alder_portfolio_backup_{friday:%Y%m%d}.xlsx",
+        )
+
+    backups = store.list_backups(workbook.stem)
+    assert [b["compressed"] for b in backups] == [0, 0, 0, 1]
+    assert not (tmp_path / "alder_portfolio_backup_20240105.xlsx").exists()
+
+    restored = tmp_path / "restored.xlsx"
+    store.restore(workbook.stem, FIRST_FRIDAY, restored)
+    assert restored.read_bytes() == b"week 1"
+    assert mode(restored) & stat.S_IWUSR
+    close_connections()
+
+
+def test_prune_removes_read_only_backups(tmp_path, workbook):
+    db_path = tmp_path / "portfolio.db"
+    DatabaseManager(db_path)
+    policy = RetentionPolicy(keep_weeks=2, keep_months=0, compress_after_weeks=52)
+    store = BackupStore(tmp_path / "store", db_path, policy)
+
+    paths = []
+    for week in range(4):
+        workbook.write_bytes(f"week {week + 1}".encode())
+        friday = FIRST_FRIDAY + timedelta(weeks=week)
+        paths.append(tmp_path / f"alder_portfolio_backup_{friday:%Y%m%d}.xlsx")
+        store.backup(workbook.stem, workbook, friday, paths[-1])
+
+    assert [path.exists() for path in paths] == [False, False, True, True]
+    assert len(store.list_backups(workbook.stem)) == 2
+    # Objects for the pruned weeks are collected
+    assert len(list(store.objects_dir.iterdir())) == 2
+    close_connections()
@@ -0,0 +1,143 @@
+# tests/test_clearview_week.py
+
+import csv
+from datetime import datetime
+import openpyxl
+import pytest
+from core.ml.funder_classifier import FunderClassifier
+from managers.coordinator import PortfolioCoordinator
+from managers.file_manager import PortfolioFileManager
+from managers.portfolio import Portfolio
+from utils.db_pool import close_connections
+
+FRIDAY = datetime(2024, 1, 19)
+ADVANCE_IDS = ["100001", "100002", "100003"]
+COLUMNS = [
+    "Last Merchant Cleared Date",
+    "Advance Status",
+    "AdvanceID",
+    "Frequency",
+    "Repayment Type",
+    "Draft Amount",
+    "Return Code",
+    "Return Date",
+    "Syn Gross Amount",
+    "Syn Net Amount",
+    "Syn Cleared Date",
+    "Syndicated Amt",
+    "Syndicate Purchase Price",
+    "Syndicate Net RTR Remain",
+]
+
+
+def gross(day, i):
+    return 100.0 * day + i
+
+
+def net(day, i):
+    return round(gross(day, i) * 0.95, 2)
+
+
+def write_day(directory, day):
+    """Write a ClearView daily report with known amounts for each advance."""
+    path = directory / f"clearview_day{day}.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        for i, advance_id in enumerate(ADVANCE_IDS):
+            row = dict.fromkeys(COLUMNS, "x")
+            row["AdvanceID"] = advance_id
+            row["Syn Gross Amount"] = f"${gross(day, i):,.2f}"
+            row["Syn Net Amount"] = f"${net(day, i):,.2f}"
+            writer.writerow(row)
+    return path
+
+
+def week_totals(days):
+    return {
+        "gross": sum(gross(d, i) for d in days for i in range(len(ADVANCE_IDS))),
+        "net": sum(net(d, i) for d in days for i in range(len(ADVANCE_IDS))),
+    }
+
+
+@pytest.fixture
+def coordinator(tmp_path):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "CV"
+    headers = ["Funder", "Date", "Merchant Name", "Type", "Advance ID", "Amount"]
+    headers += ["Total Net RTR Payment Received", "R&H Net RTR Balance"]
+    for col, header in enumerate(headers, 1):
+        sheet.cell(row=2, column=col, value=header)
+    for row, advance_id in enumerate(ADVANCE_IDS, 3):
+        sheet.cell(row=row, column=3, value=f"Merchant {advance_id}")
+        sheet.cell(row=row, column=5, value=int(advance_id))
+    workbook_path = tmp_path / "portfolio.xlsx"
+    workbook.save(workbook_path)
+
+    file_manager = PortfolioFileManager(tmp_path / "data")
+    file_manager.save_portfolio_workbook(Portfolio.ALDER, workbook_path)
+    coordinator = PortfolioCoordinator(file_manager)
+    coordinator.max_parse_workers = 1
+    yield coordinator
+
+    file_manager.backup_store.wait()
+    FunderClassifier.invalidate_index(file_manager.db_path)
+    close_connections()
+
+
+def process_single(coordinator, path):
+    ok, result, error = coordinator.process_uploaded_file(
+        path, Portfolio.ALDER, FRIDAY, manual_funder="ClearView"
+    )
+    assert ok, error
+    return result
+
+
+def process_batch(coordinator, paths):
+    results = coordinator.process_weekly_batch(
+        paths,
+        Portfolio.ALDER,
+        FRIDAY,
+        manual_funders={path: "ClearView" for path in paths},
+    )
+    ok, result, error = results["ClearView"]
+    assert ok, error
+    return result
+
+
+def assert_week_to_date(result, days):
+    expected = week_totals(days)
+    assert result["totals"]["gross"] == pytest.approx(expected["gross"])
+    assert result["totals"]["net"] == pytest.approx(expected["net"])
+    assert result["files_processed"] == len(days)
+
+
+def test_single_file_day_after_batch_includes_batch_days(coordinator, tmp_path):
+    days = [write_day(tmp_path, day) for day in range(1, 6)]
+
+    assert_week_to_date(process_batch(coordinator, days[:3]), [1, 2, 3])
+    assert_week_to_date(process_single(coordinator, days[3]), [1, 2, 3, 4])
+
+
+def test_batch_after_single_file_days_includes_earlier_days(coordinator, tmp_path):
+    days = [write_day(tmp_path, day) for day in range(1, 6)]
+
+    assert_week_to_date(process_single(coordinator, days[0]), [1])
+    assert_week_to_date(process_single(coordinator, days[1]), [1, 2])
+    assert_week_to_date(process_batch(coordinator, days[2:]), [1, 2, 3, 4, 5])
+
+    history = coordinator.get_file_history(Portfolio.ALDER, "ClearView")
+    assert history["gross_total"].tolist() == pytest.approx(
+        [week_totals([1, 2, 3, 4, 5])["gross"]]
+    )
+
+
+def test_reuploading_a_batch_day_does_not_count_it_twice(coordinator, tmp_path):
+    days = [write_day(tmp_path, day) for day in range(1, 4)]
+
+    process_batch(coordinator, days[:2])
+    result = process_single(coordinator, days[1])
+
+    expected = week_totals([1, 2])
+    assert result["totals"]["gross"] == pytest.approx(expected["gross"])
@@ -0,0 +1,70 @@
+# tests/test_funder_classifier.py
+
+import sqlite3
+from datetime import datetime
+import pytest
+from core.ml.funder_classifier import FunderClassifier
+from managers.database_manager import DatabaseManager
+from utils.db_pool import close_connections
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "portfolio.db"
+    DatabaseManager(path)
+    yield path
+    FunderClassifier.invalidate_index(path)
+    close_connections()
+
+
+def write_merchant(db_path, advance_id, funder):
+    """Upsert a merchant on a separate connection, as the CLI or GUI would."""
+    now = datetime.now().isoformat()
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            INSERT INTO merchant_tracking
+            (advance_id, funder, merchant_name, portfolio, first_seen_date, last_updated)
+            VALUES (?, ?, 'Merchant', 'Alder', ?, ?)
+            ON CONFLICT(advance_id) DO UPDATE SET
+                funder = excluded.funder,
+                last_updated = excluded.last_updated
+            """,
+            (advance_id, funder, now, now),
+        )
+    conn.close()
+
+
+def test_index_is_reused_while_merchants_are_unchanged(db_path):
+    write_merchant(db_path, "A1", "Kings")
+    classifier = FunderClassifier(db_path)
+
+    assert classifier._get_index() is classifier._get_index()
+
+
+def test_index_sees_merchants_written_elsewhere(db_path):
+    write_merchant(db_path, "A1", "Kings")
+    classifier = FunderClassifier(db_path)
+    assert classifier._match_ids_to_funder(["A1", "B1"]) == {"Kings": ["A1"]}
+
+    write_merchant(db_path, "B1", "EFIN")
+    assert classifier._match_ids_to_funder(["A1", "B1"]) == {
+        "Kings": ["A1"],
+        "EFIN": ["B1"],
+    }
+
+    # Moving an existing advance keeps the row count the same
+    write_merchant(db_path, "A1", "BHB")
+    assert classifier._match_ids_to_funder(["A1"]) == {"BHB": ["A1"]}
+
+
+def test_index_drops_deleted_merchants(db_path):
+    write_merchant(db_path, "A1", "Kings")
+    classifier = FunderClassifier(db_path)
+    assert classifier._match_ids_to_funder(["A1"]) == {"Kings": ["A1"]}
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM merchant_tracking")
+    conn.close()
+
+    assert classifier._match_ids_to_funder(["A1"]) == {}
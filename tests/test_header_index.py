@@ -0,0 +1,63 @@
+# tests/test_header_index.py
+
+import openpyxl
+import pytest
+from core.data_processing.excel.header_index import HeaderIndex
+
+HEADERS = ["Funder", "Merchant Name", None, "Advance ID", "R&H Net RTR Balance"]
+
+
+@pytest.fixture
+def worksheet():
+    worksheet = openpyxl.Workbook().active
+    worksheet.cell(row=1, column=1, value="Title")
+    for col, header in enumerate(HEADERS, 1):
+        worksheet.cell(row=2, column=col, value=header)
+    return worksheet
+
+
+@pytest.mark.parametrize(
+    "idx, amount", [(1, 1), (2, 3), (3, 1), (4, 13), (5, 2), (6, 1), (10, 2)]
+)
+def test_insert_cols_matches_worksheet(worksheet, idx, amount):
+    headers = HeaderIndex.from_worksheet(worksheet)
+
+    worksheet.insert_cols(idx, amount=amount)
+    headers.insert_cols(idx, amount=amount)
+
+    assert headers.columns == HeaderIndex.from_worksheet(worksheet).columns
+    assert headers.find("Advance ID") == HeaderIndex.from_worksheet(worksheet).find(
+        "Advance ID"
+    )
+
+
+def test_find_after_insert_and_set(worksheet):
+    headers = HeaderIndex.from_worksheet(worksheet)
+    assert headers.find("Funder Advance ID", "Advance ID") == 4
+
+    headers.insert_cols(2)
+    headers.set(2, "Funder Advance ID")
+
+    assert headers.find("Funder Advance ID", "Advance ID") == 2
+    assert headers.find("Advance ID") == 5
+    assert headers.find_containing("Net RTR Balance") == 6
+    assert headers.find("Missing") is None
+
+
+def test_blank_headers_are_skipped(worksheet):
+    headers = HeaderIndex.from_worksheet(worksheet)
+
+    assert 3 not in headers.columns
+    assert headers.find("") is None
+
+
+def test_read_only_worksheet_matches(tmp_path, worksheet):
+    path = tmp_path / "headers.xlsx"
+    worksheet.parent.save(path)
+    read_only = openpyxl.load_workbook(path, read_only=True)
+
+    assert (
+        HeaderIndex.from_worksheet(read_only.active).columns
+        == HeaderIndex.from_worksheet(worksheet).columns
+    )
+    read_only.close()
@@ -0,0 +1,143 @@
+# tests/test_job_queue.py
+
+import threading
+from pathlib import Path
+import pytest
+from managers.coordinator import ProcessingStatus
+from managers.job_queue import JobQueue
+from managers.portfolio import Portfolio
+
+
+class FakeCoordinator:
+    """Records the files it is given; "fail" files fail, "raise" files raise."""
+
+    def __init__(self):
+        self.calls = []
+        self.threads = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def process_uploaded_file(
+        self, file_path, portfolio, processing_date, manual_funder, progress
+    ):
+        self.release.wait(5)
+        self.calls.append(file_path.name)
+        self.threads.append(threading.current_thread())
+        progress(ProcessingStatus.CLASSIFIED)
+        if file_path.stem == "raise":
+            raise ValueError("unreadable")
+        if file_path.stem == "fail":
+            return False, None, "no funder"
+        return True, {"funder": manual_funder}, None
+
+
+@pytest.fixture
+def coordinator():
+    return FakeCoordinator()
+
+
+@pytest.fixture
+def jobs(coordinator):
+    jobs = JobQueue(coordinator)
+    yield jobs
+    coordinator.release.set()
+    jobs.shutdown()
+
+
+def test_jobs_run_in_submission_order(jobs, coordinator):
+    coordinator.release.clear()
+    submitted = [jobs.submit(Path(f"file{i}.csv"), Portfolio.ALDER) for i in range(5)]
+    assert jobs.pending == 5
+
+    coordinator.release.set()
+    jobs.wait()
+
+    assert coordinator.calls == [f"file{i}.csv" for i in range(5)]
+    assert [job.job_id for job in submitted] == [1, 2, 3, 4, 5]
+    assert all(job.status == ProcessingStatus.COMPLETED for job in submitted)
+    assert jobs.pending == 0
+
+
+def test_callbacks_run_on_the_dispatching_thread(jobs, coordinator):
+    events = []
+
+    def on_progress(job, status):
+        events.append(("progress", job.job_id, status, threading.current_thread()))
+
+    def on_done(job):
+        events.append(("done", job.job_id, job.status, threading.current_thread()))
+
+    for name in ("a.csv", "b.csv"):
+        jobs.submit(
+            Path(name), Portfolio.ALDER, on_progress=on_progress, on_done=on_done
+        )
+    jobs.wait()
+
+    # Nothing runs until the caller dispatches
+    assert events == []
+    assert jobs.dispatch_events() == 4
+
+    main = threading.current_thread()
+    assert events == [
+        ("progress", 1, ProcessingStatus.CLASSIFIED, main),
+        ("done", 1, ProcessingStatus.COMPLETED, main),
+        ("progress", 2, ProcessingStatus.CLASSIFIED, main),
+        ("done", 2, ProcessingStatus.COMPLETED, main),
+    ]
+    assert main not in coordinator.threads
+
+
+def test_dispatch_limit(jobs):
+    done = []
+    for i in range(3):
+        jobs.submit(Path(f"file{i}.csv"), Portfolio.ALDER, on_done=done.append)
+    jobs.wait()
+
+    assert jobs.dispatch_events(limit=2) == 2
+    assert jobs.dispatch_events(limit=2) == 1
+    assert [job.job_id for job in done] == [1, 2, 3]
+
+
+def test_failed_jobs(jobs):
+    failed = jobs.submit(Path("fail.csv"), Portfolio.ALDER)
+    raised = jobs.submit(Path("raise.csv"), Portfolio.ALDER)
+    after = jobs.submit(Path("ok.csv"), Portfolio.ALDER, manual_funder="ACS")
+    jobs.wait()
+
+    assert failed.status == ProcessingStatus.FAILED
+    assert failed.result == (False, None, "no funder")
+    assert raised.status == ProcessingStatus.FAILED
+    assert raised.result == (False, None, "unreadable")
+    # A failure does not stop the jobs queued behind it
+    assert after.status == ProcessingStatus.COMPLETED
+    assert after.result == (True, {"funder": "ACS"}, None)
+
+
+def test_callback_errors_are_contained(jobs):
+    def on_done(job):
+        raise RuntimeError("widget destroyed")
+
+    done = []
+    jobs.submit(Path("a.csv"), Portfolio.ALDER, on_done=on_done)
+    jobs.submit(Path("b.csv"), Portfolio.ALDER, on_done=done.append)
+    jobs.wait()
+
+    assert jobs.dispatch_events() == 2
+    assert [job.file_path.name for job in done] == ["b.csv"]
+
+
+def test_shutdown_finishes_queued_jobs(coordinator):
+    jobs = JobQueue(coordinator)
+    coordinator.release.clear()
+    submitted = [jobs.submit(Path(f"file{i}.csv"), Portfolio.ALDER) for i in range(3)]
+    coordinator.release.set()
+    jobs.shutdown()
+
+    assert coordinator.calls == ["file0.csv", "file1.csv", "file2.csv"]
+    assert all(job.status == ProcessingStatus.COMPLETED for job in submitted)
+    assert not any(thread.is_alive() for thread in coordinator.threads)
+
+    # A job submitted after shutdown starts a new worker
+    later = jobs.submit(Path("later.csv"), Portfolio.ALDER)
+    jobs.shutdown()
+    assert later.status == ProcessingStatus.COMPLETED
@@ -0,0 +1,135 @@
+# tests/test_net_rtr_columns.py
+
+import zipfile
+from xml.etree import ElementTree
+from datetime import datetime
+import openpyxl
+import pytest
+from openpyxl.utils import get_column_letter
+from core.data_processing.excel.workbook_manager import WorkbookManager
+
+HEADERS = [
+    "Funder",
+    "Merchant Name",
+    "Advance ID",
+    "Total Net RTR Payment Received",
+    "Net RTR 1/5",
+    "R&H Net RTR Balance",
+    "Notes",
+    "Status",
+]
+BALANCE_COL = HEADERS.index("R&H Net RTR Balance") + 1
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+def column_dimension(worksheet, col):
+    """The dimension covering col, which need not be keyed by col's letter."""
+    for dim in worksheet.column_dimensions.values():
+        dim.reindex()
+        if dim.min <= col <= dim.max:
+            return dim
+    return None
+
+
+def hidden(worksheet, col):
+    dim = column_dimension(worksheet, col)
+    return bool(dim and dim.hidden)
+
+
+def col_ranges(path, sheet="sheet1"):
+    """The (min, max) of every <col> element saved for the sheet."""
+    with zipfile.ZipFile(path) as archive:
+        root = ElementTree.fromstring(archive.read(f"xl/worksheets/{sheet}.xml"))
+    return [
+        (int(col.get("min")), int(col.get("max"))) for col in root.iter(f"{MAIN_NS}col")
+    ]
+
+
+def save_and_reload(workbook, path):
+    workbook.save(path)
+    return openpyxl.load_workbook(path)
+
+
+@pytest.fixture
+def manager():
+    return WorkbookManager(file_manager=None)
+
+
+def cv_sheet(path, widths=None):
+    """
+    Save and reload a CV sheet, optionally with one <col> element sharing a
+    custom width across the columns in widths, e.g. ("D", "H").
+    """
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "CV"
+    for col, header in enumerate(HEADERS, 1):
+        sheet.cell(row=2, column=col, value=header)
+    for row in range(3, 6):
+        sheet.cell(row=row, column=2, value=f"Merchant {row}")
+        sheet.cell(row=row, column=3, value=100000 + row)
+    if widths:
+        start, end = widths
+        sheet.column_dimensions.group(start, end)
+        sheet.column_dimensions[start].width = 17.5
+        # group() also outlines the columns; keep just the shared width
+        sheet.column_dimensions[start].outline_level = 0
+    return save_and_reload(workbook, path)
+
+
+@pytest.fixture
+def grouped_sheet(tmp_path):
+    return cv_sheet(tmp_path / "grouped.xlsx", ("D", "H"))
+
+
+# Grouped around the insert point, starting at it, and no widths at all
+@pytest.mark.parametrize("widths", [("D", "H"), ("F", "H"), None])
+def test_reserving_columns_keeps_later_columns_visible(manager, tmp_path, widths):
+    workbook = cv_sheet(tmp_path / "sheet.xlsx", widths)
+    sheet = workbook["CV"]
+
+    letter = manager._add_net_rtr_column(sheet, datetime(2024, 1, 12), 5)
+    new_col = openpyxl.utils.column_index_from_string(letter)
+    assert new_col == BALANCE_COL
+    reserved = range(new_col + 1, new_col + manager.RESERVED_NET_RTR_COLUMNS)
+    balance_col = new_col + manager.RESERVED_NET_RTR_COLUMNS
+
+    path = tmp_path / "saved.xlsx"
+    sheet = save_and_reload(workbook, path)["CV"]
+
+    headers = [cell.value for cell in sheet[2]]
+    assert headers[balance_col - 1] == "R&H Net RTR Balance"
+    assert not hidden(sheet, new_col)
+    assert all(hidden(sheet, col) for col in reserved)
+    for col in range(balance_col, balance_col + 3):
+        assert not hidden(sheet, col), get_column_letter(col)
+
+    # Excel asks to repair sheets whose <col> ranges overlap
+    ranges = sorted(col_ranges(path))
+    assert all(hi < next_lo for (_, hi), (next_lo, _) in zip(ranges, ranges[1:]))
+
+
+def test_grouped_widths_move_with_their_columns(manager, tmp_path, grouped_sheet):
+    sheet = grouped_sheet["CV"]
+    manager._add_net_rtr_column(sheet, datetime(2024, 1, 12), 5)
+    sheet = save_and_reload(grouped_sheet, tmp_path / "saved.xlsx")["CV"]
+
+    balance_col = BALANCE_COL + manager.RESERVED_NET_RTR_COLUMNS
+    # Columns before the insert keep the group's width, the balance column
+    # and the rest of the group take it along, and the new week matches
+    for col in (4, 5, BALANCE_COL, balance_col, balance_col + 2):
+        assert column_dimension(sheet, col).width == 17.5, get_column_letter(col)
+    assert column_dimension(sheet, balance_col + 3) is None
+
+
+def test_later_weeks_claim_reserved_columns(manager, tmp_path, grouped_sheet):
+    sheet = grouped_sheet["CV"]
+    first = manager._add_net_rtr_column(sheet, datetime(2024, 1, 12), 5)
+    second = manager._add_net_rtr_column(sheet, datetime(2024, 1, 19), 5)
+    sheet = save_and_reload(grouped_sheet, tmp_path / "saved.xlsx")["CV"]
+
+    second_col = openpyxl.utils.column_index_from_string(second)
+    assert second_col == openpyxl.utils.column_index_from_string(first) + 1
+    assert sheet.cell(row=2, column=second_col).value == "Net RTR 1/19"
+    assert not hidden(sheet, second_col)
+    assert hidden(sheet, second_col + 1)
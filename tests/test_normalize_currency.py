@@ -0,0 +1,129 @@
+# tests/test_normalize_currency.py
+
+import math
+import pandas as pd
+import pytest
+from core.data_processing.parsers.acs_vesper_parser import AcsVesperParser
+from core.data_processing.parsers.base_parser import BaseParser
+from core.data_processing.parsers.clear_view_parser import ClearViewParser
+
+normalize_currency = BaseParser.normalize_currency
+NAN = float("nan")
+
+
+def amounts(*cells):
+    return normalize_currency(pd.Series(cells, dtype=object)).tolist()
+
+
+def same(actual, expected):
+    return len(actual) == len(expected) and all(
+        math.isnan(a) if math.isnan(e) else a == e for a, e in zip(actual, expected)
+    )
+
+
+@pytest.mark.parametrize(
+    "cell, expected",
+    [
+        ("$1,234.50", 1234.5),
+        ("($12.00)", -12.0),
+        ("-$5.25", -5.25),
+        ('"1,000"', 1000.0),
+        (" 7 ", 7.0),
+        ("\xa0$5", 5.0),
+        ("$\xa01,234.50\xa0", 1234.5),
+        ("\u2009($3.00)\u3000", -3.0),
+        ("0", 0.0),
+        ("", NAN),
+        ("   ", NAN),
+        ("\xa0", NAN),
+        (None, NAN),
+        ("N/A", NAN),
+        ("see notes", NAN),
+    ],
+)
+def test_single_cells(cell, expected):
+    assert same(amounts(cell), [expected])
+
+
+def test_blank_cells_become_nan_not_zero():
+    assert same(amounts("$1.00", "", None, "($2.00)"), [1.0, NAN, NAN, -2.0])
+
+
+def test_stray_text_is_coerced_without_losing_other_cells():
+    assert same(
+        amounts("$1,234.50", "pending", "($12.00)", "", "nan"),
+        [1234.5, NAN, -12.0, NAN, NAN],
+    )
+
+
+def test_non_breaking_spaces_next_to_stray_text():
+    # Stray text elsewhere in the column must not turn these into NaN
+    assert same(
+        amounts("\xa0$5", "pending", "$1.00\xa0", " $2"),
+        [5.0, NAN, 1.0, 2.0],
+    )
+
+
+def test_embedded_newlines_only_affect_their_own_cell():
+    assert same(
+        amounts("$1.00", "$1,234.50\n", "($12.00)", "12\n34", "$3.00"),
+        [1.0, 1234.5, -12.0, NAN, 3.0],
+    )
+
+
+def test_index_is_kept():
+    values = pd.Series(["$1.00", "($2.00)", "x"], index=[10, 5, 7])
+    result = normalize_currency(values)
+    assert result.index.tolist() == [10, 5, 7]
+    assert result[5] == -2.0
+
+
+def test_numeric_columns_pass_through():
+    result = normalize_currency(pd.Series([1, -2, 3]))
+    assert result.dtype == float
+    assert result.tolist() == [1.0, -2.0, 3.0]
+
+
+def test_clearview_keeps_negative_amounts(tmp_path):
+    path = tmp_path / "clearview.csv"
+    path.write_text("AdvanceID\n")
+    parser = ClearViewParser(path)
+    parser._df = pd.DataFrame(
+        {
+            "AdvanceID": ["100001", "100001", "100002", "100003", "x"],
+            "Syn Gross Amount": ["$1,000.00", "($200.00)", "($50.00)", "", "$9.00"],
+            "Syn Net Amount": ["$950.00", "($190.00)", "($47.50)", "", "$9.00"],
+        }
+    )
+
+    grouped = parser.aggregate_amounts().set_index("AdvanceID")
+
+    # Returns net off within an advance, rows with no amounts are dropped,
+    # and rows without a numeric ID are ignored
+    assert grouped.index.tolist() == ["100001", "100002"]
+    assert grouped.loc["100001"].tolist() == [800.0, 760.0]
+    assert grouped.loc["100002"].tolist() == [-50.0, -47.5]
+
+    # The servicing fee is always positive
+    processed = parser.build_processed_df(grouped.reset_index())
+    assert processed["Total Servicing Fee"].tolist() == [40.0, 2.5]
+
+
+def test_acs_keeps_negative_gross_and_net(tmp_path):
+    path = tmp_path / "acs.csv"
+    path.write_text(
+        "ACS Syndication Report\n"
+        "Advance ID,Merchant Name,Week 1 Gross,Week 1 Fees,Week 1 Net,Total Net\n"
+        'AC100001,Alpha,"$1,000.00",($50.00),$950.00,$950.00\n'
+        "AC100002,Beta,($100.00),$5.00,($95.00),($95.00)\n"
+        "AC100003,Gamma,,,,\n"
+    )
+    parser = AcsVesperParser(path)
+    parser.read_csv()
+
+    processed = parser.process_data().set_index("Advance ID")
+
+    assert processed.index.tolist() == ["AC100001", "AC100002"]
+    assert processed["Sum of Syn Gross Amount"].tolist() == [1000.0, -100.0]
+    assert processed["Sum of Syn Net Amount"].tolist() == [950.0, -95.0]
+    assert processed["Total Servicing Fee"].tolist() == [50.0, 5.0]
@@ -0,0 +1,125 @@
+# tests/test_parse_cache.py
+
+import os
+import pandas as pd
+import pytest
+from core.data_processing.parse_cache import ParseCache
+from core.data_processing.parsers.bhb_parser import BHBParser
+from managers.coordinator import PortfolioCoordinator
+from managers.file_manager import PortfolioFileManager
+from utils.db_pool import close_connections
+
+
+def parsed(amount):
+    pivot = pd.DataFrame({"Advance ID": ["100001"], "Sum of Syn Net Amount": [amount]})
+    return pivot, amount, amount, 0.0
+
+
+def same_result(actual, expected):
+    pd.testing.assert_frame_equal(actual[0], expected[0])
+    assert actual[1:] == expected[1:]
+
+
+class FakeParser(BHBParser):
+    """Counts how often it is run and returns error if one is given."""
+
+    def __init__(self, file_path, error=None):
+        super().__init__(file_path)
+        self.error = error
+        self.runs = 0
+
+    def process(self):
+        self.runs += 1
+        if self.error:
+            return None, 0.0, 0.0, 0.0, self.error
+        return (*parsed(5.0), None)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(tmp_path / "parse_cache")
+
+
+@pytest.fixture
+def export(tmp_path):
+    path = tmp_path / "bhb.csv"
+    path.write_text("Advance ID,Net Amount\n100001,$5.00\n")
+    return path
+
+
+@pytest.fixture
+def coordinator(tmp_path):
+    file_manager = PortfolioFileManager(tmp_path / "data")
+    yield PortfolioCoordinator(file_manager)
+    file_manager.backup_store.wait()
+    close_connections()
+
+
+def test_hit_and_miss(cache, export):
+    key = ParseCache.make_key(BHBParser, [export])
+    assert cache.get(key) is None
+
+    cache.put(key, parsed(5.0))
+    same_result(cache.get(key), parsed(5.0))
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_key_follows_contents_parser_and_version(export, tmp_path, monkeypatch):
+    key = ParseCache.make_key(BHBParser, [export])
+    copy = tmp_path / "copy.csv"
+    copy.write_bytes(export.read_bytes())
+    assert ParseCache.make_key(BHBParser, [copy]) == key
+
+    assert ParseCache.make_key(FakeParser, [export]) != key
+    export.write_text("Advance ID,Net Amount\n100001,$6.00\n")
+    assert ParseCache.make_key(BHBParser, [export]) != key
+
+    # Changing the parser's output invalidates everything it cached before
+    monkeypatch.setattr(BHBParser, "PARSER_VERSION", BHBParser.PARSER_VERSION + 1)
+    assert ParseCache.make_key(BHBParser, [copy]) != key
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    cache.put("a", parsed(1.0))
+    cache.put("b", parsed(2.0))
+    for age, key in enumerate(("a", "b"), 1):
+        os.utime(cache._entry_path(key), (age, age))
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") is not None
+
+    cache.max_bytes = cache.stats()["bytes"]
+    cache.put("c", parsed(3.0))
+
+    assert cache.get("b") is None
+    same_result(cache.get("a"), parsed(1.0))
+    same_result(cache.get("c"), parsed(3.0))
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_unreadable_entry_is_dropped(cache):
+    cache._entry_path("a").write_bytes(b"not a pickle")
+
+    assert cache.get("a") is None
+    assert not cache._entry_path("a").exists()
+    assert cache.stats()["misses"] == 1
+
+
+def test_results_are_reused(coordinator, export):
+    parser = FakeParser(export)
+    first = coordinator._parse_with_cache(parser)
+    second = coordinator._parse_with_cache(FakeParser(export))
+
+    assert parser.runs == 1
+    same_result(second[:4], first[:4])
+    assert second[4] is None
+
+
+def test_errors_are_never_cached(coordinator, export):
+    parser = FakeParser(export, error="missing columns")
+    for _ in range(2):
+        assert coordinator._parse_with_cache(parser)[4] == "missing columns"
+
+    assert parser.runs == 2
+    assert coordinator.parse_cache.stats()["entries"] == 0
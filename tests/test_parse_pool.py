@@ -0,0 +1,53 @@
+# tests/test_parse_pool.py
+
+import pytest
+from core.data_processing.parsers import parse_pool
+from core.data_processing.parsers.parse_pool import parse_files
+
+
+class EchoParser:
+    """Stands in for a BaseParser subclass; returns its source as the gross."""
+
+    def __init__(self, source):
+        self.source = source
+
+    def process(self):
+        if self.source < 0:
+            raise ValueError("negative")
+        return None, self.source, 0, 0, None
+
+
+@pytest.fixture
+def no_process_pool(monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise OSError("process creation not permitted")
+
+    monkeypatch.setattr(parse_pool, "ProcessPoolExecutor", unavailable)
+
+
+def test_parse_files_falls_back_to_serial_when_pool_unavailable(no_process_pool):
+    jobs = {name: (EchoParser, gross) for name, gross in [("a", 1), ("b", 2)]}
+
+    results = parse_files(jobs, max_workers=2)
+
+    assert results == {"a": (None, 1, 0, 0, None), "b": (None, 2, 0, 0, None)}
+
+
+def test_parse_files_reports_parser_errors_per_file(no_process_pool):
+    jobs = {"good": (EchoParser, 1), "bad": (EchoParser, -1)}
+
+    results = parse_files(jobs, max_workers=2)
+
+    assert results["good"] == (None, 1, 0, 0, None)
+    pivot, gross, net, fee, error = results["bad"]
+    assert pivot is None and error == "Error running EchoParser: negative"
+
+
+def test_parse_files_runs_single_job_in_process(no_process_pool):
+    assert parse_files({"a": (EchoParser, 3)}) == {"a": (None, 3, 0, 0, None)}
+
+
+def test_parse_files_across_pool_matches_serial():
+    jobs = {name: (EchoParser, gross) for name, gross in enumerate(range(4))}
+
+    assert parse_files(jobs, max_workers=2) == parse_files(jobs, max_workers=1)
@@ -0,0 +1,123 @@
+# tests/test_pivot_formats.py
+
+import sqlite3
+from datetime import datetime
+import pandas as pd
+import pytest
+from managers import file_manager as file_manager_module
+from managers.database_manager import DatabaseManager
+from managers.file_manager import (
+    PIVOT_FORMATS,
+    PortfolioFileManager,
+    load_pivot_table,
+    write_pivot_table,
+)
+from managers.portfolio import Portfolio
+from utils.db_pool import close_connections, get_connection
+
+# Parquet and Feather are only tested where the columnar extra is installed
+FORMATS = [
+    pytest.param(
+        file_format,
+        marks=pytest.mark.skipif(
+            file_format != "csv" and not file_manager_module.HAS_PYARROW,
+            reason="needs pyarrow (pip install .[columnar])",
+        ),
+    )
+    for file_format in PIVOT_FORMATS
+]
+
+
+def pivot_table():
+    """A pivot as the parsers build it, with the totals row under the IDs."""
+    return pd.DataFrame(
+        {
+            "Advance ID": ["100001", "AC100002", "Totals"],
+            "Merchant Name": ["Alpha", "Beta", ""],
+            "Sum of Syn Gross Amount": [1000.0, -100.5, 899.5],
+            "Total Servicing Fee": [50.0, 5.25, 55.25],
+            "Sum of Syn Net Amount": [950.0, -105.75, 844.25],
+        }
+    )
+
+
+def assert_same_pivot(loaded, expected):
+    assert loaded.columns.tolist() == expected.columns.tolist()
+    assert loaded["Advance ID"].astype(str).tolist() == expected["Advance ID"].tolist()
+    for col in expected.columns[2:]:
+        assert loaded[col].tolist() == expected[col].tolist()
+
+
+@pytest.fixture
+def file_manager(tmp_path):
+    file_manager = PortfolioFileManager(tmp_path)
+    yield file_manager
+    file_manager.backup_store.wait()
+    close_connections()
+
+
+@pytest.mark.parametrize("file_format", FORMATS)
+def test_round_trip(tmp_path, file_format):
+    path = tmp_path / f"pivot{PIVOT_FORMATS[file_format]}"
+    write_pivot_table(pivot_table(), path, file_format)
+
+    assert_same_pivot(load_pivot_table(path), pivot_table())
+
+
+@pytest.mark.parametrize("file_format", FORMATS)
+def test_save_pivot_table_records_the_format(file_manager, file_format):
+    file_manager.preferences.pivot_format = file_format
+    path = file_manager.save_pivot_table(
+        pivot_table(), Portfolio.ALDER, "ACS", 1, datetime(2024, 1, 5)
+    )
+
+    assert path.suffix == PIVOT_FORMATS[file_format]
+    assert_same_pivot(load_pivot_table(path), pivot_table())
+    with get_connection(file_manager.db_path) as conn:
+        rows = conn.execute(
+            "SELECT file_path, file_format FROM pivot_tables"
+        ).fetchall()
+    assert rows == [(str(path), file_format)]
+
+
+def test_columnar_formats_fall_back_to_csv(file_manager, monkeypatch):
+    monkeypatch.setattr(file_manager_module, "HAS_PYARROW", False)
+    file_manager.preferences.pivot_format = "parquet"
+    assert file_manager.pivot_format == "csv"
+
+    file_manager.preferences.pivot_format = "xlsb"
+    assert file_manager.pivot_format == "csv"
+
+
+def test_file_format_column_is_added_to_old_databases(tmp_path):
+    db_path = tmp_path / "portfolio.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE pivot_tables (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source_file_id INTEGER,
+            stored_filename TEXT,
+            creation_date TEXT,
+            processing_date TEXT,
+            portfolio TEXT,
+            funder TEXT,
+            file_path TEXT
+        )
+    """)
+    conn.execute(
+        "INSERT INTO pivot_tables (stored_filename, file_path) VALUES (?, ?)",
+        ("old_pivot.csv", "/data/old_pivot.csv"),
+    )
+    conn.commit()
+    conn.close()
+
+    DatabaseManager(db_path)
+    # Running the migration again leaves the column alone
+    DatabaseManager(db_path)
+
+    with get_connection(db_path) as conn:
+        rows = conn.execute(
+            "SELECT stored_filename, file_format FROM pivot_tables"
+        ).fetchall()
+    close_connections()
+    assert rows == [("old_pivot.csv", "csv")]
@@ -0,0 +1,58 @@
+# tests/test_source_file.py
+
+import csv
+import pandas as pd
+import pytest
+from core.data_processing.parsers.bhb_parser import BHBParser
+from core.data_processing.parsers.clear_view_parser import ClearViewParser
+from core.data_processing.parsers.efin_parser import EfinParser
+from core.data_processing.parsers.kings_boom_parser import KingsBoomParser
+from core.data_processing.source_file import SourceFile
+
+PARSERS = [BHBParser, ClearViewParser, EfinParser, KingsBoomParser]
+
+
+def write_export(path, columns, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(rows)
+    return path
+
+
+@pytest.mark.parametrize("parser_class", PARSERS, ids=lambda cls: cls.__name__)
+def test_read_columns_matches_a_full_read(tmp_path, parser_class):
+    declared = parser_class(tmp_path / "unused.csv")
+    columns = declared.csv_columns or declared.required_columns
+    text_columns = [col for col, t in declared.csv_dtypes.items() if t is str]
+
+    # Unused columns on both sides, a text value that looks like a number
+    # with a leading zero, and a row of blanks
+    header = ["Unused A"] + columns + ["Unused B"]
+    rows = [
+        ["x"] + ["00123" if col in text_columns else "7" for col in columns] + ["y"],
+        ["x"]
+        + ["$1,234.50" if col in text_columns else "8" for col in columns]
+        + ["y"],
+        [""] * len(header),
+    ]
+    path = write_export(tmp_path / "export.csv", header, rows)
+
+    parser = parser_class(SourceFile(path))
+    df = parser.read_columns(encoding="utf-8")
+
+    expected = pd.read_csv(path, dtype=dict.fromkeys(text_columns, str))[columns]
+    pd.testing.assert_frame_equal(df, expected)
+    for col in text_columns:
+        assert df[col].iloc[0] == "00123"
+        assert pd.isna(df[col].iloc[2])
+
+
+def test_read_columns_skips_missing_columns(tmp_path):
+    path = write_export(tmp_path / "export.csv", ["Advance ID", "Other"], [["1", "2"]])
+
+    df = SourceFile(path).read_columns(
+        ["Advance ID", "Business Name"], dtype={"Business Name": str}
+    )
+
+    assert df.columns.tolist() == ["Advance ID"]